@@ -0,0 +1,1217 @@
+#!/usr/bin/env python3
+"""
+Balearic Islands Sailing Regatta Scraper - Benchmarks
+- record: save each club's page (or synthetic pages) as offline fixtures
+- run: replay fixtures through a local server and time every stage
+- scale: time parsing/extraction on fixture pages scaled 10x-1000x
+- parse: compare the old BeautifulSoup html.parser path, the lxml tree path
+  and the streaming path on saved club pages (parse time and peak memory)
+- faults: serve fixtures with injected failures and run the scraper several
+  times to exercise retries, the circuit breaker and the run deadline
+- daemon: run daemon cycles back to back against the fixtures on a simulated
+  clock, counting requests and new connections per cycle
+- calendar: time index.html headless (node) on a synthetic data set, loading
+  from the per-month calendar files, the club shards and regattas.json
+- notify: deliver queued notifications for synthetic new events to a local
+  stand-in Bot API that throttles, fails or goes down, checking nothing is
+  lost or sent twice
+- extract: scrape synthetic club pages with parsing and extraction in the
+  fetch threads and in 1, 2, 4... worker processes, checking every mode
+  returns the same records in the same order
+- translate: translate synthetic titles through a local stand-in translate
+  endpoint that is healthy, flaky, slower than the budget or down, counting
+  requests, fallbacks and what a second, cached pass still asks for
+- classify: score the boat and event type classifier against the labeled
+  events in fixtures/classification_labels.json, next to the previous
+  substring keyword scan, and time both
+"""
+
+import argparse
+import functools
+import glob
+import http.server
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.parse
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+import lxml.html
+
+from scraper import (BoatType, CalendarIndex, CircuitBreaker, EventHistory, EventType, HttpCache, Regatta,
+                     RunMetrics, ScrapeDaemon, ShardStore, SmartRegattaScraper, TelegramClient, TextLineTarget,
+                     TranslationService, club_slug, logger)
+
+DEFAULT_FIXTURES_DIR = 'fixtures'
+DEFAULT_PAGES_DIR = os.path.join(DEFAULT_FIXTURES_DIR, 'pages')
+MANIFEST_FILE = 'manifest.json'
+DEFAULT_LABELS_FILE = os.path.join(DEFAULT_FIXTURES_DIR, 'classification_labels.json')
+
+
+def record_fixtures(scraper: SmartRegattaScraper, pages_dir: str):
+    """Download every club's page once into the fixtures directory"""
+    os.makedirs(pages_dir, exist_ok=True)
+    manifest = []
+    for club_info in scraper.clubs:
+        filename = club_slug(club_info['name']) + '.html'
+        try:
+            response = scraper.session.get(club_info['url'], timeout=15)
+            response.raise_for_status()
+        except Exception as e:
+            logger.error(f"Error recording {club_info['name']}: {e}")
+            continue
+        with open(os.path.join(pages_dir, filename), 'wb') as f:
+            f.write(response.content)
+        manifest.append(dict(club_info, fixture=filename))
+        logger.info(f"Recorded {club_info['name']} ({len(response.content)} bytes)")
+    write_manifest(pages_dir, manifest)
+
+
+def synthesize_fixtures(scraper: SmartRegattaScraper, pages_dir: str, source: str = 'regattas.json'):
+    """Build one page per club from previously extracted regattas"""
+    with open(source, 'r', encoding='utf-8') as f:
+        regattas = json.load(f)
+    os.makedirs(pages_dir, exist_ok=True)
+    manifest = []
+    for club_info in scraper.clubs:
+        events = [r for r in regattas if r['club'] == club_info['name']]
+        items = "".join(
+            f"<li>\n<h3>{r['title']}</h3>\n<p>{r['date']}</p>\n<p>{r['details']}</p>\n</li>\n"
+            for r in events
+        )
+        html = (
+            "<html><head><meta charset=\"utf-8\"><title>Regatas</title>"
+            "<script>var tracking = 'Regata 1 de enero de 2030';</script></head>\n<body>\n"
+            "<nav><a href=\"/\">Inicio</a> <a href=\"/noticias\">Noticias</a></nav>\n"
+            f"<main>\n<h1>{club_info['name']}</h1>\n<ul>\n{items}</ul>\n</main>\n"
+            "<footer>Contacto</footer>\n</body></html>\n"
+        )
+        filename = club_slug(club_info['name']) + '.html'
+        with open(os.path.join(pages_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(html)
+        manifest.append(dict(club_info, fixture=filename))
+    write_manifest(pages_dir, manifest)
+    logger.info(f"Synthesized {len(manifest)} fixture pages in {pages_dir}")
+
+
+def write_manifest(pages_dir: str, manifest: List[Dict]):
+    """Write the club list that maps fixtures back to clubs"""
+    with open(os.path.join(pages_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def load_manifest(pages_dir: str) -> List[Dict]:
+    """Load the club list recorded with the fixtures"""
+    with open(os.path.join(pages_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler that does not log every request"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def fixture_server(pages_dir: str, handler=None):
+    """Serve the fixtures directory on a local port"""
+    handler = handler or functools.partial(QuietHandler, directory=pages_dir)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class FaultyHandler(QuietHandler):
+    """Fixture handler that injects a per-page failure mode
+
+    ok: always served; flaky: every other request is a 503 with Retry-After;
+    reset: every other connection is dropped without a response; down: always 503;
+    slow: stalls past the read timeout; trickle: sends the body a few bytes at a
+    time so no read times out but the page takes far longer than the run deadline.
+    """
+
+    def __init__(self, *args, faults: Dict[str, str], counters: Dict[str, int],
+                 stall: float = 2.0, **kwargs):
+        self.faults = faults
+        self.counters = counters
+        self.stall = stall
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        filename = os.path.basename(self.path.split('?')[0])
+        mode = self.faults.get(filename, 'ok')
+        with FAULT_LOCK:
+            count = self.counters[filename] = self.counters.get(filename, 0) + 1
+        try:
+            if mode == 'down' or (mode == 'flaky' and count % 2):
+                self.send_response(503)
+                self.send_header('Retry-After', '0')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            elif mode == 'reset' and count % 2:
+                self.close_connection = True
+            elif mode == 'slow':
+                time.sleep(self.stall)
+                super().do_GET()
+            elif mode == 'trickle':
+                self.send_trickle(filename)
+            else:
+                super().do_GET()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up first, which is the point of these modes
+            self.close_connection = True
+
+    def send_trickle(self, filename: str):
+        """Send a fixture page slowly enough to outlast any run deadline"""
+        with open(os.path.join(self.directory, filename), 'rb') as f:
+            content = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        for start in range(0, len(content), 16):
+            self.wfile.write(content[start:start + 16])
+            self.wfile.flush()
+            time.sleep(self.stall / 4)
+
+
+FAULT_LOCK = threading.Lock()
+FAULT_MODES = ['ok', 'flaky', 'reset', 'down', 'slow', 'trickle']
+NOTIFY_MODES = ['ok', 'throttle', 'flaky', 'down', 'markdown']
+TRANSLATE_MODES = ['ok', 'flaky', 'slow', 'down']
+
+
+def run_fault_benchmark(pages_dir: str, modes: List[str], runs: int, deadline: float,
+                        threshold: int, probe_interval: float) -> List[Dict]:
+    """Run the scraper repeatedly against fixtures served with injected faults"""
+    # The runs happen in a scratch directory, so the server needs an absolute path
+    pages_dir = os.path.abspath(pages_dir)
+    manifest = load_manifest(pages_dir)
+    faults = {club_info['fixture']: modes[index % len(modes)] for index, club_info in enumerate(manifest)}
+    counters: Dict[str, int] = {}
+    handler = functools.partial(FaultyHandler, directory=pages_dir, faults=faults, counters=counters)
+    results = []
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch, fixture_server(pages_dir, handler) as base_url:
+        os.chdir(scratch)
+        try:
+            clubs = []
+            for club_info in manifest:
+                club_info = dict(club_info, url=f"{base_url}/{club_info['fixture']}")
+                club_info.pop('url_templates', None)
+                clubs.append(club_info)
+            breaker = CircuitBreaker('circuit_state.json', threshold, probe_interval)
+            shard_store = ShardStore('data')
+
+            # Run 0 is served without faults so every club has last known good results
+            for run in range(runs + 1):
+                scraper = SmartRegattaScraper(max_workers=4, min_host_interval=0, shard_store=shard_store,
+                                              circuit_breaker=breaker, retry_backoff=0.05,
+                                              connect_timeout=1.0, read_timeout=1.0,
+                                              run_time_budget=deadline if run else None)
+                scraper.clubs = clubs
+                active = faults if run else {}
+                handler.keywords['faults'] = active
+                counters.clear()
+                start = time.perf_counter()
+                club_results = scraper.scrape_all_clubs()
+                wall_ms = (time.perf_counter() - start) * 1000
+                scraper.save_club_shards(club_results, scraper.deduplicate_regattas(
+                    [regatta for club_regattas in club_results for regatta in club_regattas]))
+                breaker.save()
+                for club_info, club_regattas in zip(clubs, club_results):
+                    club_metrics = scraper.metrics.club(club_info['name'])
+                    results.append({
+                        'run': run,
+                        'club': club_info['name'],
+                        'mode': active.get(club_info['fixture'], 'ok'),
+                        'attempts': club_metrics.get('attempts', 0),
+                        'retries': club_metrics.get('retries', 0),
+                        'errors': len(club_metrics.get('errors', [])),
+                        'fallback': club_metrics.get('fallback', '-'),
+                        'events': len(club_regattas),
+                        'run_wall_ms': wall_ms
+                    })
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def print_fault_report(results: List[Dict]):
+    """Print what each club went through in each run"""
+    print(f"{'run':>3} {'club':<32} {'mode':<8} {'attempts':>8} {'retries':>7} {'errors':>6} "
+          f"{'fallback':<13} {'events':>6}")
+    for result in results:
+        print(f"{result['run']:>3} {result['club'][:32]:<32} {result['mode']:<8} {result['attempts']:>8} "
+              f"{result['retries']:>7} {result['errors']:>6} {result['fallback']:<13} {result['events']:>6}")
+    print()
+    for run in sorted({result['run'] for result in results}):
+        rows = [result for result in results if result['run'] == run]
+        print(f"run {run}: {rows[0]['run_wall_ms']:.0f} ms, {sum(r['events'] for r in rows)} events, "
+              f"{sum(1 for r in rows if r['fallback'] != '-')} clubs on previous results")
+
+
+class CountingHandler(QuietHandler):
+    """Keep-alive fixture handler that counts connections and requests"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self, *args, counters: Dict[str, int], **kwargs):
+        self.counters = counters
+        super().__init__(*args, **kwargs)
+
+    def setup(self):
+        super().setup()
+        with FAULT_LOCK:
+            self.counters['connections'] = self.counters.get('connections', 0) + 1
+
+    def do_GET(self):
+        with FAULT_LOCK:
+            self.counters['requests'] = self.counters.get('requests', 0) + 1
+        super().do_GET()
+
+
+def run_daemon_benchmark(pages_dir: str, cycles: int, base_interval: float) -> List[Dict]:
+    """Run daemon cycles against the fixtures, jumping the clock to each next due club"""
+    pages_dir = os.path.abspath(pages_dir)
+    counters: Dict[str, int] = {}
+    handler = functools.partial(CountingHandler, directory=pages_dir, counters=counters)
+    results = []
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch, fixture_server(pages_dir, handler) as base_url:
+        os.chdir(scratch)
+        try:
+            clubs = []
+            for club_info in load_manifest(pages_dir):
+                club_info = dict(club_info, url=f"{base_url}/{club_info['fixture']}")
+                club_info.pop('url_templates', None)
+                clubs.append(club_info)
+            scraper = SmartRegattaScraper(max_workers=4, min_host_interval=0, http_cache=HttpCache('.http_cache'),
+                                          shard_store=ShardStore('data'), event_history=EventHistory('history.db'),
+                                          circuit_breaker=CircuitBreaker('circuit_state.json'))
+            scraper.clubs = clubs
+            daemon = ScrapeDaemon(scraper, base_interval=base_interval, state_file='daemon_state.json')
+            daemon.seed()
+            for cycle in range(cycles):
+                counters.clear()
+                start = time.perf_counter()
+                daemon.run_cycle()
+                wall_ms = (time.perf_counter() - start) * 1000
+                intervals = [daemon.schedule[club_info['name']]['interval'] for club_info in clubs]
+                results.append({
+                    'cycle': cycle + 1,
+                    'clock_hours': daemon.clock_offset / 3600,
+                    'clubs': sum(1 for record in scraper.metrics.clubs.values() if 'pages' in record),
+                    'requests': counters.get('requests', 0),
+                    'connections': counters.get('connections', 0),
+                    'min_interval_hours': min(intervals) / 3600,
+                    'max_interval_hours': max(intervals) / 3600,
+                    'wall_ms': wall_ms
+                })
+                daemon.clock_offset += max(0.0, daemon.next_due() - daemon.now())
+            daemon.checkpoint()
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def print_daemon_report(results: List[Dict]):
+    """Print what each daemon cycle refreshed and how many connections it opened"""
+    print(f"{'cycle':>5} {'clock':>8} {'clubs':>5} {'requests':>8} {'new conns':>9} {'intervals':>13} {'wall':>9}")
+    for result in results:
+        intervals = f"{result['min_interval_hours']:.1f}-{result['max_interval_hours']:.1f}h"
+        print(f"{result['cycle']:>5} {result['clock_hours']:>7.1f}h {result['clubs']:>5} {result['requests']:>8} "
+              f"{result['connections']:>9} {intervals:>13} {result['wall_ms']:>7.0f}ms")
+    requests_total = sum(result['requests'] for result in results)
+    connections_total = sum(result['connections'] for result in results)
+    print(f"\n{requests_total} requests over {connections_total} connections "
+          f"({requests_total / max(1, connections_total):.1f} requests per connection)")
+
+
+# Runs index.html's script in a node vm with a stub DOM and a fetch() that
+# reads from a data directory, then times the first render and month changes
+CALENDAR_HARNESS = r'''
+const fs = require('fs');
+const path = require('path');
+const vm = require('vm');
+const { performance } = require('perf_hooks');
+const [pagePath, root, monthsArg] = process.argv.slice(2);
+const html = fs.readFileSync(pagePath, 'utf8');
+const script = html.match(/<script>([\s\S]*?)<\/script>/)[1];
+
+const elements = {};
+const document = {
+    getElementById: id => elements[id] || (elements[id] = {
+        innerHTML: '', textContent: '', classList: { add() {}, remove() {} }
+    }),
+    addEventListener() {}
+};
+let requests = 0, bytes = 0;
+async function fetch(url) {
+    const file = path.join(root, url);
+    if (!fs.existsSync(file)) return { ok: false, json: async () => { throw new Error('missing'); } };
+    const text = fs.readFileSync(file, 'utf8');
+    requests += 1;
+    bytes += Buffer.byteLength(text);
+    return { ok: true, json: async () => JSON.parse(text) };
+}
+const quiet = { log() {}, warn() {}, error: console.error };
+const context = vm.createContext({ document, fetch, console: quiet, setTimeout });
+
+function renderedEvents() {
+    return (elements.calendar.innerHTML.match(/showEventDetailsByIndex\(/g) || []).length;
+}
+
+(async () => {
+    let start = performance.now();
+    vm.runInContext(script, context);
+    await vm.runInContext("typeof ready !== 'undefined' ? ready : new Promise(r => setTimeout(r, 200))", context);
+    const firstMs = performance.now() - start;
+    let shown = renderedEvents();
+    const monthMs = [];
+    for (let i = 1; i < Number(monthsArg); i++) {
+        start = performance.now();
+        await vm.runInContext('changeMonth(1)', context);
+        monthMs.push(performance.now() - start);
+        shown += renderedEvents();
+    }
+    monthMs.sort((a, b) => a - b);
+    console.log(JSON.stringify({
+        first_ms: firstMs,
+        month_ms: monthMs.reduce((a, b) => a + b, 0) / Math.max(1, monthMs.length),
+        month_p95_ms: monthMs[Math.floor(monthMs.length * 0.95)] || 0,
+        requests, bytes, shown
+    }));
+})();
+'''
+
+SPANISH_MONTHS = ['enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio', 'julio', 'agosto',
+                  'septiembre', 'octubre', 'noviembre', 'diciembre']
+
+
+def synthetic_regattas(count: int, months: int, clubs: int = 40, seed: int = 7) -> List[Regatta]:
+    """Build events spread over the coming months, in the date formats clubs use"""
+    rng = random.Random(seed)
+    today = date.today().replace(day=1)
+    regattas = []
+    for index in range(count):
+        start = today + timedelta(days=rng.randrange(months * 30))
+        end = start + timedelta(days=rng.choice([0, 0, 0, 1, 2, 4]))
+        if rng.random() < 0.5:
+            date_str = f"{start.day:02d}/{start.month:02d}/{start.year}"
+        else:
+            date_str = f"{start.day} de {SPANISH_MONTHS[start.month - 1]} de {start.year}"
+        # Some events come without a parsed start date, as from older shards
+        parsed = rng.random() >= 0.1
+        club = f"Club Náutico {index % clubs:02d}"
+        regattas.append(Regatta(
+            title=f"Trofeo {rng.choice(['Primavera', 'Otoño', 'Ciudad', 'Bahía', 'Faro'])} {index}",
+            date=date_str,
+            start_date=start.isoformat() if parsed else None,
+            end_date=end.isoformat() if parsed else None,
+            details='Regata de flota',
+            club=club,
+            location='Mallorca',
+            url=f"https://example.org/{club_slug(club)}/{index}",
+            boat_type=rng.choice(list(BoatType)),
+            event_type=rng.choice(list(EventType))
+        ))
+    return regattas
+
+
+def write_calendar_data(regattas: List[Regatta], root: str) -> Dict[str, str]:
+    """Write the same events as calendar months, club shards and one regattas.json, one directory each"""
+    scraper = SmartRegattaScraper()
+    roots = {mode: os.path.join(root, mode) for mode in ('calendar', 'shards', 'full')}
+    
+    CalendarIndex(os.path.join(roots['calendar'], 'data', 'calendar')).update(regattas)
+    
+    shard_store = ShardStore(os.path.join(roots['shards'], 'data'))
+    by_club: Dict[str, List[Regatta]] = {}
+    for regatta in regattas:
+        by_club.setdefault(regatta.club, []).append(regatta)
+    for club, club_regattas in by_club.items():
+        shard_store.update(club, [r.to_dict() for r in club_regattas], scraper.event_months(club_regattas))
+    shard_store.save_manifest()
+    
+    os.makedirs(roots['full'], exist_ok=True)
+    scraper.save_regattas_json(regattas, os.path.join(roots['full'], 'regattas.json'))
+    return roots
+
+
+def write_extract_pages(regattas: List[Regatta], pages_dir: str) -> List[Dict]:
+    """Write one page per club in the layout of the synthetic fixtures"""
+    by_club: Dict[str, List[Regatta]] = {}
+    for regatta in regattas:
+        by_club.setdefault(regatta.club, []).append(regatta)
+    manifest = []
+    for club, events in by_club.items():
+        items = "".join(f"<li>\n<h3>{r.title}</h3>\n<p>{r.date}</p>\n<p>{r.details}</p>\n</li>\n" for r in events)
+        filename = club_slug(club) + '.html'
+        with open(os.path.join(pages_dir, filename), 'w', encoding='utf-8') as f:
+            f.write("<html><head><meta charset=\"utf-8\"><title>Regatas</title></head>\n<body>\n"
+                    f"<main>\n<h1>{club}</h1>\n<ul>\n{items}</ul>\n</main>\n</body></html>\n")
+        manifest.append({'name': club, 'location': 'Mallorca', 'fixture': filename})
+    return manifest
+
+
+def run_extract_benchmark(clubs: int, events: int, worker_counts: List[int], fetch_workers: int) -> List[Dict]:
+    """Time a cold and a warm scrape of the synthetic pages per extraction mode"""
+    results = []
+    baseline = None
+    with tempfile.TemporaryDirectory() as pages_dir:
+        manifest = write_extract_pages(synthetic_regattas(clubs * events, 12, clubs=clubs), pages_dir)
+        with fixture_server(pages_dir) as base_url:
+            club_list = [dict(club_info, url=f"{base_url}/{club_info['fixture']}") for club_info in manifest]
+            for extract_workers in [0] + worker_counts:
+                scraper = SmartRegattaScraper(max_workers=fetch_workers, min_host_interval=0,
+                                              extract_workers=extract_workers)
+                try:
+                    timings = []
+                    for _ in range(2):
+                        scraper.metrics = RunMetrics()
+                        start = time.perf_counter()
+                        club_results = scraper.scrape_all_clubs(club_list)
+                        timings.append(time.perf_counter() - start)
+                finally:
+                    scraper.close_extract_pool()
+                records = [regatta.to_dict(compact=True) for regattas in club_results for regatta in regattas]
+                if baseline is None:
+                    baseline = records
+                extract_cpu = sum(r['cpu_ms'] for r in scraper.metrics.stages if r['stage'] in ('parse', 'extract'))
+                results.append({
+                    'mode': f"{extract_workers} processes" if extract_workers else 'threads',
+                    'pages': len(club_list),
+                    'events': len(records),
+                    'cold_s': timings[0],
+                    'warm_s': timings[1],
+                    'extract_cpu_s': extract_cpu / 1000,
+                    'speedup': results[0]['warm_s'] / timings[1] if results else 1.0,
+                    'same': records == baseline
+                })
+    return results
+
+
+def print_extract_report(results: List[Dict]):
+    """Print scrape times per extraction mode against the in-thread baseline"""
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'mode':<12} {'pages':>6} {'events':>7} {'cold s':>7} {'warm s':>7} {'cpu s':>7} "
+          f"{'speedup':>8} {'same':>5}")
+    for result in results:
+        print(f"{result['mode']:<12} {result['pages']:>6} {result['events']:>7} {result['cold_s']:>7.2f} "
+              f"{result['warm_s']:>7.2f} {result['extract_cpu_s']:>7.2f} {result['speedup']:>7.2f}x "
+              f"{'yes' if result['same'] else 'NO':>5}")
+
+
+def run_calendar_benchmark(page: str, events: int, months: int) -> List[Dict]:
+    """Time the calendar page on each data layout with node"""
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        roots = write_calendar_data(synthetic_regattas(events, months), root)
+        harness = os.path.join(root, 'harness.js')
+        with open(harness, 'w', encoding='utf-8') as f:
+            f.write(CALENDAR_HARNESS)
+        for mode, mode_root in roots.items():
+            output = subprocess.run(['node', harness, os.path.abspath(page), mode_root, str(months)],
+                                    check=True, capture_output=True, text=True).stdout
+            results.append({'mode': mode, 'events': events, **json.loads(output)})
+    return results
+
+
+def print_calendar_report(results: List[Dict]):
+    """Print first render and month change times per data layout"""
+    print(f"{'data':<10} {'events':>7} {'first ms':>9} {'month ms':>9} {'p95 ms':>8} {'requests':>8} "
+          f"{'KB read':>8} {'shown':>6}")
+    for result in results:
+        print(f"{result['mode']:<10} {result['events']:>7} {result['first_ms']:>9.2f} {result['month_ms']:>9.2f} "
+              f"{result['month_p95_ms']:>8.2f} {result['requests']:>8} {result['bytes'] / 1024:>8.0f} "
+              f"{result['shown']:>6}")
+
+
+class BotApiHandler(http.server.BaseHTTPRequestHandler):
+    """Stand-in for the Telegram Bot API's sendMessage
+
+    ok: accepts everything; throttle: every third request gets a 429 with
+    retry_after; flaky: every other request is a 502; down: always 503;
+    markdown: rejects Markdown with 400 "can't parse entities".
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self, *args, state: Dict, **kwargs):
+        self.state = state
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status: int, body: Dict):
+        content = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_POST(self):
+        form = urllib.parse.parse_qs(self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8'))
+        mode = self.state['mode']
+        with FAULT_LOCK:
+            self.state['requests'] += 1
+            count = self.state['requests']
+        if not self.path.endswith('/sendMessage'):
+            self.reply(404, {'ok': False, 'description': 'Not Found'})
+        elif mode == 'down' or (mode == 'flaky' and count % 2):
+            self.reply(503 if mode == 'down' else 502, {'ok': False, 'description': 'Bad Gateway'})
+        elif mode == 'throttle' and count % 3 == 0:
+            self.reply(429, {'ok': False, 'description': 'Too Many Requests: retry after 1',
+                             'parameters': {'retry_after': 1}})
+        elif mode == 'markdown' and 'parse_mode' in form:
+            self.reply(400, {'ok': False, 'description': "Bad Request: can't parse entities"})
+        elif len(form['text'][0].encode('utf-16-le')) // 2 > 4096:
+            self.reply(400, {'ok': False, 'description': 'Bad Request: message is too long'})
+        else:
+            with FAULT_LOCK:
+                self.state['messages'].append(form['text'][0])
+            self.reply(200, {'ok': True, 'result': {'message_id': len(self.state['messages'])}})
+
+
+def run_notify_benchmark(events: int, modes: List[str]) -> List[Dict]:
+    """Queue notifications for synthetic new events and deliver them through the stand-in Bot API"""
+    results = []
+    state = {'mode': 'ok', 'requests': 0, 'messages': []}
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(BotApiHandler, state=state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        for mode in modes:
+            with tempfile.TemporaryDirectory() as scratch:
+                state.update(mode=mode, requests=0, messages=[])
+                scraper = SmartRegattaScraper('token', 'chat', event_history=EventHistory(os.path.join(scratch, 'h.db')),
+                                              telegram_api=api_base)
+                scraper.telegram = TelegramClient(scraper.session, 'token', 'chat', api_base=api_base,
+                                                  min_interval=0.01, retry_backoff=0.05, max_retries=3)
+                regattas = synthetic_regattas(events, 12)
+                start = time.perf_counter()
+                scraper.identify_new_events(regattas)
+                scraper.deliver_notifications()
+                pending_after_run = len(scraper.event_history.pending_notifications())
+                # The next run, once the API is back
+                state['mode'] = 'ok'
+                scraper.deliver_notifications()
+                wall_ms = (time.perf_counter() - start) * 1000
+                
+                titles = [line[2:] for message in state['messages'] for line in message.split('\n')
+                          if line.startswith('🏆 ')]
+                results.append({
+                    'mode': mode,
+                    'events': events,
+                    'requests': state['requests'],
+                    'messages': len(state['messages']),
+                    'longest': max((len(m.encode('utf-16-le')) // 2 for m in state['messages']), default=0),
+                    'pending_after_run': pending_after_run,
+                    'delivered': len(set(titles)),
+                    'duplicates': len(titles) - len(set(titles)),
+                    'pending': len(scraper.event_history.pending_notifications()),
+                    'wall_ms': wall_ms
+                })
+                scraper.event_history.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+def print_notify_report(results: List[Dict]):
+    """Print how each Bot API behaviour was handled"""
+    print(f"{'mode':<9} {'events':>6} {'requests':>8} {'messages':>8} {'longest':>7} {'queued':>6} "
+          f"{'delivered':>9} {'dupes':>5} {'pending':>7} {'wall':>8}")
+    for result in results:
+        print(f"{result['mode']:<9} {result['events']:>6} {result['requests']:>8} {result['messages']:>8} "
+              f"{result['longest']:>7} {result['pending_after_run']:>6} {result['delivered']:>9} "
+              f"{result['duplicates']:>5} {result['pending']:>7} {result['wall_ms']:>6.0f}ms")
+
+
+class TranslateApiHandler(http.server.BaseHTTPRequestHandler):
+    """Stand-in for the translate endpoint, answering in its nested list format
+
+    Every line of q comes back prefixed with [tl]. ok: answers everything;
+    flaky: every other request is a 502; slow: answers after state['delay']
+    seconds; down: always 503.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self, *args, state: Dict, **kwargs):
+        self.state = state
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status: int, body):
+        content = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        mode = self.state['mode']
+        with FAULT_LOCK:
+            self.state['requests'] += 1
+            count = self.state['requests']
+            self.state['texts'] += len(query['q'][0].split('\n'))
+        if mode == 'down' or (mode == 'flaky' and count % 2):
+            self.reply(503 if mode == 'down' else 502, {'error': 'unavailable'})
+            return
+        if mode == 'slow':
+            time.sleep(self.state['delay'])
+        lines = [f"[{query['tl'][0]}] {line}" for line in query['q'][0].split('\n')]
+        # Segments are split at line ends, as the real endpoint does
+        segments = [[line + '\n', None] for line in lines[:-1]] + [[lines[-1], None]]
+        self.reply(200, [segments, None, query['sl'][0]])
+
+
+def run_translate_benchmark(events: int, modes: List[str], budget: float, batch_chars: int) -> List[Dict]:
+    """Translate synthetic titles through the stand-in endpoint, then again from the cache"""
+    results = []
+    state = {'mode': 'ok', 'requests': 0, 'texts': 0, 'delay': budget * 2}
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(TranslateApiHandler, state=state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/translate_a/single"
+    titles = [regatta.title for regatta in synthetic_regattas(events, 12)]
+    try:
+        for mode in modes:
+            with tempfile.TemporaryDirectory() as scratch:
+                state.update(mode=mode, requests=0, texts=0)
+                scraper = SmartRegattaScraper(event_history=EventHistory(os.path.join(scratch, 'h.db')))
+                translator = TranslationService(scraper.session, target_lang='en',
+                                                cache_file=os.path.join(scratch, 'translations.json'),
+                                                endpoint=endpoint, batch_chars=batch_chars, time_budget=budget)
+                start = time.perf_counter()
+                translated = translator.translate_many(titles)
+                wall_ms = (time.perf_counter() - start) * 1000
+                first_requests = state['requests']
+                
+                # The next run, once the endpoint is back, only asks for what was missed
+                state.update(mode='ok', requests=0, texts=0)
+                reloaded = TranslationService(scraper.session, target_lang='en', cache_file=translator.cache_file,
+                                              endpoint=endpoint, batch_chars=batch_chars, time_budget=budget)
+                retranslated = reloaded.translate_many(titles)
+                expected = [f"[en] {translator.apply_glossary(title)}".strip() for title in titles]
+                results.append({
+                    'mode': mode,
+                    'titles': len(set(titles)),
+                    'requests': first_requests,
+                    'translated': sum(1 for text, title in zip(translated, titles) if text != title),
+                    'fallback': sum(1 for text, title in zip(translated, titles) if text == title),
+                    'second_requests': state['requests'],
+                    'second_texts': state['texts'],
+                    'correct': sum(1 for text, want in zip(retranslated, expected) if text == want),
+                    'wall_ms': wall_ms
+                })
+                translator.close()
+                reloaded.close()
+                scraper.event_history.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+def print_translate_report(results: List[Dict]):
+    """Print how each endpoint behaviour was handled"""
+    print(f"{'mode':<6} {'titles':>6} {'requests':>8} {'translated':>10} {'fallback':>8} "
+          f"{'2nd reqs':>8} {'2nd texts':>9} {'correct':>7} {'wall':>8}")
+    for result in results:
+        print(f"{result['mode']:<6} {result['titles']:>6} {result['requests']:>8} {result['translated']:>10} "
+              f"{result['fallback']:>8} {result['second_requests']:>8} {result['second_texts']:>9} "
+              f"{result['correct']:>7} {result['wall_ms']:>6.0f}ms")
+
+
+class StageTimer:
+    """Collect wall time, CPU time and peak memory growth per (club, stage)"""
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.results: List[Dict] = []
+
+    @contextmanager
+    def stage(self, club: str, name: str):
+        traced_start = 0
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            traced_start = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        yield
+        result = {
+            'club': club,
+            'stage': name,
+            'wall_ms': (time.perf_counter() - wall_start) * 1000,
+            'cpu_ms': (time.process_time() - cpu_start) * 1000,
+            'peak_kb': None
+        }
+        if self.trace_memory:
+            result['peak_kb'] = (tracemalloc.get_traced_memory()[1] - traced_start) / 1024
+        self.results.append(result)
+
+
+def run_stage_benchmark(pages_dir: str, trace_memory: bool = True) -> List[Dict]:
+    """Replay the fixtures through every scraper stage"""
+    manifest = load_manifest(pages_dir)
+    scraper = SmartRegattaScraper(max_workers=1, min_host_interval=0)
+    timer = StageTimer(trace_memory)
+    if trace_memory:
+        tracemalloc.start()
+
+    all_regattas = []
+    with fixture_server(pages_dir) as base_url:
+        for club_info in manifest:
+            club_info = dict(club_info, url=f"{base_url}/{club_info['fixture']}")
+            name = club_info['name']
+            with timer.stage(name, 'fetch'):
+                content = scraper.session.get(club_info['url'], timeout=8).content
+            with timer.stage(name, 'parse'):
+                lines = scraper.extract_text_lines(content, club_info)
+            with timer.stage(name, 'extract'):
+                all_regattas.extend(scraper.extract_regatta_lines(lines, club_info))
+
+    # Run-level stages write into a scratch directory
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            with timer.stage('*', 'dedup'):
+                unique_regattas = scraper.deduplicate_regattas(all_regattas)
+            with timer.stage('*', 'identify_new_events'):
+                new_events = scraper.identify_new_events(unique_regattas)
+            with timer.stage('*', 'json_write'):
+                scraper.save_regattas_json(unique_regattas)
+            with timer.stage('*', 'telegram_format'):
+                scraper.format_telegram_messages(new_events)
+        finally:
+            os.chdir(cwd)
+
+    if trace_memory:
+        tracemalloc.stop()
+    return timer.results
+
+
+def print_stage_report(results: List[Dict]):
+    """Print per club and total stage timings"""
+    print(f"{'club':<32} {'stage':<20} {'wall ms':>9} {'cpu ms':>9} {'peak KB':>9}")
+    for result in results:
+        peak = f"{result['peak_kb']:.1f}" if result['peak_kb'] is not None else '-'
+        print(f"{result['club'][:32]:<32} {result['stage']:<20} {result['wall_ms']:>9.2f} "
+              f"{result['cpu_ms']:>9.2f} {peak:>9}")
+
+    print()
+    print(f"{'TOTAL by stage':<53} {'wall ms':>9} {'cpu ms':>9} {'peak KB':>9}")
+    stages = list(dict.fromkeys(result['stage'] for result in results))
+    for stage in stages:
+        rows = [r for r in results if r['stage'] == stage]
+        peaks = [r['peak_kb'] for r in rows if r['peak_kb'] is not None]
+        peak = f"{max(peaks):.1f}" if peaks else '-'
+        print(f"{stage:<53} {sum(r['wall_ms'] for r in rows):>9.2f} "
+              f"{sum(r['cpu_ms'] for r in rows):>9.2f} {peak:>9}")
+    print(f"{'all stages':<53} {sum(r['wall_ms'] for r in results):>9.2f} "
+          f"{sum(r['cpu_ms'] for r in results):>9.2f}")
+
+
+def scale_page(content: bytes, factor: int) -> bytes:
+    """Repeat a page's body content factor times"""
+    document = lxml.html.document_fromstring(content)
+    body = document.find('body')
+    if body is None:
+        body = document
+    inner = (body.text or '') + ''.join(
+        lxml.html.tostring(child, encoding='unicode') for child in body
+    )
+    return f"<html><head><meta charset=\"utf-8\"></head><body>{inner * factor}</body></html>".encode('utf-8')
+
+
+def run_scale_benchmark(pages_dir: str, factors: List[int]) -> List[Dict]:
+    """Time parse and extraction on pages scaled by each factor"""
+    scraper = SmartRegattaScraper()
+    results = []
+    for club_info in load_manifest(pages_dir):
+        with open(os.path.join(pages_dir, club_info['fixture']), 'rb') as f:
+            content = f.read()
+        for factor in factors:
+            page = scale_page(content, factor)
+            start = time.perf_counter()
+            lines = scraper.extract_text_lines(page, club_info)
+            parse_time = time.perf_counter() - start
+            start = time.perf_counter()
+            regattas = scraper.extract_regatta_lines(lines, club_info)
+            extract_time = time.perf_counter() - start
+            results.append({
+                'club': club_info['name'],
+                'factor': factor,
+                'bytes': len(page),
+                'lines': len(lines),
+                'events': len(regattas),
+                'parse_ms': parse_time * 1000,
+                'extract_ms': extract_time * 1000
+            })
+    return results
+
+
+def print_scale_report(results: List[Dict]):
+    """Print scaling results with per-line cost to expose non-linear growth"""
+    print(f"{'club':<32} {'x':>5} {'KB':>9} {'lines':>8} {'events':>7} "
+          f"{'parse ms':>9} {'extract ms':>11} {'us/line':>8}")
+    for result in results:
+        per_line = result['extract_ms'] * 1000 / max(result['lines'], 1)
+        print(f"{result['club'][:32]:<32} {result['factor']:>5} {result['bytes'] / 1024:>9.1f} "
+              f"{result['lines']:>8} {result['events']:>7} {result['parse_ms']:>9.2f} "
+              f"{result['extract_ms']:>11.2f} {per_line:>8.2f}")
+
+    print()
+    print(f"{'TOTAL x':<7} {'parse ms':>9} {'extract ms':>11} {'us/line':>8}")
+    for factor in dict.fromkeys(result['factor'] for result in results):
+        rows = [r for r in results if r['factor'] == factor]
+        extract_ms = sum(r['extract_ms'] for r in rows)
+        lines = sum(r['lines'] for r in rows)
+        print(f"{factor:<7} {sum(r['parse_ms'] for r in rows):>9.2f} {extract_ms:>11.2f} "
+              f"{extract_ms * 1000 / max(lines, 1):>8.2f}")
+
+
+# Keyword lists of the previous substring classifier
+SUBSTRING_YACHT_KEYWORDS = ['orc', 'swan', 'j70', 'j/70', 'crucero', 'cruceros', 'cruising', 'keelboat', 'maxi',
+                            'phrf', 'irc', 'crf', 'open', 'big boat', 'yacht', 'monohull', 'multihull',
+                            'catamaran', 'trimaran']
+SUBSTRING_DINGHY_KEYWORDS = ['optimist', 'optimista', 'laser', 'ilca', '420', 'snipe', 'dragon', 'dragón', 'cadet',
+                             'europe', 'finn', 'radial', 'standard', 'dinghy', 'single handed', 'double handed',
+                             'youth', 'junior', 'cadete']
+SUBSTRING_SERIES_KEYWORDS = ['series', 'liga', 'championship', 'campeonato', 'circuit', 'circuito', 'anual',
+                             'annual', 'temporada', 'season', 'ranking']
+
+
+def substring_categorize(scraper: SmartRegattaScraper, event: Tuple[str, str, str]) -> Tuple[str, str]:
+    """Previous classifier: first yacht, then dinghy, then series keyword found as a substring wins"""
+    title, date_str, details = event
+    boat_text = f"{title} {details}".lower()
+    if any(keyword in boat_text for keyword in SUBSTRING_YACHT_KEYWORDS):
+        boat_type = BoatType.YACHTS
+    elif any(keyword in boat_text for keyword in SUBSTRING_DINGHY_KEYWORDS):
+        boat_type = BoatType.DINGHIES
+    else:
+        boat_type = BoatType.MIXED
+    series_text = f"{title} {date_str} {details}".lower()
+    if any(keyword in series_text for keyword in SUBSTRING_SERIES_KEYWORDS):
+        event_type = EventType.SERIES
+    else:
+        event_type = scraper.event_duration_type(date_str)
+    return boat_type, event_type
+
+
+def compiled_categorize(scraper: SmartRegattaScraper, event: Tuple[str, str, str]) -> Tuple[str, str]:
+    """Current classifier: weighted whole-word keywords, memoized"""
+    (boat_type, _), (event_type, _) = scraper.classify_event(event)
+    return boat_type, event_type
+
+
+def clear_classifier_caches(scraper: SmartRegattaScraper):
+    """Forget every memoized classification"""
+    scraper.classify_event.cache_clear()
+    for classifier in (scraper.boat_classifier, scraper.series_classifier):
+        classifier.classify_folded.cache_clear()
+
+
+def run_classify_benchmark(labels_file: str, repeat: int) -> List[Dict]:
+    """Score each classifier against the labels and time repeated passes over them"""
+    with open(labels_file, 'r', encoding='utf-8') as f:
+        labeled = json.load(f)
+    events = [(record['title'], record['date'], record['details']) for record in labeled]
+    scraper = SmartRegattaScraper(clubs=[])
+    results = []
+    for name, categorize in (('substring', substring_categorize), ('compiled', compiled_categorize)):
+        predictions = [categorize(scraper, event) for event in events]
+        misses = [(record, prediction) for record, prediction in zip(labeled, predictions)
+                  if (record['boat_type'], record['event_type']) != prediction]
+        timings = {}
+        for run in ('cold', 'warm'):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                if run == 'cold':
+                    clear_classifier_caches(scraper)
+                for event in events:
+                    categorize(scraper, event)
+            timings[run] = time.perf_counter() - start
+        results.append({
+            'classifier': name,
+            'events': len(events),
+            'boat_correct': sum(record['boat_type'] == boat_type for record, (boat_type, _) in zip(labeled, predictions)),
+            'event_correct': sum(record['event_type'] == event_type
+                                 for record, (_, event_type) in zip(labeled, predictions)),
+            'both_correct': len(events) - len(misses),
+            'cold_per_s': len(events) * repeat / timings['cold'],
+            'warm_per_s': len(events) * repeat / timings['warm'],
+            'misses': misses
+        })
+    return results
+
+
+def print_classify_report(results: List[Dict]):
+    """Print accuracy and throughput per classifier, then the current classifier's misses"""
+    print(f"{'classifier':<11} {'events':>7} {'boat %':>7} {'event %':>8} {'both %':>7} "
+          f"{'cold ev/s':>10} {'warm ev/s':>10}")
+    for result in results:
+        count = result['events']
+        print(f"{result['classifier']:<11} {count:>7} {result['boat_correct'] * 100 / count:>7.1f} "
+              f"{result['event_correct'] * 100 / count:>8.1f} {result['both_correct'] * 100 / count:>7.1f} "
+              f"{result['cold_per_s']:>10.0f} {result['warm_per_s']:>10.0f}")
+    
+    print()
+    for result in results:
+        print(f"{result['classifier']} misses:")
+        for record, (boat_type, event_type) in result['misses']:
+            print(f"  {record['title'][:60]:<60} {boat_type.value}/{event_type.value}, "
+                  f"labeled {record['boat_type']}/{record['event_type']} ({record['source']})")
+
+
+def soup_lines(scraper: SmartRegattaScraper, content: bytes, club_info: Dict) -> int:
+    """Previous parse path: full BeautifulSoup tree and get_text()"""
+    return len(BeautifulSoup(content, 'html.parser').get_text().split('\n'))
+
+
+def lxml_lines(scraper: SmartRegattaScraper, content: bytes, club_info: Dict) -> int:
+    """Tree parse path: lxml with noise subtrees removed"""
+    return len(scraper.extract_text_lines(content, club_info))
+
+
+def stream_lines(scraper: SmartRegattaScraper, content: bytes, club_info: Dict) -> int:
+    """Streaming path: 64 KB chunks through a parser target, lines consumed as they complete"""
+    target = TextLineTarget(scraper.noise_tags)
+    chunks = (content[start:start + 64 * 1024] for start in range(0, len(content), 64 * 1024))
+    for _ in scraper.stream_text_lines(chunks, target):
+        pass
+    return target.line_count
+
+
+PARSERS = {
+    'html.parser': soup_lines,
+    'lxml': lxml_lines,
+    'stream': stream_lines
+}
+
+
+def page_club_info(path: str) -> Dict:
+    """Build a stand-in club entry for a saved page"""
+    return {'name': os.path.basename(path), 'url': 'file://' + os.path.abspath(path), 'location': ''}
+
+
+def measure_parse(parser_name: str, path: str, repeat: int) -> Dict:
+    """Time one parser on one page and record its peak memory"""
+    scraper = SmartRegattaScraper()
+    parse = PARSERS[parser_name]
+    club_info = page_club_info(path)
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    # Native (libxml2) allocations are invisible to tracemalloc, so also
+    # report how far this fresh process's peak RSS grew during the run
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    line_count = parse(scraper, content, club_info)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(scraper, content, club_info)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'parser': parser_name,
+        'page': os.path.basename(path),
+        'bytes': len(content),
+        'lines': line_count,
+        'best_ms': min(timings) * 1000,
+        'python_peak_kb': python_peak / 1024,
+        'rss_growth_kb': rss_growth
+    }
+
+
+def run_parse_benchmark(paths: List[str], repeat: int) -> List[Dict]:
+    """Measure every parser on every page, each in a fresh interpreter"""
+    results = []
+    for path in paths:
+        for parser_name in PARSERS:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '_measure-parse', parser_name, path, str(repeat)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            results.append(json.loads(output))
+    return results
+
+
+def print_parse_report(results: List[Dict]):
+    """Print parse results side by side per page"""
+    print(f"{'page':<40} {'parser':<12} {'KB':>8} {'lines':>7} {'best ms':>9} {'py peak KB':>11} {'RSS +KB':>9}")
+    for result in results:
+        print(f"{result['page'][:40]:<40} {result['parser']:<12} {result['bytes'] / 1024:>8.1f} "
+              f"{result['lines']:>7} {result['best_ms']:>9.2f} {result['python_peak_kb']:>11.1f} "
+              f"{result['rss_growth_kb']:>9}")
+
+    for parser_name in PARSERS:
+        total = sum(r['best_ms'] for r in results if r['parser'] == parser_name)
+        print(f"Total {parser_name}: {total:.2f} ms")
+
+
+def expand_pages(paths: List[str]) -> List[str]:
+    """Expand directories into the HTML pages they contain"""
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            pages.extend(sorted(glob.glob(os.path.join(path, '*.html'))))
+        else:
+            pages.append(path)
+    return pages
+
+
+def main(argv=None):
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Regatta scraper benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='save club pages as offline fixtures')
+    record_parser.add_argument('--pages-dir', default=DEFAULT_PAGES_DIR)
+    record_parser.add_argument('--synthetic', action='store_true',
+                               help='build pages from regattas.json instead of fetching live sites')
+
+    run_parser = subparsers.add_parser('run', help='time every stage against the fixtures')
+    run_parser.add_argument('--pages-dir', default=DEFAULT_PAGES_DIR)
+    run_parser.add_argument('--no-memory', action='store_true',
+                            help='skip tracemalloc (cleaner timings, no peak memory)')
+
+    scale_parser = subparsers.add_parser('scale', help='time extraction on scaled-up fixture pages')
+    scale_parser.add_argument('--pages-dir', default=DEFAULT_PAGES_DIR)
+    scale_parser.add_argument('--factors', type=int, nargs='+', default=[1, 10, 100, 1000])
+
+    parse_parser = subparsers.add_parser('parse', help='compare page parse paths')
+    parse_parser.add_argument('pages', nargs='*', default=[DEFAULT_PAGES_DIR],
+                              help=f'saved pages or directories (default: {DEFAULT_PAGES_DIR})')
+    parse_parser.add_argument('--repeat', type=int, default=5, help='timed runs per page (default: 5)')
+
+    faults_parser = subparsers.add_parser('faults', help='exercise retries, circuit breaker and deadline')
+    faults_parser.add_argument('--pages-dir', default=DEFAULT_PAGES_DIR)
+    faults_parser.add_argument('--modes', nargs='+', choices=FAULT_MODES, default=FAULT_MODES,
+                               help='failure modes assigned to clubs in turn (default: all)')
+    faults_parser.add_argument('--runs', type=int, default=4, help='faulty runs after the clean one (default: 4)')
+    faults_parser.add_argument('--deadline', type=float, default=5.0, help='run deadline in seconds (default: 5)')
+    faults_parser.add_argument('--threshold', type=int, default=2,
+                               help='failed runs before a club is skipped (default: 2)')
+    faults_parser.add_argument('--probe-interval', type=float, default=3600.0,
+                               help='seconds between probes of a skipped club (default: 3600)')
+
+    daemon_parser = subparsers.add_parser('daemon', help='run daemon cycles on a simulated clock')
+    daemon_parser.add_argument('--pages-dir', default=DEFAULT_PAGES_DIR)
+    daemon_parser.add_argument('--cycles', type=int, default=10, help='cycles to run (default: 10)')
+    daemon_parser.add_argument('--interval', type=float, default=6 * 3600,
+                               help='initial refresh interval in seconds (default: 6 hours)')
+
+    calendar_parser = subparsers.add_parser('calendar', help='time the calendar page headless on synthetic data')
+    calendar_parser.add_argument('--page', default='index.html', help='calendar page to time (default: index.html)')
+    calendar_parser.add_argument('--events', type=int, default=5000, help='synthetic events (default: 5000)')
+    calendar_parser.add_argument('--months', type=int, default=24, help='months to step through (default: 24)')
+
+    notify_parser = subparsers.add_parser('notify', help='deliver notifications through a stand-in Bot API')
+    notify_parser.add_argument('--events', type=int, default=200, help='synthetic new events (default: 200)')
+    notify_parser.add_argument('--modes', nargs='+', choices=NOTIFY_MODES, default=NOTIFY_MODES,
+                               help='Bot API behaviours to run against (default: all)')
+
+    translate_parser = subparsers.add_parser('translate', help='translate titles through a stand-in endpoint')
+    translate_parser.add_argument('--events', type=int, default=300, help='synthetic events (default: 300)')
+    translate_parser.add_argument('--modes', nargs='+', choices=TRANSLATE_MODES, default=TRANSLATE_MODES,
+                                  help='endpoint behaviours to run against (default: all)')
+    translate_parser.add_argument('--budget', type=float, default=2.0,
+                                  help='translation time budget in seconds (default: 2)')
+    translate_parser.add_argument('--batch-chars', type=int, default=1500,
+                                  help='characters per request (default: 1500)')
+
+    extract_parser = subparsers.add_parser('extract', help='compare in-thread and process pool extraction')
+    extract_parser.add_argument('--clubs', type=int, default=32, help='synthetic club pages (default: 32)')
+    extract_parser.add_argument('--events', type=int, default=400, help='events per page (default: 400)')
+    extract_parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                                help='extraction process counts to time (default: 1 2 4)')
+    extract_parser.add_argument('--fetch-workers', type=int, default=8,
+                                help='fetch threads (default: 8)')
+
+    classify_parser = subparsers.add_parser('classify', help='score and time the event classifier')
+    classify_parser.add_argument('--labels', default=DEFAULT_LABELS_FILE,
+                                 help=f'labeled events (default: {DEFAULT_LABELS_FILE})')
+    classify_parser.add_argument('--repeat', type=int, default=200,
+                                 help='timed passes over the labeled events (default: 200)')
+
+    measure_parser = subparsers.add_parser('_measure-parse')
+    measure_parser.add_argument('parser_name', choices=list(PARSERS))
+    measure_parser.add_argument('page')
+    measure_parser.add_argument('repeat', type=int)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        scraper = SmartRegattaScraper()
+        if args.synthetic:
+            synthesize_fixtures(scraper, args.pages_dir)
+        else:
+            record_fixtures(scraper, args.pages_dir)
+    elif args.command == 'run':
+        print_stage_report(run_stage_benchmark(args.pages_dir, trace_memory=not args.no_memory))
+    elif args.command == 'scale':
+        print_scale_report(run_scale_benchmark(args.pages_dir, args.factors))
+    elif args.command == 'faults':
+        print_fault_report(run_fault_benchmark(args.pages_dir, args.modes, args.runs, args.deadline,
+                                               args.threshold, args.probe_interval))
+    elif args.command == 'daemon':
+        print_daemon_report(run_daemon_benchmark(args.pages_dir, args.cycles, args.interval))
+    elif args.command == 'calendar':
+        print_calendar_report(run_calendar_benchmark(args.page, args.events, args.months))
+    elif args.command == 'notify':
+        print_notify_report(run_notify_benchmark(args.events, args.modes))
+    elif args.command == 'translate':
+        print_translate_report(run_translate_benchmark(args.events, args.modes, args.budget, args.batch_chars))
+    elif args.command == 'extract':
+        print_extract_report(run_extract_benchmark(args.clubs, args.events, args.workers, args.fetch_workers))
+    elif args.command == 'classify':
+        print_classify_report(run_classify_benchmark(args.labels, args.repeat))
+    elif args.command == '_measure-parse':
+        print(json.dumps(measure_parse(args.parser_name, args.page, args.repeat)))
+    elif args.command == 'parse':
+        pages = expand_pages(args.pages)
+        if not pages:
+            parser.error('no saved pages found')
+        print_parse_report(run_parse_benchmark(pages, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,343 +8,2611 @@ Balearic Islands Sailing Regatta Scraper - COMPLETE FIXED VERSION
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+import urllib3
+from bs4 import UnicodeDammit
+import lxml.html
+from lxml import etree
 import re
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
 import json
 import os
+import hashlib
+import gzip
+import pickle
+import tempfile
+import argparse
+import sys
+import sqlite3
+import cProfile
+import pstats
+import tracemalloc
+import io
 import logging
 import time
-from typing import List, Dict, Set
+import random
+import threading
+import multiprocessing
+import signal
+import unicodedata
+import functools
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from difflib import SequenceMatcher
+from urllib.parse import quote, urlparse, urljoin
+from typing import Callable, List, Dict, Set, Optional, Tuple, Iterable, Iterator
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Bump whenever create_event_signature changes so stored history is re-keyed
+SIGNATURE_SCHEME = 2
+
+# Bump whenever extraction changes so pages with a known content fingerprint are re-extracted
+FINGERPRINT_SCHEME = 2
+
+
+# Byte table for fold_text: letters lowercased, digits kept, the rest a space
+FOLD_TABLE = bytes(c + 32 if 65 <= c <= 90 else c if 48 <= c <= 57 or 97 <= c <= 122 else 32 for c in range(256))
+
+
+def fold_text(text: str) -> str:
+    """Lowercase, strip accents and reduce text to space separated words"""
+    # Accents are split off by NFKD and, like any other non-ASCII character,
+    # dropped by the encode; ASCII text (most of it) skips the normalization
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+    return ' '.join(text.encode('ascii', 'ignore').translate(FOLD_TABLE).decode('ascii').split())
+
+
+SPANISH_MONTHS = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6,
+    'julio': 7, 'agosto': 8, 'septiembre': 9, 'setiembre': 9, 'octubre': 10,
+    'noviembre': 11, 'diciembre': 12
+}
+
+# Date range formats, most specific first
+DATE_RANGE_PATTERNS = [
+    # del 30 de julio al 4 de agosto de 2026
+    ('months', re.compile(r'del\s+(\d{1,2})\s+de\s+(\w+)\s+al\s+(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})', re.IGNORECASE)),
+    # del 3 al 5 de mayo de 2026
+    ('days', re.compile(r'del\s+(\d{1,2})\s+al\s+(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})', re.IGNORECASE)),
+    # 27/07/2026 - 01/08/2026
+    ('numeric_range', re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})\s*-\s*(\d{1,2})[/-](\d{1,2})[/-](\d{4})')),
+    # 31 de enero de 2026
+    ('single', re.compile(r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})', re.IGNORECASE)),
+    # 31/01/2026 (two digit years are too ambiguous to trust)
+    ('numeric', re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b'))
+]
+
+
+def _month_number(name: str) -> Optional[int]:
+    return SPANISH_MONTHS.get(name.lower())
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_date_range(date_str: str) -> Optional[Tuple[date, date]]:
+    """Parse a date string into (start, end) dates; single days have start == end"""
+    for kind, pattern in DATE_RANGE_PATTERNS:
+        match = pattern.search(date_str)
+        if not match:
+            continue
+        groups = match.groups()
+        try:
+            if kind == 'months':
+                start_day, start_month, end_day, end_month, year = groups
+                start_month, end_month = _month_number(start_month), _month_number(end_month)
+                if start_month is None or end_month is None:
+                    continue
+                end = date(int(year), end_month, int(end_day))
+                start_year = int(year) - 1 if start_month > end_month else int(year)
+                start = date(start_year, start_month, int(start_day))
+            elif kind == 'days':
+                start_day, end_day, month, year = groups
+                month = _month_number(month)
+                if month is None:
+                    continue
+                start = date(int(year), month, int(start_day))
+                end = date(int(year), month, int(end_day))
+            elif kind == 'numeric_range':
+                start = date(int(groups[2]), int(groups[1]), int(groups[0]))
+                end = date(int(groups[5]), int(groups[4]), int(groups[3]))
+            elif kind == 'single':
+                day, month, year = groups
+                month = _month_number(month)
+                if month is None:
+                    continue
+                start = end = date(int(year), month, int(day))
+            else:
+                day, month, year = groups
+                start = end = date(int(year), int(month), int(day))
+        except ValueError:
+            # Impossible calendar date such as 31/02
+            continue
+        return (start, end) if start <= end else (end, start)
+    return None
+
+
+def club_slug(name: str) -> str:
+    """Turn a club name into a file name"""
+    return fold_text(name).replace(' ', '-')
+
+
+def dump_record_lines(records: List[Dict]) -> str:
+    """Serialize records as a JSON array with one compact record per line, so a changed event is a one-line diff"""
+    lines = [json.dumps(record, ensure_ascii=False, separators=(',', ':')) for record in records]
+    return '[\n' + ',\n'.join(lines) + '\n]\n' if lines else '[]\n'
+
+
+# Balearic Islands sailing clubs, kept next to this file
+DEFAULT_CLUBS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'clubs.json')
+TRANSLATE_ENDPOINT = 'https://translate.googleapis.com/translate_a/single'
+
+
+def load_clubs(path: str = DEFAULT_CLUBS_FILE) -> List[Dict]:
+    """Load the club list
+
+    Every club has a 'name', 'url' and 'location'. An optional 'content_xpath'
+    limits extraction to the matching elements, an optional 'extractor' names
+    a specialized extractor to use, 'url_templates' ({year} is filled with
+    this and next year) add calendar pages to crawl, 'max_pages'/'max_depth'
+    bound the crawl and 'fingerprint_ignore' regexes drop volatile lines.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        clubs = json.load(f)
+    for club_info in clubs:
+        missing = [key for key in ('name', 'url', 'location') if not club_info.get(key)]
+        if missing:
+            raise ValueError(f"Club {club_info.get('name', '?')} in {path} has no {', '.join(missing)}")
+    return clubs
+
+
+def select_clubs(clubs: List[Dict], names: Iterable[str]) -> List[Dict]:
+    """Pick clubs by name or file name slug, keeping their configured order"""
+    wanted = {club_slug(name) for name in names}
+    selected = [club_info for club_info in clubs if club_slug(club_info['name']) in wanted]
+    unknown = wanted - {club_slug(club_info['name']) for club_info in selected}
+    if unknown:
+        raise ValueError(f"Unknown clubs: {', '.join(sorted(unknown))} "
+                         f"(known: {', '.join(club_slug(club_info['name']) for club_info in clubs)})")
+    return selected
+
+
+class BoatType(str, Enum):
+    """Boat category of an event"""
+    YACHTS = 'yachts'
+    DINGHIES = 'dinghies'
+    MIXED = 'mixed'
+
+
+class Delivery(str, Enum):
+    """Outcome of sending a notification"""
+    SENT = 'sent'
+    RETRY = 'retry'        # network errors, 429 and 5xx: worth trying again later
+    REJECTED = 'rejected'  # refused for good (e.g. chat not found, message too long)
+
+
+class EventType(str, Enum):
+    """Duration category of an event"""
+    SINGLE_DAY = 'single_day'
+    MULTI_DAY = 'multi_day'
+    SERIES = 'series'
+
+
+EVENT_COLORS = {
+    EventType.SINGLE_DAY: '#4285f4',    # Blue
+    EventType.MULTI_DAY: '#34a853',     # Green
+    EventType.SERIES: '#ff9800'         # Orange
+}
+
+BOAT_SYMBOLS = {
+    BoatType.YACHTS: '▲',
+    BoatType.DINGHIES: '●',
+    BoatType.MIXED: '■'
+}
+
+
+@dataclass(slots=True)
+class Regatta:
+    """One scraped event; its color and boat symbol are derived from its types"""
+    title: str
+    date: str
+    start_date: Optional[str]
+    end_date: Optional[str]
+    details: str
+    club: str
+    location: str
+    url: str
+    boat_type: BoatType
+    event_type: EventType
+    translations: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def color(self) -> str:
+        return EVENT_COLORS[self.event_type]
+
+    @property
+    def boat_symbol(self) -> str:
+        return BOAT_SYMBOLS[self.boat_type]
+
+    def to_dict(self, compact: bool = False) -> Dict:
+        """JSON record of the event; compact leaves out the derived fields"""
+        record = {
+            'title': self.title,
+            'date': self.date,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'details': self.details,
+            'club': self.club,
+            'location': self.location,
+            'url': self.url,
+            'boat_type': self.boat_type.value,
+            'event_type': self.event_type.value
+        }
+        if not compact:
+            record['color'] = self.color
+            record['boat_symbol'] = self.boat_symbol
+        for lang, title in self.translations.items():
+            record[f'title_{lang}'] = title
+        return record
+
+    @classmethod
+    def from_dict(cls, record: Dict) -> 'Regatta':
+        """Rebuild an event from a full or compact JSON record"""
+        return cls(
+            title=record['title'],
+            date=record['date'],
+            start_date=record.get('start_date'),
+            end_date=record.get('end_date'),
+            details=record.get('details', ''),
+            club=record.get('club', ''),
+            location=record.get('location', ''),
+            url=record.get('url', ''),
+            boat_type=BoatType(record.get('boat_type', BoatType.MIXED)),
+            event_type=EventType(record.get('event_type', EventType.SINGLE_DAY)),
+            translations={key[len('title_'):]: value for key, value in record.items() if key.startswith('title_')}
+        )
+
+
+class CategoryClassifier:
+    """Weighted keywords scored as whole-word tokens in one pass
+
+    Text and keywords are folded (no case, accents or punctuation) into
+    words, and keywords are looked up as whole words or word runs, so
+    'orc' does not fire inside 'Mallorca' nor 'irc' inside 'circuito'.
+    Every keyword found adds its weight to its category's score. The best
+    scoring category wins when its score reaches min_score and its share of
+    all scores (the confidence) reaches min_share; ties go to the category
+    listed first. Results are memoized on the folded text, as the same
+    titles come back run after run.
+    """
+
+    def __init__(self, categories: Dict[str, Dict[str, float]], min_score: float = 1.0,
+                 min_share: float = 0.6, cache_size: int = 4096):
+        self.categories = list(categories)
+        self.min_score = min_score
+        self.min_share = min_share
+        self.weights: Dict[str, Tuple[str, float]] = {}
+        for category, keywords in categories.items():
+            for keyword, weight in keywords.items():
+                self.weights[fold_text(keyword)] = (category, weight)
+        # Folded text is single spaced, so a space padded multi-word keyword
+        # only matches whole words
+        self.phrases = [(f" {keyword} ", keyword) for keyword in self.weights if ' ' in keyword]
+        self.classify_folded = functools.lru_cache(maxsize=cache_size)(self.score_folded)
+
+    def classify(self, text: str) -> Tuple[Optional[str], float]:
+        """Get the category of a text and its confidence, or (None, 0.0) when undecided"""
+        return self.classify_folded(fold_text(text))
+
+    def score_folded(self, text: str) -> Tuple[Optional[str], float]:
+        """Classify already folded text"""
+        return self.score(Counter(text.split()), text)
+
+    def score(self, word_counts: Counter, text: str) -> Tuple[Optional[str], float]:
+        """Classify folded text given the counts of its words"""
+        # Only the keywords among the words are looked at
+        counts = {word: word_counts[word] for word in self.weights.keys() & word_counts.keys()}
+        padded = f" {text} "
+        for pattern, phrase in self.phrases:
+            occurrences = padded.count(pattern)
+            if occurrences:
+                counts[phrase] = occurrences
+        
+        scores = dict.fromkeys(self.categories, 0.0)
+        for keyword, occurrences in counts.items():
+            category, weight = self.weights[keyword]
+            scores[category] += weight * occurrences
+        best = max(self.categories, key=scores.__getitem__)
+        total = sum(scores.values())
+        if scores[best] < self.min_score or scores[best] / total < self.min_share:
+            return None, 0.0
+        return best, round(scores[best] / total, 3)
+
+
+class HostRateLimiter:
+    """Per-host politeness: minimum spacing between requests plus back-off"""
+
+    def __init__(self, min_interval: float = 1.0, max_backoff: float = 60.0):
+        self.min_interval = min_interval
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+        self._backoff: Dict[str, float] = {}
+
+    @staticmethod
+    def host_for(url: str) -> str:
+        """Get the rate limiting key for a URL"""
+        return urlparse(url).netloc.lower()
+
+    def wait(self, url: str):
+        """Block until a request to the URL's host is allowed"""
+        host = self.host_for(url)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval + self._backoff.get(host, 0.0)
+        if slot > now:
+            time.sleep(slot - now)
+
+    def record_success(self, url: str):
+        """Clear any back-off for the URL's host"""
+        with self._lock:
+            self._backoff.pop(self.host_for(url), None)
+
+    def record_failure(self, url: str, retry_after: Optional[float] = None):
+        """Back off exponentially (or as the server asked) for the URL's host"""
+        host = self.host_for(url)
+        with self._lock:
+            if retry_after is not None:
+                penalty = retry_after
+            else:
+                penalty = max(self.min_interval, 2 * self._backoff.get(host, 0.0))
+            penalty = min(penalty, self.max_backoff)
+            self._backoff[host] = penalty
+            self._next_slot[host] = max(self._next_slot.get(host, 0.0), time.monotonic() + penalty)
+
+
+class DeadlineExceeded(requests.Timeout):
+    """The run deadline passed while a page was still being fetched"""
+
+
+class PageNotCached(LookupError):
+    """An offline run needed a page the HTTP cache holds no copy of"""
+
+
+class CircuitBreaker:
+    """Per-club circuit breaker persisted across runs"""
+
+    def __init__(self, state_file: str = 'circuit_state.json', failure_threshold: int = 3,
+                 probe_interval: float = 3 * 24 * 3600):
+        self.state_file = state_file
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self._lock = threading.Lock()
+        self.state: Dict[str, Dict] = self.load_state()
+
+    def load_state(self) -> Dict[str, Dict]:
+        """Load breaker state from the previous runs"""
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading circuit breaker state: {e}")
+        return {}
+
+    def allow(self, club_name: str) -> bool:
+        """Whether a club should be fetched this run (closed circuit or probe due)"""
+        with self._lock:
+            entry = self.state.get(club_name)
+            if not entry or entry['failures'] < self.failure_threshold:
+                return True
+            # Open circuit: only probe once the interval since the last attempt elapsed
+            return time.time() - entry.get('last_attempt', 0) >= self.probe_interval
+
+    def is_open(self, club_name: str) -> bool:
+        """Whether a club has failed enough consecutive runs to be skipped"""
+        with self._lock:
+            entry = self.state.get(club_name)
+            return bool(entry) and entry['failures'] >= self.failure_threshold
+
+    def record(self, club_name: str, success: bool):
+        """Record the outcome of this run's attempt at a club"""
+        with self._lock:
+            if success:
+                self.state.pop(club_name, None)
+                return
+            entry = self.state.setdefault(club_name, {'failures': 0})
+            entry['failures'] += 1
+            entry['last_attempt'] = time.time()
+
+    def save(self):
+        """Persist breaker state for the next run"""
+        try:
+            with self._lock:
+                with open(self.state_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.state, f, indent=2, ensure_ascii=False, sort_keys=True)
+        except Exception as e:
+            logger.error(f"Error saving circuit breaker state: {e}")
+
+
+class HttpCache:
+    """On-disk conditional HTTP cache (ETag / Last-Modified) keyed by URL"""
+
+    def __init__(self, directory: str = '.http_cache', max_age: float = 7 * 24 * 3600,
+                 max_bytes: int = 50 * 1024 * 1024):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(directory, 'index.json')
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict] = self.load_index()
+
+    def load_index(self) -> Dict[str, Dict]:
+        """Load the cache index"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading HTTP cache index: {e}")
+        return {}
+
+    def body_path(self, url: str) -> str:
+        """Get the file holding a cached response body"""
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.html')
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Get the cache entry for a URL if it is still within max_age"""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry and time.time() - entry.get('validated_at', 0) <= self.max_age:
+                return entry
+        return None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a URL"""
+        entry = self.get(url)
+        if not entry or not os.path.exists(self.body_path(url)):
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def content_hash(self, url: str) -> Optional[str]:
+        """Get the SHA-256 of a URL's cached body"""
+        with self._lock:
+            return (self.entries.get(url) or {}).get('hash')
+
+    def load_body(self, url: str) -> Optional[bytes]:
+        """Read a cached response body"""
+        try:
+            with open(self.body_path(url), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url: str, response, write_body: bool = True) -> bool:
+        """Store a 200 response, returning True when its content is unchanged since last time"""
+        body_file = self.open_body(url, response) if write_body else None
+        if body_file:
+            try:
+                body_file.write(response.content)
+            except OSError as e:
+                logger.warning(f"Could not cache {url}: {e}")
+                self.discard_body(body_file)
+                body_file = None
+        return self.commit(url, response, hashlib.sha256(response.content).hexdigest(), body_file)
+
+    def open_body(self, url: str, response):
+        """Open a temporary file for a 200 response's body, or None if it cannot be written"""
+        # Bodies answer a later 304 and are what offline runs replay
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            return open(self.body_path(url) + '.part', 'wb')
+        except OSError as e:
+            logger.warning(f"Could not cache {url}: {e}")
+            return None
+
+    def discard_body(self, body_file):
+        """Drop a body file that was not completely written"""
+        body_file.close()
+        try:
+            os.remove(body_file.name)
+        except OSError:
+            pass
+
+    def commit(self, url: str, response, content_hash: str, body_file=None) -> bool:
+        """Record a fetched page (and its written body), returning True when its content is unchanged"""
+        size = 0
+        if body_file:
+            try:
+                size = body_file.tell()
+                body_file.close()
+                os.replace(body_file.name, self.body_path(url))
+            except OSError as e:
+                logger.warning(f"Could not cache {url}: {e}")
+                size = 0
+        
+        with self._lock:
+            previous = self.entries.get(url) or {}
+            unchanged = previous.get('hash') == content_hash
+            entry = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'hash': content_hash,
+                'size': size,
+                'validated_at': time.time()
+            }
+            if unchanged:
+                # Same bytes as last run, so last run's results still apply
+                for key in ('regattas', 'links', 'fingerprint', 'scheme'):
+                    if key in previous:
+                        entry[key] = previous[key]
+            self.entries[url] = entry
+        return unchanged
+
+    def mark_validated(self, url: str):
+        """Refresh an entry after a 304 Not Modified"""
+        with self._lock:
+            if url in self.entries:
+                self.entries[url]['validated_at'] = time.time()
+
+    def cached_results(self, url: str) -> Optional[Dict]:
+        """Get the regattas, pagination links and content fingerprint from the page last time
+
+        Results extracted under another FINGERPRINT_SCHEME come without a
+        fingerprint, so the page is extracted again even if it is unchanged.
+        """
+        entry = self.get(url)
+        if entry and 'regattas' in entry:
+            current = entry.get('scheme') == FINGERPRINT_SCHEME
+            return {'regattas': entry['regattas'], 'links': entry.get('links', []),
+                    'fingerprint': entry.get('fingerprint') if current else None}
+        return None
+
+    def store_results(self, url: str, regattas: List[Dict], links: List[str], fingerprint: Optional[str] = None):
+        """Remember the regattas and pagination links extracted from a page"""
+        with self._lock:
+            if url in self.entries:
+                self.entries[url]['regattas'] = regattas
+                self.entries[url]['links'] = links
+                self.entries[url]['fingerprint'] = fingerprint
+                self.entries[url]['scheme'] = FINGERPRINT_SCHEME
+
+    def evict(self):
+        """Drop expired entries, then the least recently validated ones over max_bytes"""
+        now = time.time()
+        with self._lock:
+            expired = [url for url, entry in self.entries.items()
+                       if now - entry.get('validated_at', 0) > self.max_age]
+            by_age = sorted((url for url in self.entries if url not in expired),
+                            key=lambda url: self.entries[url].get('validated_at', 0))
+            total = sum(self.entries[url].get('size', 0) for url in by_age)
+            while by_age and total > self.max_bytes:
+                url = by_age.pop(0)
+                total -= self.entries[url].get('size', 0)
+                expired.append(url)
+            for url in expired:
+                del self.entries[url]
+                try:
+                    os.remove(self.body_path(url))
+                except OSError:
+                    pass
+
+    def save(self):
+        """Evict and write the cache index"""
+        self.evict()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with self._lock:
+                with open(self.index_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"Error saving HTTP cache index: {e}")
+
+
+class ShardStore:
+    """Per-club result shards plus a manifest of their content hashes
+
+    Both are committed, so they hold only what the calendar needs; the page
+    fingerprints a shard was extracted from are kept in the event history.
+    """
+
+    def __init__(self, directory: str = 'data', record_lines: bool = False):
+        self.directory = directory
+        self.record_lines = record_lines
+        self.manifest_file = os.path.join(directory, 'manifest.json')
+        self.manifest_changed = False
+        self.manifest = self.load_manifest()
+
+    def load_manifest(self) -> Dict:
+        """Load the shard manifest"""
+        try:
+            if os.path.exists(self.manifest_file):
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                # Older manifests also carried page fingerprints
+                for entry in manifest['shards'].values():
+                    if entry.pop('fingerprint', None) is not None:
+                        self.manifest_changed = True
+                return manifest
+        except Exception as e:
+            logger.error(f"Error loading shard manifest: {e}")
+        return {'shards': {}}
+
+    def shard_path(self, club_name: str) -> str:
+        """Get the shard file for a club, relative to the store directory"""
+        return f"clubs/{club_slug(club_name)}.json"
+
+    def load(self, club_name: str) -> Optional[List[Dict]]:
+        """Read a club's last written shard, if any"""
+        entry = self.manifest['shards'].get(club_name)
+        if not entry:
+            return None
+        try:
+            with open(os.path.join(self.directory, entry['file']), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading shard for {club_name}: {e}")
+            return None
+
+    def serialize(self, regattas: List[Dict]) -> str:
+        """Serialize a shard exactly as it is written to disk"""
+        if self.record_lines:
+            return dump_record_lines(regattas)
+        return json.dumps(regattas, indent=2, ensure_ascii=False)
+
+    def shard_hash(self, club_name: str) -> Optional[str]:
+        """Get the content hash of a club's shard"""
+        entry = self.manifest['shards'].get(club_name)
+        return entry['hash'] if entry else None
+
+    def update(self, club_name: str, regattas: List[Dict], months: List[str]) -> bool:
+        """Write a club's shard if its content changed, returning whether it did"""
+        content = self.serialize(regattas)
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        path = self.shard_path(club_name)
+        entry = self.manifest['shards'].get(club_name)
+        if entry and entry['hash'] == content_hash and os.path.exists(os.path.join(self.directory, path)):
+            return False
+        
+        full_path = os.path.join(self.directory, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        self.manifest['shards'][club_name] = {
+            'file': path,
+            'hash': content_hash,
+            'count': len(regattas),
+            'months': months
+        }
+        self.manifest_changed = True
+        return True
+
+    def save_manifest(self):
+        """Write the manifest if any shard changed"""
+        if not self.manifest_changed:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.manifest_file, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+            self.manifest_changed = False
+        except Exception as e:
+            logger.error(f"Error saving shard manifest: {e}")
+
+
+class CalendarIndex:
+    """Per-month calendar files with events bucketed by start day, plus an index of the months
+
+    Each YYYY-MM.json holds that month's events as compact records and a map
+    from day of the month to their positions, so the calendar page loads one
+    month and fills each day cell with a single lookup. With record_lines
+    each event is written on a line of its own.
+    """
+
+    def __init__(self, directory: str = os.path.join('data', 'calendar'), record_lines: bool = False):
+        self.directory = directory
+        self.record_lines = record_lines
+        self.index_file = os.path.join(directory, 'index.json')
+        self.index = self.load_index()
+
+    def load_index(self) -> Dict:
+        """Load the month index"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading calendar index: {e}")
+        return {'months': {}}
+
+    def event_day(self, regatta: 'Regatta') -> Optional[date]:
+        """The day an event is shown on: its start date"""
+        if regatta.start_date:
+            return date.fromisoformat(regatta.start_date)
+        date_range = parse_date_range(regatta.date)
+        return date_range[0] if date_range else None
+
+    def build(self, regattas: List['Regatta']) -> Dict[str, Dict]:
+        """Bucket events by month and day, keeping their order within each day"""
+        months: Dict[str, Dict] = {}
+        for regatta in regattas:
+            day = self.event_day(regatta)
+            if day is None:
+                continue
+            month = months.setdefault(f"{day.year}-{day.month:02d}", {'events': [], 'days': {}})
+            month['days'].setdefault(str(day.day), []).append(len(month['events']))
+            month['events'].append(regatta.to_dict(compact=True))
+        return months
+
+    def serialize(self, month: Dict) -> str:
+        """Serialize a month exactly as it is written to disk"""
+        if self.record_lines:
+            days = json.dumps(month['days'], separators=(',', ':'))
+            return f'{{"days":{days},"events":{dump_record_lines(month["events"]).rstrip()}}}\n'
+        return json.dumps(month, ensure_ascii=False, separators=(',', ':'))
+
+    def update(self, regattas: List['Regatta']) -> List[str]:
+        """Write the month files whose events changed and the index, returning the changed months"""
+        months = self.build(regattas)
+        entries = {}
+        changed = []
+        os.makedirs(self.directory, exist_ok=True)
+        for key, month in sorted(months.items()):
+            content = self.serialize(month)
+            content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            filename = f"{key}.json"
+            entries[key] = {'file': filename, 'count': len(month['events']), 'hash': content_hash}
+            entry = self.index['months'].get(key)
+            if entry and entry['hash'] == content_hash and os.path.exists(os.path.join(self.directory, filename)):
+                continue
+            with open(os.path.join(self.directory, filename), 'w', encoding='utf-8') as f:
+                f.write(content)
+            changed.append(key)
+        
+        for key, entry in self.index['months'].items():
+            if key not in months:
+                try:
+                    os.remove(os.path.join(self.directory, entry['file']))
+                except OSError:
+                    pass
+                changed.append(key)
+        
+        self.index = {'months': entries}
+        if changed or not os.path.exists(self.index_file):
+            with open(self.index_file, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, indent=2, ensure_ascii=False, sort_keys=True)
+        return changed
+
+
+class PageArchive:
+    """Every fetched page, gzipped and content-addressed, plus a manifest per run
+
+    Bodies live under objects/ named by the SHA-256 of their bytes, so a page
+    unchanged since any earlier run costs no extra disk. runs/<run id>.json
+    lists the (club, URL, hash) of every page a run fetched, in crawl order
+    per club, and the day it ran, which is all a replay needs.
+    """
+
+    def __init__(self, directory: str = 'archive'):
+        self.directory = directory
+        self.runs_dir = os.path.join(directory, 'runs')
+        self._lock = threading.Lock()
+        self.run: Optional[Dict] = None
+
+    def object_path(self, content_hash: str) -> str:
+        """Get the file holding a page body"""
+        return os.path.join(self.directory, 'objects', content_hash[:2], content_hash[2:] + '.html.gz')
+
+    def has(self, content_hash: str) -> bool:
+        return os.path.exists(self.object_path(content_hash))
+
+    def load(self, content_hash: str) -> bytes:
+        """Read a page body"""
+        with gzip.open(self.object_path(content_hash), 'rb') as f:
+            return f.read()
+
+    def begin_run(self):
+        """Start the manifest of a new run"""
+        now = datetime.now()
+        with self._lock:
+            self.run = {'run': now.strftime('%Y%m%dT%H%M%S%f'), 'started': now.isoformat(timespec='seconds'),
+                        'pages': []}
+
+    def store(self, club_name: str, url: str, content: bytes) -> str:
+        """Archive a page body unless an identical one already is, and list it in the run"""
+        content_hash = hashlib.sha256(content).hexdigest()
+        if self.has(content_hash):
+            self.record(club_name, url, content_hash)
+            return content_hash
+        object_file = self.open_object()
+        try:
+            object_file.write(content)
+        except BaseException:
+            self.discard_object(object_file)
+            raise
+        self.commit_object(club_name, url, object_file, content_hash)
+        return content_hash
+
+    def store_file(self, club_name: str, url: str, path: str, content_hash: str):
+        """Archive a page body from a file, block by block, unless an identical one already is
+
+        The file must hold the bytes content_hash was taken of (e.g. the
+        HTTP cache's copy); a file that no longer does is not archived.
+        """
+        if self.has(content_hash):
+            self.record(club_name, url, content_hash)
+            return
+        digest = hashlib.sha256()
+        object_file = self.open_object()
+        try:
+            with open(path, 'rb') as f:
+                for block in iter(functools.partial(f.read, 64 * 1024), b''):
+                    digest.update(block)
+                    object_file.write(block)
+        except BaseException:
+            self.discard_object(object_file)
+            raise
+        if digest.hexdigest() != content_hash:
+            self.discard_object(object_file)
+            raise OSError(f"{path} no longer holds the fetched body")
+        self.commit_object(club_name, url, object_file, content_hash)
+
+    def open_object(self):
+        """Open a gzip file to write a page body to before its hash is known; see commit_object"""
+        objects_dir = os.path.join(self.directory, 'objects')
+        os.makedirs(objects_dir, exist_ok=True)
+        # A unique name, as two clubs may fetch the same page
+        fd, temp_path = tempfile.mkstemp(suffix='.part', dir=objects_dir)
+        os.close(fd)
+        return gzip.open(temp_path, 'wb', compresslevel=6)
+
+    def commit_object(self, club_name: str, url: str, object_file, content_hash: str):
+        """File a body written through open_object under its hash and list it in the run"""
+        object_file.close()
+        path = self.object_path(content_hash)
+        if os.path.exists(path):
+            os.remove(object_file.name)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(object_file.name, path)
+        self.record(club_name, url, content_hash)
+
+    def discard_object(self, object_file):
+        """Drop a body that was not completely written"""
+        try:
+            object_file.close()
+        except OSError:
+            pass
+        try:
+            os.remove(object_file.name)
+        except OSError:
+            pass
+
+    def record(self, club_name: str, url: str, content_hash: str):
+        """List an already archived page in the run"""
+        with self._lock:
+            if self.run is not None:
+                self.run['pages'].append({'club': club_name, 'url': url, 'hash': content_hash})
+
+    def save_run(self):
+        """Write the run's manifest, if it fetched anything"""
+        with self._lock:
+            run, self.run = self.run, None
+        if not run or not run['pages']:
+            return
+        try:
+            os.makedirs(self.runs_dir, exist_ok=True)
+            with open(os.path.join(self.runs_dir, f"{run['run']}.json"), 'w', encoding='utf-8') as f:
+                json.dump(run, f, indent=2, ensure_ascii=False)
+            logger.info(f"🗄️ Archived run {run['run']}: {len(run['pages'])} pages")
+        except Exception as e:
+            logger.error(f"Error saving archive manifest: {e}")
+
+    def run_ids(self) -> List[str]:
+        """Get the archived runs, oldest first"""
+        try:
+            return sorted(name[:-len('.json')] for name in os.listdir(self.runs_dir) if name.endswith('.json'))
+        except OSError:
+            return []
+
+    def load_run(self, run_id: str) -> Dict:
+        """Read a run's manifest"""
+        with open(os.path.join(self.runs_dir, f"{run_id}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+class EventHistory:
+    """Persistent event history in SQLite, indexed by event signature"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS events (
+            signature TEXT PRIMARY KEY,
+            club TEXT,
+            title TEXT,
+            date TEXT,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_events_first_seen ON events (first_seen);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            delivered TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox (delivered, id);
+        CREATE TABLE IF NOT EXISTS dead_letters (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created TEXT NOT NULL,
+            attempts INTEGER NOT NULL,
+            failed TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS club_fingerprints (
+            club TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            shard_hash TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: str = 'event_history.db', legacy_file: str = 'previous_events.json',
+                 read_only: bool = False):
+        """read_only (dry runs, diff) opens the database on first use and never writes to it"""
+        self.path = path
+        self.read_only = read_only
+        self._connection: Optional[sqlite3.Connection] = None
+        if read_only:
+            return
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(self.SCHEMA)
+        if self.get_meta('signature_scheme') is None:
+            # Databases created before the scheme was recorded hold raw signatures
+            has_events = self.connection.execute('SELECT 1 FROM events LIMIT 1').fetchone()
+            self.set_meta('signature_scheme', '1' if has_events else str(SIGNATURE_SCHEME))
+        self.import_legacy(legacy_file)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = self.open_read_only()
+        return self._connection
+
+    def open_read_only(self) -> sqlite3.Connection:
+        """Open the database without creating or changing it; a missing database or table reads as empty"""
+        if not os.path.exists(self.path):
+            connection = sqlite3.connect(':memory:')
+            connection.executescript(self.SCHEMA)
+            return connection
+        connection = sqlite3.connect(f"file:{quote(os.path.abspath(self.path))}?mode=ro", uri=True)
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for statement in self.SCHEMA.split(';'):
+            match = re.match(r'\s*CREATE TABLE IF NOT EXISTS (\w+)', statement)
+            if match and match.group(1) not in tables:
+                # A database from before the table was added: an empty one outside the file stands in
+                connection.execute(statement.replace('CREATE TABLE', 'CREATE TEMP TABLE', 1))
+        return connection
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def club_fingerprint(self, club: str, shard_hash: Optional[str]) -> Optional[str]:
+        """Get the page fingerprint a club's shard was extracted from, if the shard is still that one"""
+        row = self.connection.execute('SELECT fingerprint FROM club_fingerprints WHERE club = ? AND shard_hash = ?',
+                                      (club, shard_hash)).fetchone()
+        return row[0] if row else None
+
+    def set_club_fingerprint(self, club: str, fingerprint: Optional[str], shard_hash: Optional[str]):
+        """Remember (or with no fingerprint, forget) what a club's shard was extracted from"""
+        with self.connection:
+            if fingerprint and shard_hash:
+                self.connection.execute('INSERT OR REPLACE INTO club_fingerprints (club, fingerprint, shard_hash) '
+                                        'VALUES (?, ?, ?)', (club, fingerprint, shard_hash))
+            else:
+                self.connection.execute('DELETE FROM club_fingerprints WHERE club = ?', (club,))
+
+    def import_legacy(self, filename: str):
+        """Seed an empty history from the old previous_events.json signature list"""
+        if not os.path.exists(filename):
+            return
+        if self.connection.execute('SELECT 1 FROM events LIMIT 1').fetchone():
+            return
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            seen = data.get('last_updated') or datetime.now().isoformat(timespec='seconds')
+            with self.connection:
+                self.connection.executemany(
+                    'INSERT OR IGNORE INTO events (signature, first_seen, last_seen) VALUES (?, ?, ?)',
+                    ((signature, seen, seen) for signature in data.get('event_signatures', []))
+                )
+                self.connection.execute("UPDATE meta SET value = '1' WHERE key = 'signature_scheme'")
+            logger.info(f"Imported {len(data.get('event_signatures', []))} event signatures from {filename}")
+        except Exception as e:
+            logger.error(f"Error importing previous events: {e}")
+
+    def rekey(self, signature: Callable[[str, str, str], str]) -> int:
+        """Re-sign the stored events after a signature scheme change, returning how many had to be dropped
+
+        Rows that kept their club, title and date get the new signature,
+        keeping the earliest first_seen when several collapse into one; the
+        oldest rows only hold a raw signature and cannot be converted.
+        Runs inside the caller's transaction.
+        """
+        rows = self.connection.execute(
+            'SELECT club, title, date, first_seen, last_seen FROM events '
+            'WHERE club IS NOT NULL AND title IS NOT NULL AND date IS NOT NULL'
+        ).fetchall()
+        dropped = self.connection.execute('SELECT COUNT(*) FROM events').fetchone()[0] - len(rows)
+        self.connection.execute('DELETE FROM events')
+        self.connection.executemany(
+            '''INSERT INTO events (signature, club, title, date, first_seen, last_seen)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT (signature) DO UPDATE SET
+                   first_seen = MIN(events.first_seen, excluded.first_seen),
+                   last_seen = MAX(events.last_seen, excluded.last_seen)''',
+            ((signature(club, title, date_str), club, title, date_str, first_seen, last_seen)
+             for club, title, date_str, first_seen, last_seen in rows)
+        )
+        self.connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                                ('signature_scheme', str(SIGNATURE_SCHEME)))
+        return dropped
+
+    def record_run(self, events: Dict[str, 'Regatta'], candidates: Optional[Set[str]] = None,
+                   notify: bool = False, signature: Optional[Callable[[str, str, str], str]] = None) -> Set[str]:
+        """Upsert this run's events (keyed by signature) and return the signatures never seen before
+
+        When candidates is given, only those signatures (the events added
+        since last run) are looked up; the rest are known to be in the history.
+        With notify, the new events are queued for notification in the same
+        transaction, so they are either both recorded and queued or neither.
+        signature maps a stored (club, title, date) to its current signature,
+        to re-key the history when the scheme has changed.
+        """
+        now = datetime.now().isoformat(timespec='seconds')
+        baseline = False
+        with self.connection:
+            if self.get_meta('signature_scheme') != str(SIGNATURE_SCHEME):
+                if signature is None:
+                    raise ValueError("the event history needs re-keying but no signature function was given")
+                dropped = self.rekey(signature)
+                logger.info(f"Event signature scheme changed - re-keyed event history"
+                            f"{f', dropped {dropped} legacy events' if dropped else ''}")
+                # Dropped events would all look new; this run becomes their
+                # baseline instead of re-announcing them
+                baseline = dropped > 0
+            if candidates is not None and not self.connection.execute('SELECT 1 FROM events LIMIT 1').fetchone():
+                # A new history has nothing to compare against yet
+                candidates = None
+            self.connection.execute('CREATE TEMP TABLE IF NOT EXISTS current_run (signature TEXT PRIMARY KEY)')
+            self.connection.execute('DELETE FROM current_run')
+            self.connection.executemany('INSERT OR IGNORE INTO current_run (signature) VALUES (?)',
+                                        ((signature,) for signature in events
+                                         if candidates is None or signature in candidates))
+            new_signatures = {row[0] for row in self.connection.execute(
+                'SELECT signature FROM current_run EXCEPT SELECT signature FROM events'
+            )}
+            self.connection.executemany(
+                '''INSERT INTO events (signature, club, title, date, first_seen, last_seen)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (signature) DO UPDATE SET
+                       last_seen = excluded.last_seen,
+                       club = COALESCE(events.club, excluded.club),
+                       title = COALESCE(events.title, excluded.title),
+                       date = COALESCE(events.date, excluded.date)''',
+                ((signature, event.club, event.title, event.date, now, now)
+                 for signature, event in events.items())
+            )
+            if notify and not baseline:
+                self.connection.executemany(
+                    "INSERT INTO outbox (kind, payload, created) VALUES ('event', ?, ?)",
+                    ((json.dumps(event.to_dict(compact=True), ensure_ascii=False), now)
+                     for signature, event in events.items() if signature in new_signatures)
+                )
+        return set() if baseline else new_signatures
+
+    def enqueue_message(self, text: str):
+        """Queue a ready-made notification message"""
+        with self.connection:
+            self.connection.execute("INSERT INTO outbox (kind, payload, created) VALUES ('message', ?, ?)",
+                                    (text, datetime.now().isoformat(timespec='seconds')))
+
+    def pending_notifications(self) -> List[Tuple[int, str, str]]:
+        """Get undelivered (id, kind, payload) notifications, oldest first"""
+        return self.connection.execute(
+            'SELECT id, kind, payload FROM outbox WHERE delivered IS NULL ORDER BY id'
+        ).fetchall()
+
+    def mark_delivered(self, ids: List[int], keep_days: int = 30):
+        """Mark notifications delivered, dropping ones delivered more than keep_days ago"""
+        now = datetime.now()
+        with self.connection:
+            self.connection.executemany('UPDATE outbox SET delivered = ? WHERE id = ?',
+                                        ((now.isoformat(timespec='seconds'), id_) for id_ in ids))
+            self.connection.execute('DELETE FROM outbox WHERE delivered < ?',
+                                    ((now - timedelta(days=keep_days)).isoformat(timespec='seconds'),))
+
+    def record_attempt(self, ids: List[int]):
+        """Count a failed delivery attempt for notifications"""
+        with self.connection:
+            self.connection.executemany('UPDATE outbox SET attempts = attempts + 1 WHERE id = ?',
+                                        ((id_,) for id_ in ids))
+
+    def dead_letter(self, ids: List[int]):
+        """Move notifications that will never be delivered out of the queue, keeping them for inspection"""
+        now = datetime.now().isoformat(timespec='seconds')
+        with self.connection:
+            self.connection.executemany(
+                '''INSERT OR REPLACE INTO dead_letters (id, kind, payload, created, attempts, failed)
+                   SELECT id, kind, payload, created, attempts, ? FROM outbox WHERE id = ?''',
+                ((now, id_) for id_ in ids)
+            )
+            self.connection.executemany('DELETE FROM outbox WHERE id = ?', ((id_,) for id_ in ids))
+
+    def dead_letter_exhausted(self, max_attempts: int) -> int:
+        """Dead-letter undelivered notifications that failed max_attempts times, returning how many"""
+        ids = [row[0] for row in self.connection.execute(
+            'SELECT id FROM outbox WHERE delivered IS NULL AND attempts >= ?', (max_attempts,)
+        )]
+        if ids:
+            self.dead_letter(ids)
+        return len(ids)
+
+    def dead_letters(self) -> List[Tuple[int, str, str]]:
+        """Get the (id, kind, payload) notifications given up on, oldest first"""
+        return self.connection.execute('SELECT id, kind, payload FROM dead_letters ORDER BY id').fetchall()
+
+    def first_seen_since(self, days: int) -> List[Dict]:
+        """Get events first seen in the last N days, newest first"""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat(timespec='seconds')
+        cursor = self.connection.execute(
+            '''SELECT signature, club, title, date, first_seen, last_seen FROM events
+               WHERE first_seen >= ? ORDER BY first_seen DESC''',
+            (cutoff,)
+        )
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class TranslationService:
+    """Glossary plus batched, cached and time-boxed machine translation"""
+
+    # Manual translations for sailing terms, applied before machine translation
+    SAILING_TERMS = {
+        'regata': 'regatta', 'regatas': 'regattas', 'vela': 'sailing',
+        'competición': 'competition', 'campeonato': 'championship',
+        'trofeo': 'trophy', 'copa': 'cup', 'crucero': 'cruising',
+        'optimist': 'optimist', 'optimista': 'optimist', 'dragón': 'dragon'
+    }
+
+    def __init__(self, session: requests.Session, target_lang: str = 'en',
+                 cache_file: str = 'translation_cache.json',
+                 endpoint: str = TRANSLATE_ENDPOINT,
+                 max_entries: int = 5000, batch_chars: int = 1500,
+                 time_budget: float = 20.0, max_workers: int = 2):
+        self.session = session
+        self.target_lang = target_lang
+        self.cache_file = cache_file
+        self.endpoint = endpoint
+        self.max_entries = max_entries
+        self.batch_chars = batch_chars
+        self.time_budget = time_budget
+        self.glossary_regex = re.compile(
+            r'\b(' + '|'.join(re.escape(term) for term in sorted(self.SAILING_TERMS, key=len, reverse=True)) + r')\b',
+            re.IGNORECASE
+        )
+        self._lock = threading.Lock()
+        self.cache: Dict[str, Dict] = self.load_cache()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.futures = []
+        self.pending: Set[str] = set()
+        self.deadline: Optional[float] = None
+
+    def load_cache(self) -> Dict[str, Dict]:
+        """Load cached translations"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading translation cache: {e}")
+        return {}
+
+    def cache_key(self, text: str) -> str:
+        return f"{self.target_lang}\x1f{text}"
+
+    def apply_glossary(self, text: str) -> str:
+        """Replace sailing terms in a single pass"""
+        return self.glossary_regex.sub(lambda match: self.SAILING_TERMS[match.group(1).lower()], text)
+
+    def lookup(self, text: str) -> Optional[str]:
+        """Get a cached translation, marking it as recently used"""
+        with self._lock:
+            entry = self.cache.get(self.cache_key(text))
+            if entry:
+                entry['used'] = time.time()
+                return entry['text']
+        return None
+
+    def submit(self, texts: List[str]):
+        """Queue uncached texts for background translation in as few requests as possible"""
+        if self.deadline is None:
+            # The time budget starts with the first submission
+            self.deadline = time.monotonic() + self.time_budget
+        with self._lock:
+            uncached = [text for text in dict.fromkeys(texts)
+                        if text and self.cache_key(text) not in self.cache and text not in self.pending]
+            self.pending.update(uncached)
+        
+        batch, batch_length = [], 0
+        for text in uncached:
+            if batch and batch_length + len(text) > self.batch_chars:
+                self.futures.append(self.executor.submit(self.translate_batch, batch))
+                batch, batch_length = [], 0
+            batch.append(text)
+            batch_length += len(text) + 1
+        if batch:
+            self.futures.append(self.executor.submit(self.translate_batch, batch))
+
+    def translate_batch(self, texts: List[str]):
+        """Translate newline-joined texts with one request and cache the results"""
+        deadline = self.deadline
+        remaining = deadline - time.monotonic() if deadline else 0
+        if remaining <= 0:
+            return
+        try:
+            params = {
+                'client': 'gtx',
+                'sl': 'auto',
+                'tl': self.target_lang,
+                'dt': 't',
+                'q': '\n'.join(self.apply_glossary(text) for text in texts)
+            }
+            response = self.session.get(self.endpoint, params=params, timeout=min(remaining, 5))
+            response.raise_for_status()
+            result = response.json()
+            translated = ''.join(segment[0] for segment in result[0] if segment and segment[0])
+            lines = translated.split('\n')
+            if len(lines) != len(texts):
+                logger.warning(f"Translation batch of {len(texts)} came back as {len(lines)} lines, skipping")
+                return
+            now = time.time()
+            with self._lock:
+                for text, line in zip(texts, lines):
+                    self.cache[self.cache_key(text)] = {'text': line.strip() or text, 'used': now}
+        except requests.HTTPError as e:
+            # The error message carries the request URL, i.e. every text in the batch
+            logger.warning(f"Translation failed with HTTP {e.response.status_code} for a batch of {len(texts)}, "
+                           f"using original text")
+        except Exception as e:
+            logger.warning(f"Translation failed ({type(e).__name__}) for a batch of {len(texts)}, using original text")
+        finally:
+            with self._lock:
+                self.pending.difference_update(texts)
+
+    def finish(self):
+        """Wait for outstanding batches until the time budget runs out, then save the cache"""
+        if self.futures:
+            timeout = max(0.0, self.deadline - time.monotonic()) if self.deadline else None
+            _, not_done = wait(self.futures, timeout=timeout)
+            if not_done:
+                logger.warning(f"Translation time budget exceeded, {len(not_done)} batches fall back to original text")
+            for future in not_done:
+                future.cancel()
+            self.futures = []
+        # The next round of submissions (e.g. a daemon's next cycle) gets a fresh budget
+        self.deadline = None
+        self.save_cache()
+
+    def translate_many(self, texts: List[str]) -> List[str]:
+        """Translate texts now, falling back to the original for anything not translated"""
+        self.submit(texts)
+        self.finish()
+        return [self.lookup(text) or text for text in texts]
+
+    def save_cache(self):
+        """Write the cache, evicting the least recently used entries over max_entries"""
+        try:
+            with self._lock:
+                if len(self.cache) > self.max_entries:
+                    keep = sorted(self.cache.items(), key=lambda item: item[1].get('used', 0))[-self.max_entries:]
+                    self.cache = dict(keep)
+                with open(self.cache_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.cache, f, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"Error saving translation cache: {e}")
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class TelegramClient:
+    """Bot API sendMessage over a pooled session, rate limited, with retries and retry_after"""
+
+    def __init__(self, session: requests.Session, bot_token: str, chat_id: str,
+                 api_base: str = 'https://api.telegram.org', min_interval: float = 1.0,
+                 max_retries: int = 3, retry_backoff: float = 1.0, max_wait: float = 60.0,
+                 timeout: Tuple[float, float] = (4.0, 10.0)):
+        self.session = session
+        self.bot_token = bot_token
+        self.chat_id = chat_id
+        self.api_base = api_base.rstrip('/')
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_wait = max_wait
+        self.timeout = timeout
+        # Telegram allows about one message per second to a chat
+        self.rate_limiter = HostRateLimiter(min_interval=min_interval, max_backoff=max_wait)
+
+    def api_error(self, response) -> Tuple[str, Optional[float]]:
+        """Read an error response's description and retry_after"""
+        try:
+            body = response.json()
+        except ValueError:
+            return response.text[:200], None
+        retry_after = (body.get('parameters') or {}).get('retry_after')
+        return body.get('description', ''), float(retry_after) if retry_after is not None else None
+
+    def send(self, text: str) -> Delivery:
+        """Send a message, returning whether Telegram accepted it, refused it for good or may take it later"""
+        url = f"{self.api_base}/bot{self.bot_token}/sendMessage"
+        data = {'chat_id': self.chat_id, 'text': text, 'parse_mode': 'Markdown'}
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait(url)
+            try:
+                response = self.session.post(url, data=data, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error, retry_after = str(e), None
+            else:
+                if response.status_code == 200:
+                    self.rate_limiter.record_success(url)
+                    return Delivery.SENT
+                description, retry_after = self.api_error(response)
+                error = f"{response.status_code} {description}"
+                if response.status_code == 400 and 'parse_mode' in data and "can't parse" in description.lower():
+                    # Stray Markdown characters in a title: send it as plain text
+                    logger.warning("Telegram could not parse the message as Markdown, sending plain text")
+                    del data['parse_mode']
+                    continue
+                if response.status_code != 429 and response.status_code < 500:
+                    logger.error(f"❌ Telegram rejected message: {error}")
+                    return Delivery.REJECTED
+            
+            delay = retry_after if retry_after is not None else self.retry_backoff * (2 ** attempt)
+            if attempt == self.max_retries or delay > self.max_wait:
+                break
+            self.rate_limiter.record_failure(url, delay)
+            logger.info(f"Retrying Telegram message in {delay:.1f}s ({error})")
+        logger.error(f"❌ Failed to send Telegram message: {error}")
+        return Delivery.RETRY
+
+
+class RunMetrics:
+    """Stage timings and per-club fetch metrics for one run"""
+
+    def __init__(self):
+        self.run_id = datetime.now().isoformat(timespec='seconds')
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages: List[Dict] = []
+        self.clubs: Dict[str, Dict] = {}
+
+    @contextmanager
+    def stage(self, name: str, **labels):
+        """Time a stage (wall and thread CPU time)"""
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            record = {
+                'stage': name,
+                **labels,
+                'wall_ms': round((time.perf_counter() - wall_start) * 1000, 3),
+                'cpu_ms': round((time.thread_time() - cpu_start) * 1000, 3)
+            }
+            with self._lock:
+                self.stages.append(record)
+
+    def add_stages(self, records: List[Dict]):
+        """Add stage records timed elsewhere, e.g. in an extraction worker process"""
+        with self._lock:
+            self.stages.extend(records)
+
+    def club(self, name: str) -> Dict:
+        """Get the mutable metrics record for a club"""
+        with self._lock:
+            return self.clubs.setdefault(name, {'club': name})
+
+    def stage_total_ms(self, name: str) -> float:
+        return sum(record['wall_ms'] for record in self.stages if record['stage'] == name)
+
+    def write(self, filename: str):
+        """Append this run's metrics to a JSON lines file"""
+        try:
+            with open(filename, 'a', encoding='utf-8') as f:
+                for record in self.stages:
+                    f.write(json.dumps({'run_id': self.run_id, 'type': 'stage', **record}, ensure_ascii=False) + '\n')
+                for record in self.clubs.values():
+                    f.write(json.dumps({'run_id': self.run_id, 'type': 'club', **record}, ensure_ascii=False) + '\n')
+                f.write(json.dumps({
+                    'run_id': self.run_id,
+                    'type': 'run',
+                    'wall_ms': round((time.perf_counter() - self.started) * 1000, 3),
+                    'clubs': len(self.clubs),
+                    'bytes': sum(record.get('bytes', 0) for record in self.clubs.values()),
+                    'events': sum(record.get('events', 0) for record in self.clubs.values())
+                }) + '\n')
+            logger.info(f"📈 Metrics written to {filename}")
+        except Exception as e:
+            logger.error(f"Error writing metrics: {e}")
+
+
+class TextLineTarget:
+    """lxml parser target turning parse events into text lines and links
+
+    Produces the same lines as joining a parsed page's text and splitting it
+    on newlines, without building the tree. Text inside noise elements is
+    skipped; text following them is kept.
+    """
+
+    def __init__(self, noise_tags: List[str]):
+        self.noise_tags = set(noise_tags)
+        self.noise_depth = 0
+        self.lines: deque = deque()
+        self.line_count = 0
+        self.anchors: List[Tuple[str, str, str]] = []
+        self._current: List[str] = []
+        self._anchor: Optional[Tuple[str, str, List[str]]] = None
+
+    def start(self, tag, attrib):
+        if tag in self.noise_tags:
+            self.noise_depth += 1
+        elif tag == 'a' and not self.noise_depth and attrib.get('href'):
+            self._anchor = (attrib['href'], attrib.get('rel') or '', [])
+
+    def end(self, tag):
+        if tag in self.noise_tags:
+            self.noise_depth -= 1
+        elif tag == 'a' and self._anchor:
+            href, rel, text = self._anchor
+            self.anchors.append((href, rel, ' '.join(' '.join(text).split())))
+            self._anchor = None
+
+    def data(self, text):
+        if self.noise_depth:
+            return
+        if self._anchor:
+            self._anchor[2].append(text)
+        first, *rest = text.split('\n')
+        self._current.append(first)
+        for piece in rest:
+            self.emit()
+            self._current.append(piece)
+
+    def emit(self):
+        self.lines.append(''.join(self._current))
+        self.line_count += 1
+        self._current = []
+
+    def close(self):
+        self.emit()
+
+
 class SmartRegattaScraper:
-    def __init__(self, telegram_bot_token=None, telegram_chat_id=None):
+    def __init__(self, telegram_bot_token=None, telegram_chat_id=None,
+                 max_workers: int = 4, min_host_interval: float = 1.0,
+                 crawl_max_pages: int = 6, crawl_max_depth: int = 2,
+                 http_cache: Optional[HttpCache] = None, shard_store: Optional[ShardStore] = None,
+                 event_history: Optional[EventHistory] = None,
+                 translator: Optional[TranslationService] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 max_retries: int = 2, retry_backoff: float = 1.0,
+                 connect_timeout: float = 4.0, read_timeout: float = 10.0,
+                 run_time_budget: Optional[float] = None, stream_pages: bool = False,
+                 compact_output: bool = False, calendar_index: Optional[CalendarIndex] = None,
+                 telegram_api: str = 'https://api.telegram.org', extract_workers: int = 0,
+                 clubs: Optional[List[Dict]] = None, offline: bool = False,
+                 output_file: str = 'regattas.json', archive: Optional[PageArchive] = None,
+                 deterministic_output: bool = False):
         self.telegram_bot_token = telegram_bot_token
         self.telegram_chat_id = telegram_chat_id
+        self.telegram_api = telegram_api
+        self.telegram: Optional[TelegramClient] = None
+        # Failed runs after which a queued notification is given up on
+        self.max_notification_attempts = 10
+        self.http_cache = http_cache
+        self.shard_store = shard_store
+        self.event_history = event_history
+        self.translator = translator
+        self.circuit_breaker = circuit_breaker
+        self.calendar_index = calendar_index
+        self.archive = archive
+        self.metrics = RunMetrics()
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.timeout = (connect_timeout, read_timeout)
+        self.run_time_budget = run_time_budget
+        self.stream_pages = stream_pages
+        # Deterministic output is sorted, compact and one record per line, so
+        # the committed files only change where events do
+        self.deterministic_output = deterministic_output
+        self.compact_output = compact_output or deterministic_output
+        self.output_file = output_file
+        # Offline runs replay pages from the HTTP cache instead of fetching them
+        self.offline = offline
+        # Day events are judged past or upcoming against (today when None);
+        # replays of archived runs set it to the day the run fetched its pages
+        self.today: Optional[date] = None
+        # With extract_workers, fetch threads only collect page bytes and
+        # parsing plus extraction run in that many worker processes
+        self.extract_workers = max(0, extract_workers)
+        self.extract_pool: Optional[ProcessPoolExecutor] = None
+        self._extract_pool_lock = threading.Lock()
+        self.deadline: Optional[float] = None
+        # Set by run(): a dry run writes no page bodies and archives nothing
+        self.dry_run = False
+        # Events added to/removed from each club's shard by the last run
+        self.club_diffs: Dict[str, Dict[str, List[Regatta]]] = {}
+        self.crawl_max_pages = crawl_max_pages
+        self.crawl_max_depth = crawl_max_depth
+        self.rate_limiter = HostRateLimiter(min_interval=min_host_interval)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # One pooled connection per worker and host; retries are handled in fetch()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(10, self.max_workers))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
-        # Boat category keywords
+        # Boat category keywords, matched as whole words
         self.yacht_keywords = [
-            'orc', 'swan', 'j70', 'j/70', 'crucero', 'cruceros', 'cruising', 
-            'keelboat', 'maxi', 'phrf', 'irc', 'crf', 'open', 'big boat',
-            'yacht', 'monohull', 'multihull', 'catamaran', 'trimaran'
+            'orc', 'swan', 'j70', 'j/70', 'j80', 'j/80', 'crucero', 'cruceros', 'cruising',
+            'keelboat', 'maxi', 'phrf', 'irc', 'crf', 'open', 'big boat', 'tp52', 'monotipo', 'monotipos',
+            'yacht', 'yachts', 'monohull', 'multihull', 'catamaran', 'trimaran', 'solitarios', 'a dos'
         ]
         
         self.dinghy_keywords = [
-            'optimist', 'optimista', 'laser', 'ilca', '420', 'snipe', 'dragon',
-            'dragón', 'cadet', 'europe', 'finn', 'radial', 'standard', 'dinghy',
+            'optimist', 'optimista', 'laser', 'ilca', '420', '470', '29er', 'snipe', 'dragon',
+            'dragón', 'cadet', 'europe', 'finn', 'radial', 'standard', 'dinghy', 'vela ligera', 'techno',
             'single handed', 'double handed', 'youth', 'junior', 'cadete'
         ]
         
         # Event type keywords
         self.series_keywords = [
-            'series', 'liga', 'championship', 'campeonato', 'circuit', 'circuito',
-            'anual', 'annual', 'temporada', 'season', 'ranking'
+            'series', 'liga', 'league', 'championship', 'campeonato', 'circuit', 'circuito',
+            'anual', 'annual', 'temporada', 'season', 'ranking', 'prueba', 'puntuable'
         ]
         
-        # Balearic Islands sailing clubs
-        self.clubs = [
-            {
-                'name': 'CN Port d\'Ítxol',
-                'url': 'https://www.cnportitxol.info/regatas/',
-                'location': 'Mallorca'
-            },
-            {
-                'name': 'La Ruta de la Sal',
-                'url': 'https://larutadelasal.com/',
-                'location': 'Mallorca'
-            },
-            {
-                'name': 'Copa del Rey MAPFRE',
-                'url': 'https://www.regatacopadelrey.com/home',
-                'location': 'Mallorca'
-            },
-            {
-                'name': 'Trofeo Conde de Godó',
-                'url': 'https://www.trofeocondegodo.com/',
-                'location': 'Mallorca'
-            },
-            {
-                'name': 'PalmaVela',
-                'url': 'https://www.palmavela.com/',
-                'location': 'Mallorca'
-            },
-            {
-                'name': 'Real Club Náutico de Palma',
-                'url': 'https://www.rcnp.es/regatas',
-                'location': 'Mallorca'
-            },
-            {
-                'name': 'CN Ciutadella',
-                'url': 'https://regates.cnciutadella.com/es/default/races',
-                'location': 'Menorca'
-            },
-            {
-                'name': 'CN Arenal',
-                'url': 'https://regatas.cnarenal.com/es/default/races',
-                'location': 'Mallorca'
-            },
-            {
-                'name': 'Regata Ophiusa',
-                'url': 'https://www.regataophiusa.com/pag_2/index.php',
-                'location': 'Formentera'
-            },
-            {
-                'name': 'Club Marítimo San Antonio',
-                'url': 'https://www.cmsap.com/en/default/races/calendar',
-                'location': 'Ibiza'
-            },
-            {
-                'name': 'CN Colonia Sant Jordi',
-                'url': 'https://cncoloniasp.com/regatas/',
-                'location': 'Mallorca'
-            },
-            {
-                'name': 'CV Port d\'Andratx',
-                'url': 'http://regatas.cvpa.es/es/default/races/calendar/year/2025/all/1',
-                'location': 'Mallorca'
-            },
-            {
-                'name': 'CN Ràpita',
-                'url': 'https://regatas.cnrapita.com/es/default/races',
-                'location': 'Mallorca'
-            }
+        # Keywords that hint at a category without settling it on their own:
+        # 'open' events and youth/junior age groups exist in every fleet, and
+        # 'standard'/'radial' are rigs named alongside the class
+        self.keyword_weights = {
+            'open': 0.5, 'youth': 0.5, 'junior': 0.5, 'standard': 0.5, 'radial': 0.5, 'a dos': 0.5
+        }
+        
+        # Regatta title keywords
+        self.regatta_keywords = [
+            'regata', 'copa', 'trofeo', 'campeonato', 'series', 'vuelta',
+            'memorial', 'challenge', 'open', 'master', 'junior', 'youth'
         ]
+        
+        # Navigation/boilerplate keywords that disqualify a line
+        self.filtered_keywords = [
+            'resultado', 'results', 'clasificación', 'classification',
+            'inscripción', 'registration', 'noticias', 'news', 'archivo',
+            'archive', 'galería', 'gallery', 'contacto', 'contact'
+        ]
+        
+        # Date patterns
+        self.date_patterns = [
+            r'\bdel\s+\d{1,2}\s+de\s+\w+\s+al\s+\d{1,2}\s+de\s+\w+\s+de\s+\d{4}\b',
+            r'\bdel\s+\d{1,2}\s+al\s+\d{1,2}\s+de\s+\w+\s+de\s+\d{4}\b',
+            r'\b\d{1,2}\s+de\s+\w+\s+de\s+\d{4}\b',
+            r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'
+        ]
+        
+        # Multi-day hints for date strings parse_date_range cannot read
+        self.multi_day_regexes = [
+            re.compile(r'del\s+\d{1,2}\s+de\s+\w+\s+al\s+\d{1,2}\s+de\s+\w+'),  # del X de mes al Y de mes
+            re.compile(r'del\s+\d{1,2}\s+al\s+\d{1,2}\s+de\s+\w+'),  # del X al Y de mes
+            re.compile(r'\d{1,2}\s*-\s*\d{1,2}\s+\w+'),  # 26-28 July
+            re.compile(r'\d{1,2}/\d{1,2}\s*-\s*\d{1,2}/\d{1,2}')  # 26/7 - 28/7
+        ]
+        
+        # Specialized extractors by name, and the URL patterns that select them.
+        # Each takes (document, club_info) and returns None when the page does
+        # not look like what it expects, so the generic text heuristic runs instead
+        self.extractors = {
+            'races_platform': self.extract_races_platform
+        }
+        self.extractor_patterns = [
+            (re.compile(r'/default/races\b'), 'races_platform')
+        ]
+        # (name, extractor, URL pattern) of each register_extractor call, which
+        # extraction worker processes repeat
+        self.registered_extractors: List[Tuple[str, object, Optional[str]]] = []
+        
+        # Link labels that lead to the next page of a listing
+        self.next_page_labels = {'siguiente', 'next', 'següent', '»', '›', '>', '>>'}
+        
+        # Links to a single race on the /default/races platform (not the
+        # calendar, the index or its pagination)
+        self.race_link_regex = re.compile(r'/default/races/(?!(?:calendar|index|page)\b)(?![^?#]*/page/)[^?#]+')
+        
+        # Minimum title similarity for two same-day events to be merged
+        self.title_similarity = 0.9
+        
+        # Page furniture dropped before text extraction
+        self.noise_tags = ['script', 'style', 'noscript', 'nav', 'footer']
+        
+        # Text that changes between visits without the listing changing
+        # (clocks, timestamps, relative times, visit counters), left out of
+        # page fingerprints. A club's 'fingerprint_ignore' regexes drop whole
+        # lines, e.g. a rotating banner
+        self.volatile_text_regex = re.compile(
+            r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(?::\d{2})?(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?'
+            r'|\b\d{1,2}:\d{2}(?::\d{2})?(?:\s*[ap]\.?m\.?)?'
+            r'|\bhace\s+\d+\s+\w+|\b\d+\s+\w+\s+ago\b'
+            r'|\b(?:visitas|visits|views|vistas)\s*:?\s*\d+',
+            re.IGNORECASE
+        )
+        
+        # Matchers compiled once and shared by every extraction
+        self.regatta_keyword_regex = self.compile_keyword_matcher(self.regatta_keywords)
+        self.filtered_keyword_regex = self.compile_keyword_matcher(self.filtered_keywords)
+        self.date_regexes = [re.compile(pattern, re.IGNORECASE) for pattern in self.date_patterns]
+        self.any_date_regex = re.compile('|'.join(f'(?:{pattern})' for pattern in self.date_patterns),
+                                         re.IGNORECASE)
+        # Boat and series classifiers; keywords weigh 1 unless listed here
+        self.boat_classifier = CategoryClassifier({
+            BoatType.YACHTS: {keyword: self.keyword_weights.get(keyword, 1.0) for keyword in self.yacht_keywords},
+            BoatType.DINGHIES: {keyword: self.keyword_weights.get(keyword, 1.0) for keyword in self.dinghy_keywords}
+        })
+        self.series_classifier = CategoryClassifier({
+            EventType.SERIES: {keyword: self.keyword_weights.get(keyword, 1.0) for keyword in self.series_keywords}
+        })
+        # Memoized on the event, as the same events come back run after run
+        self.classify_event = functools.lru_cache(maxsize=4096)(self.score_event)
+        
+        self.clubs = load_clubs() if clubs is None else clubs
+
+    def normalize_title(self, title: str) -> str:
+        """Normalize a title for comparison: no dates, accents, case or punctuation"""
+        return fold_text(self.any_date_regex.sub(' ', title))
+
+    def output_order(self, regattas: List[Regatta]) -> List[Regatta]:
+        """Sort events by start date, club and normalized title (deterministic output only)"""
+        if not self.deterministic_output:
+            return regattas
+        return sorted(regattas, key=lambda r: (r.start_date or '', r.club, self.normalize_title(r.title)))
+
+    def event_date_key(self, date_str: str) -> str:
+        """Normalize a date string to an ISO start (and end) date where possible"""
+        date_range = parse_date_range(date_str)
+        if not date_range:
+            return fold_text(date_str)
+        start, end = date_range
+        return start.isoformat() if start == end else f"{start.isoformat()}/{end.isoformat()}"
+
+    def create_event_signature(self, regatta: Regatta) -> str:
+        """Create a unique signature for each event from its normalized date, club and title"""
+        return self.event_signature(regatta.club, regatta.title, regatta.date)
+
+    def event_signature(self, club: str, title: str, date_str: str) -> str:
+        """The signature of an event with this club, title and date"""
+        return '|'.join([
+            self.event_date_key(date_str),
+            club_slug(club),
+            self.normalize_title(title)
+        ])
+
+    def get_event_history(self) -> EventHistory:
+        """Get the event history, opening the default database on first use"""
+        if self.event_history is None:
+            self.event_history = EventHistory()
+        return self.event_history
+
+    def score_event(self, event: Tuple[str, str, str]) -> Tuple[Tuple[BoatType, float], Tuple[EventType, float]]:
+        """Classify a (title, date, details) event, with the confidence of each category
+
+        Boats are mixed when no fleet clearly dominates (confidence 0); events
+        that are not a series get their duration from the date (confidence 1).
+        Used through the memoized classify_event.
+        """
+        title, date_str, details = event
+        # Each part is folded and split into words once for both classifiers
+        folded_title, folded_date, folded_details = fold_text(title), fold_text(date_str), fold_text(details)
+        boat_text = ' '.join(filter(None, (folded_title, folded_details)))
+        word_counts = Counter(boat_text.split())
+        boat_type, boat_confidence = self.boat_classifier.score(word_counts, boat_text)
+        word_counts.update(folded_date.split())
+        event_type, event_confidence = self.series_classifier.score(
+            word_counts, ' '.join(filter(None, (folded_title, folded_date, folded_details))))
+        if event_type is None:
+            event_type, event_confidence = self.event_duration_type(date_str), 1.0
+        return (boat_type or BoatType.MIXED, boat_confidence), (event_type, event_confidence)
+
+    def event_duration_type(self, date_str: str) -> EventType:
+        """Single or multi-day: multi-day events span more than one calendar day"""
+        date_range = parse_date_range(date_str)
+        if date_range:
+            if date_range[0] != date_range[1]:
+                return EventType.MULTI_DAY
+        else:
+            # Formats the parser does not understand
+            for pattern in self.multi_day_regexes:
+                if pattern.search(date_str.lower()):
+                    return EventType.MULTI_DAY
+        return EventType.SINGLE_DAY
+
+    def identify_new_events(self, current_regattas: List[Regatta],
+                            added: Optional[List[Regatta]] = None) -> List[Regatta]:
+        """Identify which events have never been seen before
+
+        added, when given, holds the events not in their club's stored results;
+        only those are looked up in the history.
+        """
+        events_by_signature = {}
+        for regatta in current_regattas:
+            events_by_signature.setdefault(self.create_event_signature(regatta), regatta)
+        candidates = None if added is None else {self.create_event_signature(regatta) for regatta in added}
+        
+        # One transaction records this run; events that drop off a page for a
+        # while keep their history and are not reported again when they return
+        new_signatures = self.get_event_history().record_run(events_by_signature, candidates,
+                                                             notify=self.telegram_enabled(),
+                                                             signature=self.event_signature)
+        new_events = [regatta for signature, regatta in events_by_signature.items()
+                      if signature in new_signatures]
+        
+        logger.info(f"Found {len(new_events)} new events out of {len(current_regattas)} total events")
+        return new_events
+
+    def crawl_start_urls(self, club_info: Dict) -> List[str]:
+        """Get a club's listing URLs: its main page plus this and next year's calendars"""
+        year = (self.today or date.today()).year
+        urls = [club_info['url']]
+        for template in club_info.get('url_templates', []):
+            urls.extend(template.format(year=crawl_year) for crawl_year in (year, year + 1))
+        return list(dict.fromkeys(urls))
+
+    def pagination_links(self, document: lxml.html.HtmlElement, page_url: str) -> List[str]:
+        """Find links to further pages of the same listing"""
+        anchors = ((link.get('href'), link.get('rel') or '', self.element_text(link))
+                   for link in document.iter('a') if link.get('href'))
+        return self.pagination_anchor_links(anchors, page_url)
+
+    def pagination_anchor_links(self, anchors: Iterable[Tuple[str, str, str]], page_url: str) -> List[str]:
+        """Pick the pagination links out of (href, rel, text) anchors"""
+        page = urlparse(page_url)
+        page_shape = re.sub(r'\d+', '#', page.path + '?' + page.query)
+        links = []
+        for href, rel, text in anchors:
+            target = urlparse(urljoin(page_url, href))._replace(fragment='')
+            if target.netloc != page.netloc:
+                continue
+            text = text.lower()
+            # rel=next, a 'next' label, or a page number in an otherwise identical
+            # URL; year selectors of calendars ('2024', '2025') have the same
+            # shape, so page numbers have at most three digits
+            if ('next' in rel.split() or text in self.next_page_labels or
+                    (text.isdigit() and len(text) < 4 and
+                     re.sub(r'\d+', '#', target.path + '?' + target.query) == page_shape)):
+                links.append(target.geturl())
+        return list(dict.fromkeys(links))
+
+    def scrape_club_regattas(self, club_info: Dict) -> List[Regatta]:
+        """Scrape regatta information from a specific club, following its listing pages"""
+        regattas = []
+        name = club_info['name']
+        club_metrics = self.metrics.club(name)
+        logger.info(f"Processing {name}...")
+        
+        # Bounded breadth-first crawl; pages of one club share a host, so
+        # the per-host rate limiter already spaces them out
+        max_pages = club_info.get('max_pages', self.crawl_max_pages)
+        max_depth = club_info.get('max_depth', self.crawl_max_depth)
+        frontier = deque((url, 0) for url in self.crawl_start_urls(club_info))
+        seen_urls = {url for url, _ in frontier}
+        pages = 0
+        club_digest = hashlib.sha256()
+        complete = True
+        
+        while frontier and pages < max_pages:
+            if self.deadline_exceeded():
+                # A partial crawl would overwrite good results with fewer events
+                logger.warning(f"⏱️ Run deadline reached while crawling {name}")
+                club_metrics['timed_out'] = True
+                break
+            url, depth = frontier.popleft()
+            pages += 1
+            try:
+                page_regattas, links, fingerprint = self.scrape_page(url, club_info, club_metrics)
+            except DeadlineExceeded as e:
+                logger.warning(f"⏱️ {e}")
+                club_metrics['timed_out'] = True
+                break
+            except Exception as e:
+                logger.error(f"Error scraping {name} ({url}): {e}")
+                club_metrics.setdefault('errors', []).append(str(e))
+                complete = False
+                continue
+            
+            regattas.extend(page_regattas)
+            club_digest.update(f"{url}\x00{fingerprint}\n".encode('utf-8'))
+            if depth < max_depth:
+                for link in links:
+                    if link not in seen_urls:
+                        seen_urls.add(link)
+                        frontier.append((link, depth + 1))
+        
+        club_metrics['pages'] = pages
+        club_metrics['events'] = len(regattas)
+        if complete and not club_metrics.get('timed_out'):
+            # Fingerprint of every page crawled, stored with the club's shard
+            club_metrics['fingerprint'] = club_digest.hexdigest()
+        if regattas:
+            logger.info(f"Found {len(regattas)} regattas at {name}")
+        else:
+            logger.info(f"No regattas found at {name}")
+        
+        return regattas
+
+    def scrape_page(self, url: str, club_info: Dict, club_metrics: Dict):
+        """Fetch and extract one listing page, returning (regattas, pagination links, content fingerprint)"""
+        name = club_info['name']
+        # Last visit's results, kept in case only volatile parts of the page changed
+        previous = self.http_cache.cached_results(url) if self.http_cache else None
+        if self.offline:
+            return self.replay_page(url, club_info, club_metrics, previous)
+        headers = self.http_cache.conditional_headers(url) if self.http_cache else {}
+        # Specialized extractors and content selectors need the whole tree
+        stream = self.stream_pages and not self.extract_workers and not club_info.get('content_xpath') \
+            and self.select_extractor(club_info) is None
+        with self.metrics.stage('fetch', club=name):
+            response = self.fetch(url, headers, club_metrics, stream=stream)
+        
+        club_metrics.setdefault('status', response.status_code)
+        club_metrics['latency_ms'] = round(club_metrics.get('latency_ms', 0) + response.elapsed.total_seconds() * 1000, 3)
+        if stream and response.status_code == 200:
+            return self.stream_page(url, response, club_info, club_metrics)
+        club_metrics['bytes'] = club_metrics.get('bytes', 0) + len(response.content)
+        response.raise_for_status()
+        
+        content = None
+        unchanged = False
+        if response.status_code == 304 and self.http_cache:
+            self.http_cache.mark_validated(url)
+            unchanged = True
+        elif self.http_cache:
+            content = response.content
+            unchanged = self.http_cache.store(url, response, write_body=not self.dry_run)
+        else:
+            content = response.content
+        if self.archive and not self.dry_run:
+            self.archive_page(name, url, content, self.http_cache.content_hash(url) if self.http_cache else None)
+        
+        if unchanged:
+            if previous is not None and previous['fingerprint']:
+                # Unchanged page: reuse last extraction, dropping events now in the past
+                logger.info(f"♻️ {name} page unchanged, reusing cached regattas ({url})")
+                club_metrics['cache_hits'] = club_metrics.get('cache_hits', 0) + 1
+                return self.cached_regattas(previous), previous['links'], previous['fingerprint']
+            if content is None:
+                content = self.http_cache.load_body(url) or b''
+        club_metrics['cache_misses'] = club_metrics.get('cache_misses', 0) + 1
+        return self.process_page(content, url, club_info, club_metrics, previous)
+
+    def replay_page(self, url: str, club_info: Dict, club_metrics: Dict, previous: Optional[Dict]):
+        """Extract a page from its cached copy instead of fetching it"""
+        content = self.http_cache.load_body(url) if self.http_cache else None
+        if content is None:
+            raise PageNotCached(f"No cached copy of {url} to replay")
+        club_metrics['replayed'] = club_metrics.get('replayed', 0) + 1
+        club_metrics['bytes'] = club_metrics.get('bytes', 0) + len(content)
+        return self.process_page(content, url, club_info, club_metrics, previous)
+
+    def archive_page(self, club_name: str, url: str, content: Optional[bytes], content_hash: Optional[str]):
+        """List a fetched page in the archive's run, storing its body unless already archived
+
+        content is None for a 304 or a streamed page, whose body is then
+        copied from the HTTP cache block by block.
+        """
+        try:
+            if content is not None:
+                self.archive.store(club_name, url, content)
+            elif content_hash and self.http_cache:
+                self.archive.store_file(club_name, url, self.http_cache.body_path(url), content_hash)
+        except OSError as e:
+            logger.warning(f"Could not archive {url}: {e}")
+
+    def process_page(self, content: bytes, url: str, club_info: Dict, club_metrics: Dict,
+                     previous: Optional[Dict]):
+        """Extract a page's content (or reuse the previous extraction) and remember the results"""
+        name = club_info['name']
+        previous_fingerprint = previous['fingerprint'] if previous is not None else None
+        if self.extract_workers:
+            page = self.extract_page_in_pool(content, url, club_info, previous_fingerprint)
+        else:
+            page = self.extract_page(content, url, club_info, previous_fingerprint)
+        regattas, links, fingerprint = page['regattas'], page['links'], page['fingerprint']
+        if regattas is None:
+            logger.info(f"♻️ {name} page content unchanged, reusing cached regattas ({url})")
+            club_metrics['fingerprint_hits'] = club_metrics.get('fingerprint_hits', 0) + 1
+            regattas = self.cached_regattas(previous)
+        elif page['extractor']:
+            club_metrics['extractor'] = page['extractor']
+            club_metrics['lines'] = club_metrics.get('lines', 0) + page['lines']
+        
+        if self.http_cache:
+            self.http_cache.store_results(url, [r.to_dict(compact=True) for r in regattas], links, fingerprint)
+        return regattas, links, fingerprint
+
+    def extract_page(self, content: bytes, url: str, club_info: Dict,
+                     previous_fingerprint: Optional[str] = None) -> Dict:
+        """Parse and extract one fetched page
+
+        Returns its regattas, pagination links, content fingerprint, extractor
+        name and lines scanned. regattas is None when the fingerprint equals
+        previous_fingerprint, i.e. the main content only changed in timestamps,
+        counters or ignored lines and the last extraction still applies.
+        """
+        name = club_info['name']
+        with self.metrics.stage('parse', club=name):
+            document = self.parse_document(content)
+        if document is None:
+            return {'regattas': [], 'links': [], 'fingerprint': self.content_fingerprint([], club_info),
+                    'extractor': None, 'lines': 0}
+        
+        with self.metrics.stage('extract', club=name):
+            lines = self.document_text_lines(document, club_info)
+            extractor_links = [link.get('href') or '' for link in document.iter('a')] \
+                if self.select_extractor(club_info) else []
+            fingerprint = self.content_fingerprint(lines, club_info, extractor_links)
+            links = self.pagination_links(document, url)
+            if fingerprint == previous_fingerprint:
+                regattas, extractor, lines_scanned = None, None, 0
+            else:
+                regattas, extractor, lines_scanned = self.extract_document_regattas(document, club_info, lines)
+        return {'regattas': regattas, 'links': links, 'fingerprint': fingerprint,
+                'extractor': extractor, 'lines': lines_scanned}
+
+    def get_extract_pool(self) -> ProcessPoolExecutor:
+        """Start the extraction worker processes on first use"""
+        with self._extract_pool_lock:
+            if self.extract_pool is None:
+                # Spawned rather than forked: the fetch threads may hold locks
+                # (logging, connection pools) that a forked child would inherit
+                self.check_extract_workers()
+                self.extract_pool = ProcessPoolExecutor(
+                    max_workers=self.extract_workers, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=init_extract_worker, initargs=(type(self), self.registered_extractors))
+            return self.extract_pool
+
+    def check_extract_workers(self, extractors: Optional[List[Tuple[str, object, Optional[str]]]] = None):
+        """Make sure extraction worker processes can register the same extractors as this scraper"""
+        try:
+            pickle.dumps(self.registered_extractors if extractors is None else extractors)
+        except Exception as e:
+            raise ValueError(f"Registered extractors must be module-level functions to run in "
+                             f"extraction worker processes: {e}")
+
+    def extract_page_in_pool(self, content: bytes, url: str, club_info: Dict,
+                             previous_fingerprint: Optional[str] = None) -> Dict:
+        """Run extract_page in a worker process, waiting no longer than the run deadline"""
+        future = self.get_extract_pool().submit(extract_page_worker, content, url, club_info, previous_fingerprint)
+        timeout = None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+        try:
+            page = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise DeadlineExceeded(f"Run deadline reached while extracting {url}")
+        self.metrics.add_stages(page.pop('stages'))
+        if page['regattas'] is not None:
+            page['regattas'] = [Regatta.from_dict(record) for record in page['regattas']]
+        return page
+
+    def close_extract_pool(self):
+        """Stop the extraction worker processes"""
+        with self._extract_pool_lock:
+            if self.extract_pool is not None:
+                self.extract_pool.shutdown(cancel_futures=True)
+                self.extract_pool = None
+
+    def cached_regattas(self, cached: Dict) -> List[Regatta]:
+        """Rebuild a page's cached regattas, dropping events now in the past"""
+        regattas = [Regatta.from_dict(record) for record in cached['regattas']]
+        return [r for r in regattas if self.filter_future_dates([r.date])]
+
+    def stream_page(self, url: str, response: requests.Response, club_info: Dict, club_metrics: Dict):
+        """Extract a listing page while it downloads, returning (regattas, pagination links, fingerprint)
+
+        The body is hashed and written to the cache chunk by chunk, so neither
+        it nor its tree is ever held in memory as a whole. The archive copies
+        it from the cache afterwards or, without a cache body, compresses it
+        as the chunks arrive.
+        """
+        digest = hashlib.sha256()
+        body_file = self.http_cache.open_body(url, response) if self.http_cache and not self.dry_run else None
+        size = 0
+        archive_file = None
+        if self.archive and not self.dry_run and not body_file:
+            try:
+                archive_file = self.archive.open_object()
+            except OSError as e:
+                logger.warning(f"Could not archive {url}: {e}")
+        
+        def chunks():
+            nonlocal size, archive_file
+            for chunk in self.iter_body(response):
+                digest.update(chunk)
+                size += len(chunk)
+                if body_file:
+                    body_file.write(chunk)
+                if archive_file:
+                    try:
+                        archive_file.write(chunk)
+                    except OSError as e:
+                        logger.warning(f"Could not archive {url}: {e}")
+                        self.archive.discard_object(archive_file)
+                        archive_file = None
+                yield chunk
+        
+        target = TextLineTarget(self.noise_tags)
+        # The whole page is needed before its fingerprint is known, so streamed
+        # pages are always extracted; the fingerprint is kept for the club
+        fingerprint_digest = hashlib.sha256(f"{FINGERPRINT_SCHEME}\n".encode('utf-8'))
+        try:
+            with self.metrics.stage('stream', club=club_info['name']):
+                lines = self.fingerprint_lines(self.stream_text_lines(chunks(), target), club_info,
+                                               fingerprint_digest)
+                regattas = self.extract_regatta_lines(lines, club_info)
+        except BaseException:
+            if body_file:
+                self.http_cache.discard_body(body_file)
+            if archive_file:
+                self.archive.discard_object(archive_file)
+            raise
+        links = self.pagination_anchor_links(target.anchors, url)
+        
+        club_metrics['bytes'] = club_metrics.get('bytes', 0) + size
+        club_metrics['extractor'] = 'generic'
+        club_metrics['lines'] = club_metrics.get('lines', 0) + target.line_count
+        club_metrics['cache_misses'] = club_metrics.get('cache_misses', 0) + 1
+        fingerprint = fingerprint_digest.hexdigest()
+        if self.http_cache:
+            self.http_cache.commit(url, response, digest.hexdigest(), body_file)
+            self.http_cache.store_results(url, [r.to_dict(compact=True) for r in regattas], links, fingerprint)
+        if archive_file:
+            try:
+                self.archive.commit_object(club_info['name'], url, archive_file, digest.hexdigest())
+            except OSError as e:
+                logger.warning(f"Could not archive {url}: {e}")
+                self.archive.discard_object(archive_file)
+        elif self.archive and not self.dry_run:
+            self.archive_page(club_info['name'], url, None, digest.hexdigest())
+        return regattas, links, fingerprint
+
+    def fetch(self, url: str, headers: Dict, club_metrics: Dict, stream: bool = False) -> requests.Response:
+        """GET a URL, retrying connection errors, timeouts, 429 and 5xx with jittered back-off
+
+        With stream=True a successful response is returned with its body unread.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait(url)
+            club_metrics['attempts'] = club_metrics.get('attempts', 0) + 1
+            retry_after = None
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+                if not stream or response.status_code != 200:
+                    self.read_body(response)
+            except DeadlineExceeded:
+                raise
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            else:
+                if response.status_code != 429 and response.status_code < 500:
+                    self.rate_limiter.record_success(url)
+                    return response
+                error = None
+                retry_after = self.parse_retry_after(response)
+            
+            # The delay is handed to the rate limiter, so the next wait() on this
+            # host (ours or another worker's) honours it
+            delay = retry_after if retry_after is not None else \
+                self.retry_backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            self.rate_limiter.record_failure(url, delay)
+            if attempt == self.max_retries or self.deadline_exceeded(delay):
+                break
+            club_metrics['retries'] = club_metrics.get('retries', 0) + 1
+            logger.info(f"Retrying {url} in {delay:.1f}s ({error or response.status_code})")
+        
+        if error is not None:
+            raise error
+        return response
 
-    def create_event_signature(self, regatta: Dict) -> str:
-        """Create a unique signature for each event"""
-        return f"{regatta.get('title', '')}-{regatta.get('date', '')}-{regatta.get('club', '')}"
+    def read_body(self, response: requests.Response):
+        """Download a streamed body, giving up once the run deadline passes"""
+        # Same as what requests caches on first access of response.content
+        response._content = b''.join(self.iter_body(response))
 
-    def load_previous_events(self, filename='previous_events.json') -> Set[str]:
-        """Load previously found events"""
-        try:
-            if os.path.exists(filename):
-                with open(filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return set(data.get('event_signatures', []))
-            return set()
-        except Exception as e:
-            logger.error(f"Error loading previous events: {e}")
-            return set()
+    def iter_body(self, response: requests.Response) -> Iterator[bytes]:
+        """Yield a streamed body's chunks as they arrive, giving up once the run deadline passes
 
-    def save_current_events(self, event_signatures: Set[str], filename='previous_events.json'):
-        """Save current events for next comparison"""
+        The read timeout only bounds the gap between chunks, so without this a
+        server trickling bytes could hold a worker far past the deadline.
+        read1() returns whatever has arrived instead of waiting for a full chunk.
+        """
         try:
-            data = {
-                'event_signatures': list(event_signatures),
-                'last_updated': datetime.now().isoformat()
-            }
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving current events: {e}")
-
-    def categorize_boat_type(self, text: str) -> str:
-        """Categorize boat type based on text content"""
-        text_lower = text.lower()
-        
-        # Check for yacht keywords
-        for keyword in self.yacht_keywords:
-            if keyword in text_lower:
-                return 'yachts'
-        
-        # Check for dinghy keywords
-        for keyword in self.dinghy_keywords:
-            if keyword in text_lower:
-                return 'dinghies'
-        
-        # Default to mixed if unclear
-        return 'mixed'
-
-    def categorize_event_type(self, title: str, date_str: str, details: str) -> str:
-        """Categorize event type based on date patterns and keywords"""
-        combined_text = f"{title} {date_str} {details}".lower()
-        
-        # Check for series keywords
-        for keyword in self.series_keywords:
-            if keyword in combined_text:
-                return 'series'
-        
-        # Check date patterns for multi-day events
-        multi_day_patterns = [
-            r'del\s+\d{1,2}\s+de\s+\w+\s+al\s+\d{1,2}\s+de\s+\w+',  # del X de mes al Y de mes
-            r'del\s+\d{1,2}\s+al\s+\d{1,2}\s+de\s+\w+',  # del X al Y de mes
-            r'\d{1,2}\s*-\s*\d{1,2}\s+\w+',  # 26-28 July
-            r'\d{1,2}/\d{1,2}\s*-\s*\d{1,2}/\d{1,2}'  # 26/7 - 28/7
-        ]
-        
-        for pattern in multi_day_patterns:
-            if re.search(pattern, date_str.lower()):
-                return 'multi_day'
-        
-        # Default to single day
-        return 'single_day'
+            while True:
+                if self.deadline_exceeded():
+                    response.close()
+                    raise DeadlineExceeded(f"run deadline reached while reading {response.url}")
+                chunk = response.raw.read1(64 * 1024, decode_content=True)
+                if not chunk:
+                    break
+                yield chunk
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.ReadTimeout(e, response=response)
+        except (urllib3.exceptions.ProtocolError, urllib3.exceptions.DecodeError) as e:
+            raise requests.ConnectionError(e, response=response)
 
-    def get_event_color(self, event_type: str) -> str:
-        """Get color code for event type"""
-        color_map = {
-            'single_day': '#4285f4',    # Blue
-            'multi_day': '#34a853',     # Green
-            'series': '#ff9800'         # Orange
-        }
-        return color_map.get(event_type, '#4285f4')
-
-    def get_boat_symbol(self, boat_type: str) -> str:
-        """Get text symbol for boat type"""
-        symbols = {
-            'yachts': '▲',
-            'dinghies': '●',
-            'mixed': '■'
-        }
-        return symbols.get(boat_type, '■')
+    def deadline_exceeded(self, delay: float = 0.0) -> bool:
+        """Whether the run deadline has passed (or would after delay seconds)"""
+        return self.deadline is not None and time.monotonic() + delay >= self.deadline
+
+    def parse_retry_after(self, response) -> Optional[float]:
+        """Read a Retry-After header given in seconds"""
+        try:
+            return float(response.headers.get('Retry-After', ''))
+        except ValueError:
+            return None
 
-    def identify_new_events(self, current_regattas: List[Dict]) -> List[Dict]:
-        """Identify which events are new since last run"""
-        previous_signatures = self.load_previous_events()
-        current_signatures = set()
-        new_events = []
+    def scrape_all_clubs(self, clubs: Optional[List[Dict]] = None) -> List[List[Regatta]]:
+        """Scrape every club (or just the given ones), concurrently when enabled, keeping club order"""
+        clubs = self.clubs if clubs is None else clubs
+        if self.run_time_budget is not None:
+            self.deadline = time.monotonic() + self.run_time_budget
+        if self.extract_workers:
+            # Fail before fetching anything rather than on every page
+            self.check_extract_workers()
+        # Offline runs replay pages that are already archived; dry runs leave no trace
+        archiving = self.archive is not None and not self.offline and not self.dry_run
+        if archiving:
+            self.archive.begin_run()
         
-        for regatta in current_regattas:
-            signature = self.create_event_signature(regatta)
-            current_signatures.add(signature)
-            
-            if signature not in previous_signatures:
-                new_events.append(regatta)
+        if self.max_workers == 1 or len(clubs) <= 1:
+            results = []
+            for club_info in clubs:
+                results.append(self.scrape_club_guarded(club_info))
+                self.queue_translations(results[-1] or [])
+        else:
+            # Politeness is enforced per host by the rate limiter, so workers
+            # only ever wait on their own host rather than on a global sleep
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            futures = [executor.submit(self.scrape_club_guarded, club_info) for club_info in clubs]
+            for future in futures:
+                # Translation of a club's titles starts as soon as it is scraped
+                future.add_done_callback(self.queue_future_translations)
+            timeout = None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+            done, _ = wait(futures, timeout=timeout)
+            # Stragglers are abandoned: queued clubs are cancelled and the results
+            # of running ones are ignored when they eventually finish
+            executor.shutdown(wait=False, cancel_futures=True)
+            results = [future.result() if future in done else None for future in futures]
         
-        # Save current signatures for next run
-        self.save_current_events(current_signatures)
+        if archiving:
+            self.archive.save_run()
         
-        logger.info(f"Found {len(new_events)} new events out of {len(current_regattas)} total events")
-        return new_events
+        for index, club_info in enumerate(clubs):
+            if results[index] is None:
+                results[index] = self.last_known_good(club_info)
+                self.queue_translations(results[index])
+        return results
 
-    def scrape_club_regattas(self, club_info: Dict) -> List[Dict]:
-        """Scrape regatta information from a specific club"""
-        regattas = []
+    def scrape_club_guarded(self, club_info: Dict) -> Optional[List[Regatta]]:
+        """Scrape a club behind the circuit breaker, returning None when it should fall back"""
+        name = club_info['name']
+        club_metrics = self.metrics.club(name)
+        if self.circuit_breaker and not self.circuit_breaker.allow(name):
+            logger.info(f"⛔ Skipping {name}: circuit open after repeated failures")
+            club_metrics['fallback'] = 'circuit_open'
+            return None
+        if self.circuit_breaker and self.circuit_breaker.is_open(name):
+            logger.info(f"🔎 Probing {name} after repeated failures")
         
-        try:
-            logger.info(f"Processing {club_info['name']}...")
-            
-            response = self.session.get(club_info['url'], timeout=8)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            text_content = soup.get_text()
-            
-            # Extract regatta information
-            found_regattas = self.extract_regatta_info(text_content, club_info)
-            
-            if found_regattas:
-                logger.info(f"Found {len(found_regattas)} regattas at {club_info['name']}")
-                regattas.extend(found_regattas)
-            else:
-                logger.info(f"No regattas found at {club_info['name']}")
-                
-        except Exception as e:
-            logger.error(f"Error scraping {club_info['name']}: {e}")
-            
+        regattas = self.scrape_club_regattas(club_info)
+        if club_metrics.get('timed_out'):
+            # Running out of time is not the club's fault, so the breaker is left alone
+            club_metrics['fallback'] = 'deadline'
+            return None
+        
+        success = club_metrics.get('pages', 0) > len(club_metrics.get('errors', []))
+        if self.circuit_breaker:
+            self.circuit_breaker.record(name, success)
+        if not success:
+            club_metrics['fallback'] = 'failed'
+            return None
         return regattas
 
-    def extract_regatta_info(self, text: str, club_info: Dict) -> List[Dict]:
-        """Extract regatta information from text content with categorization"""
-        regattas = []
+    def last_known_good(self, club_info: Dict) -> List[Regatta]:
+        """Previous results for a club that was skipped, failed or ran out of time"""
+        name = club_info['name']
+        club_metrics = self.metrics.club(name)
+        club_metrics.setdefault('fallback', 'deadline')
+        regattas = self.stored_regattas(name)
+        if regattas is None:
+            logger.warning(f"⚠️ No previous results for {name} ({club_metrics['fallback']})")
+            return []
+        logger.info(f"♻️ Using last known good results for {name}: {len(regattas)} regattas ({club_metrics['fallback']})")
+        club_metrics['events'] = len(regattas)
+        return regattas
+
+    def stored_regattas(self, club_name: str) -> Optional[List[Regatta]]:
+        """A club's upcoming events from its stored shard, or None without one"""
+        previous = self.shard_store.load(club_name) if self.shard_store else None
+        if previous is None:
+            return None
+        regattas = [Regatta.from_dict(record) for record in previous]
+        return [r for r in regattas if self.filter_future_dates([r.date])]
+
+    def queue_future_translations(self, future):
+        """Done callback queueing a finished club's titles for translation"""
+        # Stragglers finishing after the deadline were already replaced by old results
+        if future.cancelled() or future.exception() is not None or self.deadline_exceeded():
+            return
+        if future.result():
+            self.queue_translations(future.result())
+
+    def queue_translations(self, regattas: List[Regatta]):
+        """Start translating scraped titles in the background"""
+        if self.translator:
+            self.translator.submit([regatta.title for regatta in regattas])
+
+    def apply_translations(self, regattas: List[Regatta]):
+        """Add translated titles once the translation budget is spent"""
+        if not self.translator:
+            return
+        self.translator.finish()
+        lang = self.translator.target_lang
+        for regatta in regattas:
+            translated = self.translator.lookup(regatta.title)
+            if translated and translated != regatta.title:
+                regatta.translations[lang] = translated
+
+    def compile_keyword_matcher(self, keywords: List[str]) -> re.Pattern:
+        """Compile keywords into one regex matching any of them in lowercase text"""
+        # Longest first so overlapping keywords resolve the same way every time
+        alternatives = sorted(set(keywords), key=len, reverse=True)
+        return re.compile('|'.join(re.escape(keyword) for keyword in alternatives))
+
+    def find_dates(self, line: str) -> List[str]:
+        """Find all date strings in a line, in pattern order"""
+        # The combined alternation rejects the (vast majority of) lines
+        # without any date in a single scan
+        if not self.any_date_regex.search(line):
+            return []
+        dates = []
+        for pattern in self.date_regexes:
+            dates.extend(pattern.findall(line))
+        return dates
+
+    def parse_document(self, content: bytes) -> Optional[lxml.html.HtmlElement]:
+        """Parse a page with lxml, dropping scripts, styles and page furniture"""
+        # Same encoding detection BeautifulSoup used, without building a soup
+        encoding = UnicodeDammit(content, is_html=True).original_encoding or 'utf-8'
+        parser = lxml.html.HTMLParser(encoding=encoding, remove_comments=True, remove_pis=True)
+        try:
+            document = lxml.html.document_fromstring(content, parser=parser)
+        except etree.ParserError:
+            return None
         
-        # Enhanced regatta keywords
-        regatta_keywords = [
-            'regata', 'copa', 'trofeo', 'campeonato', 'series', 'vuelta',
-            'memorial', 'challenge', 'open', 'master', 'junior', 'youth'
-        ]
+        # Drop scripts, styles and navigation/footer furniture but keep the
+        # text that follows them
+        etree.strip_elements(document, *self.noise_tags, with_tail=False)
+        return document
+
+    def document_text_lines(self, document: lxml.html.HtmlElement, club_info: Dict) -> List[str]:
+        """Get the text lines of a parsed page's main content"""
+        roots = [document]
+        content_xpath = club_info.get('content_xpath')
+        if content_xpath:
+            selected = [node for node in document.xpath(content_xpath) if isinstance(node, etree.ElementBase)]
+            if selected:
+                roots = selected
+            else:
+                logger.warning(f"Content selector matched nothing at {club_info['name']}, using whole page")
         
-        # Filter content
-        filtered_keywords = [
-            'resultado', 'results', 'clasificación', 'classification',
-            'inscripción', 'registration', 'noticias', 'news', 'archivo',
-            'archive', 'galería', 'gallery', 'contacto', 'contact'
-        ]
+        lines = []
+        for root in roots:
+            lines.extend(''.join(root.itertext()).split('\n'))
+        return lines
+
+    def content_fingerprint(self, lines: Iterable[str], club_info: Dict, links: Iterable[str] = ()) -> str:
+        """Hash a page's normalized main-content text (plus any links its extractor reads)"""
+        digest = hashlib.sha256(f"{FINGERPRINT_SCHEME}\n".encode('utf-8'))
+        for _ in self.fingerprint_lines(lines, club_info, digest):
+            pass
+        for link in links:
+            digest.update(b'\x00' + link.encode('utf-8'))
+        return digest.hexdigest()
+
+    def fingerprint_lines(self, lines: Iterable[str], club_info: Dict, digest) -> Iterator[str]:
+        """Pass text lines through, adding their normalized text to a fingerprint digest"""
+        ignore = [re.compile(pattern) for pattern in club_info.get('fingerprint_ignore', [])]
+        for line in lines:
+            normalized = ' '.join(self.volatile_text_regex.sub('', line).split())
+            if normalized and not any(pattern.search(normalized) for pattern in ignore):
+                digest.update(normalized.encode('utf-8') + b'\n')
+            yield line
+
+    def extract_text_lines(self, content: bytes, club_info: Dict) -> List[str]:
+        """Parse a page with lxml and return the text lines of its main content"""
+        document = self.parse_document(content)
+        return self.document_text_lines(document, club_info) if document is not None else []
+
+    def sniff_encoding(self, head: bytes) -> str:
+        """Detect a page's encoding from its first bytes"""
+        # A multi-byte character cut off at the end would make valid UTF-8 look invalid
+        end = len(head)
+        while end > 0 and len(head) - end < 3 and head[end - 1] & 0xC0 == 0x80:
+            end -= 1
+        if end > 0 and head[end - 1] >= 0xC0:
+            end -= 1
+        return UnicodeDammit(head[:end], is_html=True).original_encoding or 'utf-8'
+
+    def stream_text_lines(self, chunks: Iterable[bytes], target: TextLineTarget,
+                          sniff_bytes: int = 64 * 1024) -> Iterator[str]:
+        """Feed body chunks to an incremental parser, yielding text lines as they complete"""
+        parser = None
+        head = b''
+        for chunk in chunks:
+            if parser is None:
+                # Hold back the first few KB so the encoding is sniffed from more than a packet
+                head += chunk
+                if len(head) < sniff_bytes:
+                    continue
+                chunk, head = head, b''
+                parser = etree.HTMLParser(target=target, encoding=self.sniff_encoding(chunk),
+                                          remove_comments=True, remove_pis=True)
+            parser.feed(chunk)
+            while target.lines:
+                yield target.lines.popleft()
         
-        # Date patterns
-        date_patterns = [
-            r'\bdel\s+\d{1,2}\s+de\s+\w+\s+al\s+\d{1,2}\s+de\s+\w+\s+de\s+\d{4}\b',
-            r'\bdel\s+\d{1,2}\s+al\s+\d{1,2}\s+de\s+\w+\s+de\s+\d{4}\b',
-            r'\b\d{1,2}\s+de\s+\w+\s+de\s+\d{4}\b',
-            r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'
-        ]
+        if parser is None:
+            if not head:
+                return
+            parser = etree.HTMLParser(target=target, encoding=self.sniff_encoding(head),
+                                      remove_comments=True, remove_pis=True)
+            parser.feed(head)
+        try:
+            parser.close()
+        except etree.LxmlError:
+            pass
+        while target.lines:
+            yield target.lines.popleft()
+
+    def register_extractor(self, name: str, extractor, url_pattern: Optional[str] = None):
+        """Register a specialized extractor, optionally selected by URL pattern
+
+        With extract_workers the extractor is sent to the worker processes, so
+        it must be picklable, i.e. a module-level function.
+        """
+        if self.extract_workers:
+            self.check_extract_workers([(name, extractor, url_pattern)])
+        self.extractors[name] = extractor
+        if url_pattern:
+            self.extractor_patterns.append((re.compile(url_pattern), name))
+        self.registered_extractors.append((name, extractor, url_pattern))
+
+    def select_extractor(self, club_info: Dict) -> Optional[str]:
+        """Pick the specialized extractor for a club: explicit 'extractor' first, then URL patterns"""
+        if club_info.get('extractor'):
+            return club_info['extractor'] if club_info['extractor'] in self.extractors else None
+        for pattern, name in self.extractor_patterns:
+            if pattern.search(club_info['url']):
+                return name
+        return None
+
+    def extract_document_regattas(self, document: lxml.html.HtmlElement, club_info: Dict,
+                                  lines: Optional[List[str]] = None):
+        """Extract regattas from a parsed page, returning (regattas, extractor name, lines scanned)"""
+        name = self.select_extractor(club_info)
+        if name:
+            regattas = self.extractors[name](document, club_info)
+            if regattas is not None:
+                return regattas, name, 0
+            logger.info(f"{name} extractor found no listing at {club_info['name']}, using text heuristic")
         
-        # Split text into manageable chunks
-        lines = text.split('\n')
+        if lines is None:
+            lines = self.document_text_lines(document, club_info)
+        return self.extract_regatta_lines(lines, club_info), 'generic', len(lines)
+
+    def element_text(self, element: lxml.html.HtmlElement) -> str:
+        """Get an element's text with its text nodes separated by single spaces"""
+        return ' '.join(' '.join(element.itertext()).split())
+
+    def extract_races_platform(self, document: lxml.html.HtmlElement, club_info: Dict) -> Optional[List[Regatta]]:
+        """Read the race listing of the /default/races regatta platform"""
+        candidates = []
+        seen_links = set()
+        found_listing = False
         
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if len(line) < 10:
+        for link in document.iter('a'):
+            href = link.get('href') or ''
+            if not self.race_link_regex.search(href):
                 continue
-            
-            # Check if line contains regatta keywords
-            has_regatta_keyword = any(keyword in line.lower() for keyword in regatta_keywords)
-            
-            # Skip filtered content
-            if any(keyword in line.lower() for keyword in filtered_keywords):
+            race_url = urljoin(club_info['url'], href)
+            if race_url in seen_links:
                 continue
+            seen_links.add(race_url)
             
-            # Look for dates in current and next few lines
-            dates_found = []
-            details_text = ""
+            # The listing entry is the closest ancestor that also carries a date,
+            # without growing into a neighbouring entry
+            item, dates = link, []
+            for _ in range(5):
+                dates = self.find_dates(self.element_text(item))
+                if dates or item.getparent() is None:
+                    break
+                parent = item.getparent()
+                race_links = {a.get('href') for a in parent.iter('a') if self.race_link_regex.search(a.get('href') or '')}
+                if len(race_links) > 1:
+                    break
+                item = parent
+            if not dates:
+                continue
+            found_listing = True
             
-            # Check current line and next 2 lines for dates and details
-            for j in range(min(3, len(lines) - i)):
-                check_line = lines[i + j].strip()
-                
-                for pattern in date_patterns:
-                    matches = re.findall(pattern, check_line, re.IGNORECASE)
-                    dates_found.extend(matches)
-                
-                if j > 0:  # Collect details from subsequent lines
-                    details_text += " " + check_line
+            valid_dates = self.filter_future_dates(dates)
+            if not valid_dates:
+                continue
             
-            # Filter dates to only include future events
-            valid_dates = self.filter_future_dates(dates_found)
+            title = self.element_text(link)
+            if len(title) < 5:
+                # Icon or 'more' links: use the entry's heading instead
+                headings = item.xpath('.//h1|.//h2|.//h3|.//h4|.//h5|.//strong')
+                title = self.element_text(headings[0]) if headings else title
+            if not title:
+                continue
             
-            if has_regatta_keyword and valid_dates:
-                # Categorize the event
-                boat_type = self.categorize_boat_type(line + " " + details_text)
-                event_type = self.categorize_event_type(line, valid_dates[0], details_text)
-                
-                regatta = {
-                    'title': self.clean_title(line),
-                    'date': valid_dates[0],
-                    'details': details_text.strip()[:200],  # Limit details length
-                    'club': club_info['name'],
-                    'location': club_info['location'],
-                    'url': club_info['url'],
-                    'boat_type': boat_type,
-                    'event_type': event_type,
-                    'color': self.get_event_color(event_type),
-                    'boat_symbol': self.get_boat_symbol(boat_type)
-                }
-                regattas.append(regatta)
+            item_text = self.element_text(item)
+            details = ' '.join(item_text.replace(title, ' ', 1).split())
+            candidates.append((title, valid_dates[0], details, race_url))
         
-        return regattas
+        return self.build_regattas(candidates, club_info) if found_listing else None
+
+    def extract_regatta_lines(self, raw_lines: Iterable[str], club_info: Dict) -> List[Regatta]:
+        """Extract regatta information from text lines with categorization"""
+        return list(self.iter_regattas(raw_lines, club_info))
+
+    def iter_regattas(self, raw_lines: Iterable[str], club_info: Dict) -> Iterator[Regatta]:
+        """Yield each regatta, categorized, as soon as the lines that make it up are read"""
+        for title, date_str, details, url in self.iter_regatta_candidates(raw_lines):
+            regatta = self.build_regatta(title, date_str, details, url, club_info)
+            if regatta:
+                yield regatta
+
+    def iter_regatta_candidates(self, raw_lines: Iterable[str]) -> Iterator[Tuple[str, str, str, None]]:
+        """Yield (title, date, details, url) events from a stream of text lines, holding only a 3-line window"""
+        # Window entries are [line, dates]; each line is scanned for dates at
+        # most once, however many windows it falls into
+        window: deque = deque()
+        for raw_line in raw_lines:
+            window.append([raw_line.strip(), None])
+            if len(window) == 3:
+                candidate = self.window_candidate(window)
+                window.popleft()
+                if candidate:
+                    yield candidate
+        
+        # The last lines get shorter windows
+        while window:
+            candidate = self.window_candidate(window)
+            window.popleft()
+            if candidate:
+                yield candidate
+
+    def window_candidate(self, window: deque) -> Optional[Tuple[str, str, str, None]]:
+        """Read an event from the first line of a window, with the rest as look-ahead"""
+        line = window[0][0]
+        if len(line) < 10:
+            return None
+        
+        # Only lines with regatta keywords can produce an event
+        line_lower = line.lower()
+        if not self.regatta_keyword_regex.search(line_lower):
+            return None
+        
+        # Skip filtered content
+        if self.filtered_keyword_regex.search(line_lower):
+            return None
+        
+        # Look for dates in current and next 2 lines, details in the next 2
+        dates_found = []
+        for entry in window:
+            if entry[1] is None:
+                entry[1] = self.find_dates(entry[0])
+            dates_found.extend(entry[1])
+        details_text = "".join(" " + entry[0] for entry in islice(window, 1, None))
+        
+        # Filter dates to only include future events
+        valid_dates = self.filter_future_dates(dates_found)
+        if valid_dates:
+            return line, valid_dates[0], details_text, None
+        return None
+
+    def build_regattas(self, candidates: List[Tuple[str, str, str, Optional[str]]],
+                       club_info: Dict) -> List[Regatta]:
+        """Categorize a batch of (title, date, details, url) events and build their records"""
+        regattas = (self.build_regatta(title, date_str, details, url, club_info)
+                    for title, date_str, details, url in candidates)
+        return [regatta for regatta in regattas if regatta]
+
+    def build_regatta(self, title: str, date_str: str, details: str, url: Optional[str],
+                      club_info: Dict) -> Optional[Regatta]:
+        """Categorize one event and build its record, or None when its date cannot be read"""
+        # The built-in extractors only pass dates filter_future_dates has read,
+        # but registered ones need not
+        date_range = parse_date_range(date_str)
+        if not date_range:
+            logger.debug(f"Skipping {title!r} at {club_info['name']}: unreadable date {date_str!r}")
+            return None
+        start, end = date_range
+        (boat_type, _), (event_type, _) = self.classify_event((title, date_str, details))
+        return Regatta(
+            title=self.clean_title(title),
+            date=date_str,
+            start_date=start.isoformat(),
+            end_date=end.isoformat(),
+            details=details.strip()[:200],  # Limit details length
+            club=club_info['name'],
+            location=club_info['location'],
+            url=url or club_info['url'],
+            boat_type=boat_type,
+            event_type=event_type
+        )
 
     def filter_future_dates(self, dates: List[str]) -> List[str]:
-        """Filter out past dates, only return future events"""
+        """Filter out past dates, only return events that have not finished yet"""
+        today = self.today or date.today()
         future_dates = []
-        current_date = datetime.now()
         
         for date_str in dates:
-            try:
-                # Extract year from date string
-                year_match = re.search(r'\b(202[5-9]|20[3-9]\d)\b', date_str)
-                if year_match:
-                    year = int(year_match.group(1))
-                    if year >= current_date.year:
-                        future_dates.append(date_str)
-            except:
-                continue
+            date_range = parse_date_range(date_str)
+            if date_range and date_range[1] >= today:
+                future_dates.append(date_str)
         
         return future_dates
 
@@ -355,294 +2623,1062 @@ class SmartRegattaScraper:
         title = re.sub(r'[^\w\s\-\.\/\(\)áéíóúñçüÁÉÍÓÚÑÇÜ]', '', title)
         return title.strip()
 
-    def translate_text(self, text: str, target_lang: str = 'en') -> str:
-        """Simple translation with fallback"""
-        try:
-            # First apply manual translations for sailing terms
-            sailing_terms = {
-                'regata': 'regatta', 'regatas': 'regattas', 'vela': 'sailing',
-                'competición': 'competition', 'campeonato': 'championship',
-                'trofeo': 'trophy', 'copa': 'cup', 'crucero': 'cruising',
-                'optimist': 'optimist', 'optimista': 'optimist', 'dragón': 'dragon'
-            }
-            
-            translated_text = text
-            for spanish, english in sailing_terms.items():
-                translated_text = re.sub(r'\b' + spanish + r'\b', english, translated_text, flags=re.IGNORECASE)
-            
-            # Simple Google Translate API call with short timeout
-            url = 'https://translate.googleapis.com/translate_a/single'
-            params = {
-                'client': 'gtx',
-                'sl': 'auto',
-                'tl': target_lang,
-                'dt': 't',
-                'q': translated_text
-            }
-            
-            response = requests.get(url, params=params, timeout=3)
-            if response.status_code == 200:
-                result = response.json()
-                if result and result[0]:
-                    return result[0][0][0]
-            
-        except Exception as e:
-            logger.warning(f"Translation failed, using original text: {e}")
-        
-        # Fallback: return original text if translation fails
-        return text
-
     def format_date_standard(self, date_str: str) -> str:
-        """Convert Spanish date format to standard DD/MM/YYYY format"""
-        try:
-            # Spanish month names to numbers
-            spanish_months = {
-                'enero': '01', 'febrero': '02', 'marzo': '03', 'abril': '04',
-                'mayo': '05', 'junio': '06', 'julio': '07', 'agosto': '08',
-                'septiembre': '09', 'octubre': '10', 'noviembre': '11', 'diciembre': '12'
-            }
-            
-            # Handle multi-day events (del X de mes al Y de mes de año)
-            multi_day_pattern = r'del\s+(\d{1,2})\s+de\s+(\w+)\s+al\s+(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})'
-            match = re.search(multi_day_pattern, date_str, re.IGNORECASE)
-            if match:
-                start_day, start_month, end_day, end_month, year = match.groups()
-                start_month_num = spanish_months.get(start_month.lower(), '01')
-                end_month_num = spanish_months.get(end_month.lower(), '12')
-                return f"{start_day.zfill(2)}/{start_month_num}/{year} - {end_day.zfill(2)}/{end_month_num}/{year}"
-            
-            # Handle single month range (del X al Y de mes de año)
-            single_month_pattern = r'del\s+(\d{1,2})\s+al\s+(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})'
-            match = re.search(single_month_pattern, date_str, re.IGNORECASE)
-            if match:
-                start_day, end_day, month, year = match.groups()
-                month_num = spanish_months.get(month.lower(), '01')
-                return f"{start_day.zfill(2)}/{month_num}/{year} - {end_day.zfill(2)}/{month_num}/{year}"
-            
-            # Handle single date (X de mes de año)
-            single_date_pattern = r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})'
-            match = re.search(single_date_pattern, date_str, re.IGNORECASE)
-            if match:
-                day, month, year = match.groups()
-                month_num = spanish_months.get(month.lower(), '01')
-                return f"{day.zfill(2)}/{month_num}/{year}"
-            
-            # Handle already formatted dates (DD/MM/YYYY)
-            if re.match(r'\d{1,2}[/-]\d{1,2}[/-]\d{4}', date_str):
-                return date_str.replace('-', '/')
-            
+        """Convert a date string to standard DD/MM/YYYY (or DD/MM/YYYY - DD/MM/YYYY) format"""
+        date_range = parse_date_range(date_str)
+        if not date_range:
             # Fallback: return original if no pattern matches
             return date_str
-            
-        except Exception as e:
-            logger.warning(f"Date formatting failed for '{date_str}': {e}")
-            return date_str
+        
+        start, end = date_range
+        if start == end:
+            return start.strftime('%d/%m/%Y')
+        return f"{start.strftime('%d/%m/%Y')} - {end.strftime('%d/%m/%Y')}"
+
+    def format_telegram_messages(self, new_regattas: List[Regatta],
+                                 max_length: int = 4096) -> List[Tuple[str, List[int]]]:
+        """Format new regattas as Telegram messages under max_length, with clean visual design and emojis
 
-    def format_telegram_message(self, new_regattas: List[Dict]) -> str:
-        """Format new regattas for Telegram posting with clean visual design and emojis"""
+        Returns (message, indices of the regattas it lists) pairs; every event
+        is listed in exactly one message.
+        """
         if not new_regattas:
-            return ""
+            return []
         
-        # Sort events by club and date for better organization
-        sorted_regattas = sorted(new_regattas, key=lambda x: (x['club'], x['date']))
-        
-        message_parts = [
+        header = [
             "⛵ Balearic Sailing Regattas ⛵",
             f"📅 **[View Full Calendar]({self.get_calendar_url()})**",
             ""
         ]
+        updated = datetime.now().strftime('%d/%m/%Y %H:%M UTC')
         
-        # Track message length to stay under 4096 characters
-        current_length = len("\n".join(message_parts))
-        max_length = 3500  # Leave buffer for footer
+        def footer(part: str) -> List[str]:
+            return [
+                "---",
+                f"Found {len(new_regattas)} NEW events{part}",
+                "",
+                "▲ Yachts | ● Dinghies | ■ Mixed Fleet",
+                "🔵 Single Day | 🟢 Multi-Day | 🔴 Series",
+                f"📅 Updated: {updated}"
+            ]
         
-        # Group by club for clean presentation
-        current_club = None
-        event_count = 0
+        # Telegram counts UTF-16 code units, so emojis count double
+        def length(lines: List[str]) -> int:
+            return len("\n".join(lines).encode('utf-16-le')) // 2
         
-        for regatta in sorted_regattas:
-            if current_length > max_length:
-                break
-                
-            event_count += 1
-            
-            # Add club separator if new club
-            if regatta['club'] != current_club:
-                if current_club is not None:  # Add separator between clubs
-                    message_parts.append("---")
-                current_club = regatta['club']
+        # Room for the longest footer a message can get
+        reserved = length(footer(" (part 999/999)")) + 1
+        
+        # Sort events by club and date for better organization
+        order = sorted(range(len(new_regattas)),
+                       key=lambda i: (new_regattas[i].club, new_regattas[i].start_date or new_regattas[i].date))
+        
+        messages = []
+        message_parts, indices = list(header), []
+        current_club = None
+        for event_count, index in enumerate(order, 1):
+            regatta = new_regattas[index]
             
             # Get symbols and names for categorization
-            boat_symbol = regatta['boat_symbol']
+            boat_symbol = regatta.boat_symbol
             boat_type_name = {
-                'yachts': 'Yachts',
-                'dinghies': 'Dinghies', 
-                'mixed': 'Mixed'
-            }.get(regatta['boat_type'], 'Mixed')
+                BoatType.YACHTS: 'Yachts',
+                BoatType.DINGHIES: 'Dinghies', 
+                BoatType.MIXED: 'Mixed'
+            }[regatta.boat_type]
             
             # Get event type with colored emoji
             event_type_display = {
-                'single_day': '🔵 Single Day',
-                'multi_day': '🟢 Multi-Day',
-                'series': '🔴 Series'
-            }.get(regatta['event_type'], '🔵 Single Day')
+                EventType.SINGLE_DAY: '🔵 Single Day',
+                EventType.MULTI_DAY: '🟢 Multi-Day',
+                EventType.SERIES: '🔴 Series'
+            }[regatta.event_type]
             
             # Format date to standard format
-            formatted_date = self.format_date_standard(regatta['date'])
+            formatted_date = self.format_date_standard(regatta.date)
             
             # Format event entry with emojis
             event_entry = [
-                f"{event_count}. {regatta['club']} {boat_symbol} {boat_type_name}",
-                f"🏆 {regatta['title']}",
+                f"{event_count}. {regatta.club} {boat_symbol} {boat_type_name}",
+                f"🏆 {regatta.title}",
+                *[f"🌐 {title}" for title in regatta.translations.values()],
                 f"📅 {formatted_date}",
                 f"{event_type_display}",
-                f"🔗 [More info]({regatta['url']})",
+                f"🔗 [More info]({regatta.url})",
                 ""
             ]
             
-            # Check if we can fit this event
-            entry_length = len("\n".join(event_entry))
-            if current_length + entry_length < max_length:
-                message_parts.extend(event_entry)
-                current_length += entry_length
-            else:
-                break
-        
-        # Add footer with legend
-        footer = [
-            "---",
-            f"Found {len(new_regattas)} NEW events",
-            "",
-            "▲ Yachts | ● Dinghies | ■ Mixed Fleet",
-            "🔵 Single Day | 🟢 Multi-Day | 🔴 Series",
-            f"📅 Updated: {datetime.now().strftime('%d/%m/%Y %H:%M UTC')}"
-        ]
-        
-        message_parts.extend(footer)
+            # Add club separator if new club
+            separator = ["---"] if indices and regatta.club != current_club else []
+            if indices and length(message_parts + separator + event_entry) + reserved > max_length:
+                # Full: this event starts the next message
+                messages.append((message_parts, indices))
+                message_parts, indices, separator = list(header), [], []
+            message_parts.extend(separator + event_entry)
+            indices.append(index)
+            current_club = regatta.club
+        messages.append((message_parts, indices))
         
-        return "\n".join(message_parts)
+        formatted = []
+        for part, (message_parts, indices) in enumerate(messages, 1):
+            suffix = f" (part {part}/{len(messages)})" if len(messages) > 1 else ""
+            message = "\n".join(message_parts + footer(suffix))
+            if length([message]) > max_length:
+                # A single event too long for any message
+                message = message.encode('utf-16-le')[:2 * (max_length - 1)].decode('utf-16-le', 'ignore') + "…"
+            formatted.append((message, indices))
+        return formatted
 
     def get_calendar_url(self) -> str:
         """Get the calendar URL"""
         return "https://abandm010.github.io/balearic-regatta-scraper"
 
-    def send_telegram_message(self, message: str):
-        """Send message to Telegram"""
-        if not self.telegram_bot_token or not self.telegram_chat_id:
+    def telegram_enabled(self) -> bool:
+        return bool(self.telegram_bot_token and self.telegram_chat_id)
+
+    def send_telegram_message(self, message: str) -> Delivery:
+        """Send message to Telegram, returning whether it was accepted, refused for good or may be retried"""
+        if not self.telegram_enabled():
             logger.warning("Telegram credentials not provided")
-            return
+            return Delivery.RETRY
+        if self.telegram is None:
+            self.telegram = TelegramClient(self.session, self.telegram_bot_token, self.telegram_chat_id,
+                                           api_base=self.telegram_api)
         
         try:
-            url = f"https://api.telegram.org/bot{self.telegram_bot_token}/sendMessage"
-            data = {
-                'chat_id': self.telegram_chat_id,
-                'text': message,
-                'parse_mode': 'Markdown'
-            }
-            
-            response = requests.post(url, data=data, timeout=10)
-            if response.status_code == 200:
+            with self.metrics.stage('telegram'):
+                delivery = self.telegram.send(message)
+            if delivery == Delivery.SENT:
                 logger.info("✅ Telegram message sent successfully")
-            else:
-                logger.error(f"❌ Failed to send Telegram message: {response.status_code}")
-                
+            return delivery
         except Exception as e:
             logger.error(f"❌ Error sending Telegram message: {e}")
+            return Delivery.RETRY
+
+    def deliver_notifications(self):
+        """Send queued notifications, marking each delivered only once Telegram accepted it
+
+        New events queued by earlier runs that could not be delivered go out
+        together with this run's, split into as many messages as needed.
+        Anything not sent stays queued for the next run, unless Telegram
+        refused it for good or it failed max_notification_attempts times: it
+        is then dead-lettered, so it cannot hold up the messages behind it.
+        """
+        if not self.telegram_enabled():
+            return
+        history = self.get_event_history()
+        exhausted = history.dead_letter_exhausted(self.max_notification_attempts)
+        if exhausted:
+            logger.error(f"📮 Gave up on {exhausted} notifications after "
+                         f"{self.max_notification_attempts} failed attempts")
+        pending = history.pending_notifications()
+        if not pending:
+            return
+        
+        event_ids = [id_ for id_, kind, _ in pending if kind == 'event']
+        events = [Regatta.from_dict(json.loads(payload)) for _, kind, payload in pending if kind == 'event']
+        outgoing = [(message, [event_ids[i] for i in indices])
+                    for message, indices in self.format_telegram_messages(events)]
+        outgoing.extend((payload, [id_]) for id_, kind, payload in pending if kind == 'message')
+        
+        for position, (message, ids) in enumerate(outgoing):
+            delivery = self.send_telegram_message(message)
+            if delivery == Delivery.SENT:
+                history.mark_delivered(ids)
+                continue
+            history.record_attempt(ids)
+            if delivery == Delivery.REJECTED:
+                logger.error(f"📮 Telegram refused a message for good - dead-lettered {len(ids)} notifications")
+                history.dead_letter(ids)
+                continue
+            logger.warning(f"📮 {len(outgoing) - position} Telegram messages stay queued for the next run")
+            return
 
-    def save_regattas_json(self, regattas: List[Dict], filename: str = 'regattas.json'):
-        """Save all regattas to JSON file for calendar"""
+    def save_regattas_json(self, regattas: List[Regatta], filename: Optional[str] = None):
+        """Save all regattas to JSON file for calendar, leaving the file alone if its content is the same"""
+        filename = filename or self.output_file
+        records = [regatta.to_dict(self.compact_output) for regatta in self.output_order(regattas)]
+        if self.deterministic_output:
+            content = dump_record_lines(records)
+        else:
+            content = json.dumps(records, indent=2, ensure_ascii=False)
+        data = content.encode('utf-8')
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(regattas, f, indent=2, ensure_ascii=False)
+            with open(filename, 'rb') as f:
+                unchanged = f.read() == data
+        except OSError:
+            unchanged = False
+        if unchanged:
+            logger.info(f"✅ {filename} already up to date ({len(regattas)} regattas)")
+            return
+        try:
+            os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+            with open(filename, 'wb') as f:
+                f.write(data)
             logger.info(f"✅ Saved {len(regattas)} regattas to {filename}")
         except Exception as e:
             logger.error(f"❌ Error saving regattas: {e}")
 
-    def run(self):
-        """Main scraping function"""
+    def save_calendar_index(self, regattas: List[Regatta]):
+        """Update the per-month calendar files the page renders from"""
+        try:
+            changed = self.calendar_index.update(self.output_order(regattas))
+            if changed:
+                logger.info(f"📅 Updated calendar months: {', '.join(changed)}")
+        except Exception as e:
+            logger.error(f"❌ Error saving calendar index: {e}")
+
+    def event_months(self, regattas: List[Regatta]) -> List[str]:
+        """Get the sorted YYYY-MM months the regattas' date ranges cover"""
+        months = set()
+        for regatta in regattas:
+            date_range = parse_date_range(regatta.date)
+            if not date_range:
+                continue
+            year, month = date_range[0].year, date_range[0].month
+            while (year, month) <= (date_range[1].year, date_range[1].month):
+                months.add(f"{year}-{month:02d}")
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return sorted(months)
+
+    def save_club_shards(self, club_results: List[List[Regatta]], unique_regattas: List[Regatta],
+                         filename: Optional[str] = None, refreshed: Optional[Set[str]] = None,
+                         dry_run: bool = False) -> Dict[str, Dict[str, List[Regatta]]]:
+        """Update per-club shards and regenerate the combined file only on change
+
+        Returns the events added to and removed from each club's shard, for
+        the clubs that have any. Only the refreshed clubs' shards are compared
+        and written (all when None); with dry_run nothing is written.
+        """
+        filename = filename or self.output_file
+        changed_clubs = []
+        diffs = {}
+        for club_info, club_regattas in zip(self.clubs, club_results):
+            name = club_info['name']
+            if refreshed is not None and name not in refreshed:
+                continue
+            club_regattas = self.deduplicate_regattas(club_regattas)
+            fingerprint = self.metrics.club(name).get('fingerprint')
+            if not fingerprint or fingerprint != self.stored_fingerprint(name):
+                diff = self.diff_club_events(name, club_regattas)
+                if diff['added'] or diff['removed']:
+                    diffs[name] = diff
+            if dry_run:
+                continue
+            records = [regatta.to_dict(self.compact_output) for regatta in self.output_order(club_regattas)]
+            if self.shard_store.update(name, records, self.event_months(club_regattas)):
+                changed_clubs.append(name)
+            self.get_event_history().set_club_fingerprint(name, fingerprint, self.shard_store.shard_hash(name))
+        if dry_run:
+            return diffs
+        self.shard_store.save_manifest()
+        
+        if changed_clubs or not os.path.exists(filename):
+            logger.info(f"Changed clubs: {', '.join(changed_clubs) or 'none'}")
+            self.save_regattas_json(unique_regattas, filename)
+        else:
+            logger.info(f"✅ No club results changed - keeping {filename}")
+        return diffs
+
+    def stored_fingerprint(self, club_name: str) -> Optional[str]:
+        """Get the page fingerprint a club's stored shard was extracted from
+
+        Kept in the event history, whose copy of the shard hash guards against
+        a shard changed by another run (e.g. a merge).
+        """
+        if self.event_history is None or self.shard_store is None:
+            return None
+        return self.event_history.club_fingerprint(club_name, self.shard_store.shard_hash(club_name))
+
+    def diff_club_events(self, club_name: str, regattas: List[Regatta]) -> Dict[str, List[Regatta]]:
+        """Compare a club's events with its stored shard by event signature"""
+        previous = [Regatta.from_dict(record) for record in self.shard_store.load(club_name) or []]
+        previous_signatures = {self.create_event_signature(regatta) for regatta in previous}
+        signatures = {self.create_event_signature(regatta) for regatta in regattas}
+        return {
+            'added': [r for r in regattas if self.create_event_signature(r) not in previous_signatures],
+            'removed': [r for r in previous if self.create_event_signature(r) not in signatures]
+        }
+
+    def format_club_diffs(self, diffs: Dict[str, Dict[str, List[Regatta]]]) -> str:
+        """Format the per-club added/removed events for the terminal"""
+        if not diffs:
+            return "No club's events changed"
+        lines = []
+        for club_name, diff in diffs.items():
+            lines.append(f"{club_name}: +{len(diff['added'])} -{len(diff['removed'])}")
+            lines.extend(f"  + {regatta.title} ({regatta.date})" for regatta in diff['added'])
+            lines.extend(f"  - {regatta.title} ({regatta.date})" for regatta in diff['removed'])
+        return '\n'.join(lines)
+
+    def is_near_duplicate(self, title: str, details: str, same_club: bool,
+                          other_title: str, other_details: str) -> bool:
+        """Decide whether two events on the same date are the same event"""
+        if title == other_title:
+            return True
+        
+        # A detail line picked up as its own event (same club only)
+        if same_club and ((title and title in other_details) or (other_title and other_title in details)):
+            return True
+        
+        # One title extends the other, e.g. an edition number or sponsor
+        words, other_words = set(title.split()), set(other_title.split())
+        if min(len(words), len(other_words)) >= 3 and (words <= other_words or other_words <= words):
+            return True
+        
+        matcher = SequenceMatcher(None, title, other_title)
+        return matcher.quick_ratio() >= self.title_similarity and matcher.ratio() >= self.title_similarity
+
+    def deduplicate_regattas(self, regattas: List[Regatta]) -> List[Regatta]:
+        """Remove duplicate and near-duplicate events, keeping the first occurrence"""
+        unique_regattas = []
+        
+        # Events are only compared within their date bucket, so the cost stays
+        # close to linear instead of comparing every pair
+        buckets: Dict[str, List[tuple]] = {}
+        
+        for regatta in regattas:
+            title = self.normalize_title(regatta.title)
+            details = self.normalize_title(regatta.details)
+            club = regatta.club
+            bucket = buckets.setdefault(self.event_date_key(regatta.date), [])
+            
+            if any(self.is_near_duplicate(title, details, club == other_club, other_title, other_details)
+                   for other_title, other_details, other_club in bucket):
+                continue
+            
+            bucket.append((title, details, club))
+            unique_regattas.append(regatta)
+        
+        return unique_regattas
+
+    def run(self, clubs: Optional[List[Dict]] = None, dry_run: bool = False):
+        """Main scraping function
+
+        clubs limits the scrape to some of self.clubs; the others keep their
+        stored results. With dry_run nothing is sent and no output or state
+        is written (HTTP cache, circuit breaker, archive), so the next run
+        behaves as if this one never happened; only fetched translations are
+        still cached. self.club_diffs holds what would have changed.
+        """
         logger.info("🚀 Starting Balearic Sailing Regatta Scraper...")
+        self.metrics = RunMetrics()
+        self.dry_run = dry_run
         
-        all_regattas = []
+        # Scrape the clubs (results come back in club order)
+        clubs = self.clubs if clubs is None else clubs
+        with self.metrics.stage('scrape'):
+            scraped = dict(zip((club_info['name'] for club_info in clubs), self.scrape_all_clubs(clubs)))
         
-        # Scrape all clubs
-        for club_info in self.clubs:
-            club_regattas = self.scrape_club_regattas(club_info)
+        # An offline run would only evict what it replayed from
+        if self.http_cache and not self.offline and not dry_run:
+            self.http_cache.save()
+        if self.circuit_breaker and not dry_run:
+            self.circuit_breaker.save()
+        
+        club_results = [scraped[club_info['name']] if club_info['name'] in scraped
+                        else self.stored_regattas(club_info['name']) or [] for club_info in self.clubs]
+        self.process_results(club_results, refreshed=None if clubs is self.clubs else set(scraped),
+                             dry_run=dry_run)
+        
+        logger.info(f"⏱️ Scrape {self.metrics.stage_total_ms('scrape') / 1000:.1f}s, "
+                    f"parse {self.metrics.stage_total_ms('parse') / 1000:.2f}s, "
+                    f"extract {self.metrics.stage_total_ms('extract') / 1000:.2f}s")
+        logger.info("🏁 Scraper completed successfully!")
+
+    def process_results(self, club_results: List[List[Regatta]], alert_if_empty: bool = True,
+                        refreshed: Optional[Set[str]] = None, dry_run: bool = False) -> List[Regatta]:
+        """Deduplicate, translate, save and notify about every club's results (in self.clubs order)
+
+        refreshed names the clubs whose results are new (all when None); the
+        others are their stored results and are not saved again. With dry_run
+        only self.club_diffs is updated.
+        """
+        all_regattas = []
+        for club_regattas in club_results:
             all_regattas.extend(club_regattas)
-            time.sleep(1)  # Be respectful to servers
         
         # Remove duplicates
-        unique_regattas = []
-        seen_signatures = set()
-        
-        for regatta in all_regattas:
-            signature = self.create_event_signature(regatta)
-            if signature not in seen_signatures:
-                unique_regattas.append(regatta)
-                seen_signatures.add(signature)
+        with self.metrics.stage('dedup'):
+            unique_regattas = self.deduplicate_regattas(all_regattas)
+        with self.metrics.stage('translate'):
+            self.apply_translations(unique_regattas)
         
         logger.info(f"📊 SCRAPING SUMMARY:")
         logger.info(f"   Clubs processed: {len(self.clubs)}")
+        if refreshed is not None:
+            logger.info(f"   Clubs refreshed: {len(refreshed)}")
         logger.info(f"   Total regattas found: {len(unique_regattas)}")
         
-        # Categorize events
-        yachts = [r for r in unique_regattas if r['boat_type'] == 'yachts']
-        dinghies = [r for r in unique_regattas if r['boat_type'] == 'dinghies']
-        mixed = [r for r in unique_regattas if r['boat_type'] == 'mixed']
+        # Categorize events in a single pass
+        counts = Counter()
+        for regatta in unique_regattas:
+            counts[regatta.boat_type] += 1
+            counts[regatta.event_type] += 1
         
-        single_day = [r for r in unique_regattas if r['event_type'] == 'single_day']
-        multi_day = [r for r in unique_regattas if r['event_type'] == 'multi_day']
-        series = [r for r in unique_regattas if r['event_type'] == 'series']
+        logger.info(f"   Yachts: {counts[BoatType.YACHTS]}")
+        logger.info(f"   Dinghies: {counts[BoatType.DINGHIES]}")
+        logger.info(f"   Mixed: {counts[BoatType.MIXED]}")
+        logger.info(f"   Single day: {counts[EventType.SINGLE_DAY]}")
+        logger.info(f"   Multi-day: {counts[EventType.MULTI_DAY]}")
+        logger.info(f"   Series: {counts[EventType.SERIES]}")
         
-        logger.info(f"   Yachts: {len(yachts)}")
-        logger.info(f"   Dinghies: {len(dinghies)}")
-        logger.info(f"   Mixed: {len(mixed)}")
-        logger.info(f"   Single day: {len(single_day)}")
-        logger.info(f"   Multi-day: {len(multi_day)}")
-        logger.info(f"   Series: {len(series)}")
+        if dry_run:
+            self.club_diffs = self.save_club_shards(club_results, unique_regattas, refreshed=refreshed,
+                                                    dry_run=True) if self.shard_store else {}
+            logger.info("🧪 Dry run - nothing written or sent")
+            return unique_regattas
         
-        # Always save all regattas for calendar
-        self.save_regattas_json(unique_regattas)
+        # Save all regattas for calendar (only when some club's events changed)
+        added = None
+        with self.metrics.stage('persist'):
+            if self.shard_store:
+                self.club_diffs = self.save_club_shards(club_results, unique_regattas, refreshed=refreshed)
+                added = [regatta for diff in self.club_diffs.values() for regatta in diff['added']]
+            else:
+                self.save_regattas_json(unique_regattas)
+            if self.calendar_index:
+                self.save_calendar_index(unique_regattas)
         
-        # Check for new events
-        new_events = self.identify_new_events(unique_regattas)
+        # Check for new events (only those added to some club's results since last run)
+        with self.metrics.stage('history'):
+            new_events = self.identify_new_events(unique_regattas, added)
         
-        if new_events:
-            logger.info(f"🆕 Found {len(new_events)} new events - sending Telegram message")
-            message = self.format_telegram_message(new_events)
-            
-            if message:
-                self.send_telegram_message(message)
-            else:
-                logger.warning("⚠️ No message generated for new events")
+        if new_events and self.telegram_enabled():
+            # Queued together with the history update by identify_new_events
+            logger.info(f"🆕 Found {len(new_events)} new events - queued for Telegram")
+        elif new_events:
+            logger.warning(f"🆕 Found {len(new_events)} new events - Telegram credentials not provided")
         else:
             logger.info("✅ No new events found - skipping Telegram notification")
         
         # Add error notification if no events found at all
         if not unique_regattas:
             logger.error("❌ No regattas found from any club - possible scraper failure")
-            error_message = (
-                "⚠️ SCRAPER ALERT ⚠️\n"
-                "No sailing events found from any club.\n"
-                "This might indicate a problem with the scraper.\n"
-                f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}"
-            )
-            self.send_telegram_message(error_message)
+            if alert_if_empty and self.telegram_enabled():
+                error_message = (
+                    "⚠️ SCRAPER ALERT ⚠️\n"
+                    "No sailing events found from any club.\n"
+                    "This might indicate a problem with the scraper.\n"
+                    f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}"
+                )
+                self.get_event_history().enqueue_message(error_message)
         
-        logger.info("🏁 Scraper completed successfully!")
+        self.deliver_notifications()
+        return unique_regattas
 
-def main():
-    """Main function"""
-    # Get credentials from environment variables
+    def merge_shards(self, sources: List[ShardStore]) -> List[Regatta]:
+        """Merge the club shards written by separate partial runs into this scraper's outputs
+
+        Each club is taken from the last source that has it; clubs no source
+        has keep their stored results. Shards, the combined file, the calendar
+        and the event history are then updated (and new events notified) as
+        after a normal run.
+        """
+        self.metrics = RunMetrics()
+        names = {club_info['name'] for club_info in self.clubs}
+        merged = {}
+        for source in sources:
+            for name in source.manifest['shards']:
+                if name not in names:
+                    logger.warning(f"⚠️ Skipping {name} from {source.directory}: not in the club list")
+                    continue
+                records = source.load(name)
+                if records is not None:
+                    regattas = [Regatta.from_dict(record) for record in records]
+                    merged[name] = [r for r in regattas if self.filter_future_dates([r.date])]
+        logger.info(f"🔀 Merging {len(merged)} clubs from {len(sources)} shard directories")
+        
+        club_results = [merged[club_info['name']] if club_info['name'] in merged
+                        else self.stored_regattas(club_info['name']) or [] for club_info in self.clubs]
+        return self.process_results(club_results, refreshed=set(merged))
+
+    def replay_archive(self, run_ids: List[str]) -> Dict[str, List[Regatta]]:
+        """Extract archived runs again with the current rules, returning each run's deduplicated events
+
+        Nothing is fetched: every page comes from self.archive and is judged as
+        of the day its run fetched it. A page listed by several runs of one day
+        is extracted once, in the extraction worker processes when enabled.
+        """
+        self.metrics = RunMetrics()
+        clubs = {club_info['name']: club_info for club_info in self.clubs}
+        manifests = [self.archive.load_run(run_id) for run_id in run_ids]
+        run_pages = []
+        pages: Dict[Tuple[str, str, str, date], List[Regatta]] = {}
+        skipped = set()
+        for manifest in manifests:
+            day = date.fromisoformat(manifest['started'][:10])
+            keys = []
+            for page in manifest['pages']:
+                if page['club'] not in clubs:
+                    skipped.add(page['club'])
+                    continue
+                key = (page['hash'], page['url'], page['club'], day)
+                pages[key] = []
+                keys.append(key)
+            run_pages.append(keys)
+        for name in sorted(skipped):
+            logger.warning(f"⚠️ Skipping archived pages of {name}: not in the club list")
+        logger.info(f"🗄️ Replaying {len(run_ids)} runs: {len(pages)} distinct pages")
+        
+        with self.metrics.stage('replay'):
+            if self.extract_workers:
+                pool = self.get_extract_pool()
+                futures = {key: pool.submit(replay_page_worker, self.archive.directory, key[0], key[1],
+                                            clubs[key[2]], key[3]) for key in pages}
+            for key in pages:
+                try:
+                    if self.extract_workers:
+                        pages[key] = [Regatta.from_dict(record) for record in futures[key].result()]
+                    else:
+                        pages[key] = self.replay_archived_page(key[0], key[1], clubs[key[2]], key[3])
+                except Exception as e:
+                    logger.error(f"Error replaying {key[2]} ({key[1]}, {key[0][:12]}): {e}")
+        
+        results = {}
+        for run_id, keys in zip(run_ids, run_pages):
+            # Clubs in club list order, each club's pages in crawl order, as in a live run
+            by_club: Dict[str, List[Regatta]] = {}
+            for key in keys:
+                by_club.setdefault(key[2], []).extend(pages[key])
+            regattas = [regatta for club_info in self.clubs for regatta in by_club.get(club_info['name'], [])]
+            results[run_id] = self.deduplicate_regattas(regattas)
+        logger.info(f"⏱️ Replay {self.metrics.stage_total_ms('replay') / 1000:.1f}s")
+        return results
+
+    def replay_archived_page(self, content_hash: str, url: str, club_info: Dict, day: date) -> List[Regatta]:
+        """Extract an archived page as of the day it was fetched"""
+        self.today = day
+        try:
+            return self.extract_page(self.archive.load(content_hash), url, club_info)['regattas']
+        finally:
+            self.today = None
+
+class ScrapeDaemon:
+    """Long-running mode: each club is scraped on its own refresh interval
+
+    The scraper (and its session's pooled connections), HTTP cache index,
+    circuit breaker and the latest results per club stay in memory between
+    cycles; state is checkpointed to disk every checkpoint_interval seconds
+    and on shutdown. A club's interval halves when its events change and
+    grows by half when they do not, and is capped at busy_interval while one
+    of its events is less than busy_days away.
+    """
+
+    def __init__(self, scraper: SmartRegattaScraper, base_interval: float = 6 * 3600,
+                 min_interval: float = 3600, max_interval: float = 48 * 3600,
+                 busy_interval: float = 3 * 3600, busy_days: int = 14,
+                 checkpoint_interval: float = 900, state_file: str = 'daemon_state.json',
+                 metrics_file: Optional[str] = None):
+        self.scraper = scraper
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.busy_interval = busy_interval
+        self.busy_days = busy_days
+        self.checkpoint_interval = checkpoint_interval
+        self.state_file = state_file
+        self.metrics_file = metrics_file
+        self.stop_event = threading.Event()
+        # Simulated seconds added to the clock when cycles run back to back
+        self.clock_offset = 0.0
+        self.cycles = 0
+        self.last_checkpoint = self.now()
+        self.had_events = True
+        self.schedule: Dict[str, Dict] = self.load_state()
+        self.results: Dict[str, List[Regatta]] = {}
+        self.signatures: Dict[str, Set[str]] = {}
+
+    def now(self) -> float:
+        return time.time() + self.clock_offset
+
+    def load_state(self) -> Dict[str, Dict]:
+        """Load each club's refresh interval and next due time"""
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading daemon state: {e}")
+        return {}
+
+    def save_state(self):
+        try:
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump(self.schedule, f, indent=2)
+        except Exception as e:
+            logger.error(f"Error saving daemon state: {e}")
+
+    def checkpoint(self):
+        """Write everything kept in memory between cycles to disk"""
+        if self.scraper.http_cache:
+            self.scraper.http_cache.save()
+        if self.scraper.circuit_breaker:
+            self.scraper.circuit_breaker.save()
+        self.save_state()
+        self.last_checkpoint = self.now()
+        logger.info(f"💾 Daemon checkpoint after {self.cycles} cycles")
+
+    def seed(self):
+        """Start from the stored results of clubs that are not due yet"""
+        now = self.now()
+        for club_info in self.scraper.clubs:
+            name = club_info['name']
+            entry = self.schedule.setdefault(name, {'interval': self.base_interval, 'due': now})
+            regattas = self.scraper.stored_regattas(name)
+            if regattas is None:
+                # Nothing to show for this club until it is scraped
+                entry['due'] = min(entry['due'], now)
+                continue
+            self.results[name] = regattas
+            self.signatures[name] = {self.scraper.create_event_signature(r) for r in self.results[name]}
+
+    def is_busy(self, regattas: List[Regatta]) -> bool:
+        """Whether any of the events is on now or starts within busy_days"""
+        today = date.fromtimestamp(self.now())
+        horizon = today + timedelta(days=self.busy_days)
+        for regatta in regattas:
+            date_range = parse_date_range(regatta.date)
+            if date_range and date_range[0] <= horizon and date_range[1] >= today:
+                return True
+        return False
+
+    def reschedule(self, club_info: Dict, regattas: List[Regatta], now: float):
+        """Set a club's next refresh from whether its events changed and how soon they are"""
+        name = club_info['name']
+        entry = self.schedule[name]
+        club_metrics = self.scraper.metrics.club(name)
+        if 'fallback' in club_metrics:
+            # Failed, skipped or out of time: try again at the same pace
+            interval = entry['interval']
+        else:
+            signatures = {self.scraper.create_event_signature(r) for r in regattas}
+            previous = self.signatures.get(name)
+            self.signatures[name] = signatures
+            if previous is None:
+                interval = entry['interval']
+            elif signatures != previous:
+                interval = entry['interval'] / 2
+            else:
+                interval = entry['interval'] * 1.5
+        if self.is_busy(regattas):
+            interval = min(interval, self.busy_interval)
+        entry['interval'] = max(self.min_interval, min(self.max_interval, interval))
+        entry['due'] = now + entry['interval']
+        club_metrics['refresh_interval'] = round(entry['interval'])
+
+    def run_cycle(self):
+        """Scrape the clubs that are due, then rebuild the outputs from every club's latest results"""
+        scraper = self.scraper
+        scraper.metrics = RunMetrics()
+        now = self.now()
+        due = [club_info for club_info in scraper.clubs if self.schedule[club_info['name']]['due'] <= now]
+        logger.info(f"🔄 Cycle {self.cycles + 1}: refreshing {len(due)} of {len(scraper.clubs)} clubs")
+        
+        with scraper.metrics.stage('scrape'):
+            club_results = scraper.scrape_all_clubs(due)
+        for club_info, regattas in zip(due, club_results):
+            # Scheduled from the cycle start so clubs on the same interval stay in step
+            self.reschedule(club_info, regattas, now)
+            self.results[club_info['name']] = regattas
+        
+        if due:
+            # Only alert on the transition to empty, not on every cycle after it
+            unique_regattas = scraper.process_results(
+                [self.results.get(club_info['name'], []) for club_info in scraper.clubs],
+                alert_if_empty=self.had_events)
+            self.had_events = bool(unique_regattas)
+        if self.metrics_file:
+            scraper.metrics.write(self.metrics_file)
+        self.cycles += 1
+
+    def next_due(self) -> float:
+        return min(self.schedule[club_info['name']]['due'] for club_info in self.scraper.clubs)
+
+    def stop(self, signum=None, frame=None):
+        """Finish the current cycle, checkpoint and exit"""
+        if not self.stop_event.is_set():
+            logger.info("🛑 Stopping after the current cycle (signal again to abort)")
+            self.stop_event.set()
+        else:
+            raise KeyboardInterrupt
+
+    def run(self, max_cycles: Optional[int] = None, sleep: bool = True):
+        """Run cycles until stopped, or for max_cycles
+
+        With sleep=False the clock jumps to the next due club instead of
+        waiting for it, so a test run covers days of schedule in seconds.
+        """
+        handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                handlers[signum] = signal.signal(signum, self.stop)
+        self.seed()
+        logger.info(f"🔁 Daemon started for {len(self.scraper.clubs)} clubs")
+        try:
+            while not self.stop_event.is_set():
+                self.run_cycle()
+                if max_cycles is not None and self.cycles >= max_cycles:
+                    break
+                if self.now() - self.last_checkpoint >= self.checkpoint_interval:
+                    self.checkpoint()
+                delay = max(0.0, self.next_due() - self.now())
+                logger.info(f"💤 Next refresh in {delay / 60:.0f} min")
+                if sleep:
+                    self.stop_event.wait(delay)
+                else:
+                    self.clock_offset += delay
+        finally:
+            self.checkpoint()
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+            logger.info(f"🏁 Daemon stopped after {self.cycles} cycles")
+
+# Scraper instance of an extraction worker process
+_extract_worker_scraper: Optional[SmartRegattaScraper] = None
+
+def init_extract_worker(scraper_class, registered_extractors: List[Tuple[str, object, Optional[str]]] = ()):
+    """Build the scraper an extraction worker process extracts with, with the parent's registered extractors"""
+    global _extract_worker_scraper
+    _extract_worker_scraper = scraper_class(clubs=[])
+    for name, extractor, url_pattern in registered_extractors:
+        _extract_worker_scraper.register_extractor(name, extractor, url_pattern)
+
+def extract_page_worker(content: bytes, url: str, club_info: Dict, previous_fingerprint: Optional[str]) -> Dict:
+    """extract_page in a worker process, with compact records and its stage timings for the parent"""
+    scraper = _extract_worker_scraper
+    scraper.metrics = RunMetrics()
+    page = scraper.extract_page(content, url, club_info, previous_fingerprint)
+    if page['regattas'] is not None:
+        page['regattas'] = [regatta.to_dict(compact=True) for regatta in page['regattas']]
+    page['stages'] = scraper.metrics.stages
+    return page
+
+def replay_page_worker(archive_dir: str, content_hash: str, url: str, club_info: Dict, day: date) -> List[Dict]:
+    """replay_archived_page in a worker process, with compact records for the parent"""
+    scraper = _extract_worker_scraper
+    if scraper.archive is None or scraper.archive.directory != archive_dir:
+        scraper.archive = PageArchive(archive_dir)
+    return [regatta.to_dict(compact=True) for regatta in
+            scraper.replay_archived_page(content_hash, url, club_info, day)]
+
+def run_with_profiling(scraper: SmartRegattaScraper, prefix: str, **run_options):
+    """Run the scraper under cProfile and tracemalloc and report the hot spots"""
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        scraper.run(**run_options)
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        profiler.dump_stats(f"{prefix}.pstats")
+        stats_output = io.StringIO()
+        pstats.Stats(profiler, stream=stats_output).sort_stats('cumulative').print_stats(20)
+        logger.info(f"🔬 Profile written to {prefix}.pstats\n{stats_output.getvalue()}")
+        
+        logger.info(f"🔬 Peak traced memory: {peak / 1024 / 1024:.1f} MiB, top allocation sites:")
+        for stat in snapshot.statistics('lineno')[:10]:
+            logger.info(f"   {stat}")
+
+COMMANDS = ('scrape', 'diff', 'notify', 'merge', 'replay', 'bench')
+
+def add_output_arguments(parser: argparse.ArgumentParser):
+    """Options for the club list and the files a run writes"""
+    parser.add_argument('--clubs-file', default=DEFAULT_CLUBS_FILE,
+                        help='JSON club list (default: clubs.json next to this script)')
+    parser.add_argument('--data-dir', default='data',
+                        help='directory for per-club result shards (default: data)')
+    parser.add_argument('--calendar-dir',
+                        help='directory for the per-month calendar files (default: DATA_DIR/calendar)')
+    parser.add_argument('--output', default='regattas.json',
+                        help='combined JSON file the calendar falls back to (default: regattas.json)')
+    parser.add_argument('--history-db', default='event_history.db',
+                        help='SQLite event history database (default: event_history.db)')
+    parser.add_argument('--compact', action='store_true',
+                        help='leave color and boat_symbol (derived from the types) out of the JSON output')
+    parser.add_argument('--deterministic', action='store_true',
+                        help='compact JSON output sorted by start date, club and title, one event per line')
+    parser.add_argument('--telegram-api', default=os.getenv('TELEGRAM_API_BASE', 'https://api.telegram.org'),
+                        help='Telegram Bot API base URL, e.g. a local stand-in server for testing')
+    parser.add_argument('--metrics-file', default='metrics.jsonl',
+                        help='JSON lines file run metrics are appended to (default: metrics.jsonl)')
+
+def add_scrape_arguments(parser: argparse.ArgumentParser):
+    """Options for which clubs are scraped and how"""
+    add_output_arguments(parser)
+    parser.add_argument('--clubs', nargs='+', metavar='CLUB',
+                        help='only scrape these clubs (names or file name slugs); the others keep their stored results')
+    parser.add_argument('--offline', action='store_true',
+                        help='replay pages from the HTTP cache instead of fetching them')
+    parser.add_argument('--archive-dir', default='archive',
+                        help='directory every fetched page and a manifest per run are archived in (default: archive)')
+    parser.add_argument('--no-archive', action='store_true',
+                        help='do not archive fetched pages')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('SCRAPER_MAX_WORKERS', '4')),
+                        help='number of clubs fetched concurrently (default: 4)')
+    parser.add_argument('--extract-workers', type=int, default=0, metavar='N',
+                        help='parse and extract pages in N worker processes while threads only download (default: off)')
+    parser.add_argument('--translate', metavar='LANG',
+                        help='add machine translated titles in LANG (e.g. en)')
+    parser.add_argument('--translate-budget', type=float, default=20.0,
+                        help='seconds allowed for translation before falling back (default: 20)')
+    parser.add_argument('--translation-cache', default='translation_cache.json',
+                        help='translated titles kept between runs (default: translation_cache.json)')
+    parser.add_argument('--translate-endpoint', default=TRANSLATE_ENDPOINT,
+                        help='translate endpoint to call, e.g. a local stand-in (default: the public one)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always download club pages in full')
+    parser.add_argument('--cache-dir', default='.http_cache',
+                        help='HTTP cache directory (default: .http_cache)')
+    parser.add_argument('--cache-max-age', type=float, default=7 * 24 * 3600,
+                        help='seconds before a cached page is fetched unconditionally')
+    parser.add_argument('--cache-max-bytes', type=int, default=50 * 1024 * 1024,
+                        help='maximum total size of cached page bodies')
+    parser.add_argument('--stream', action='store_true',
+                        help='extract pages while they download instead of parsing whole documents')
+    parser.add_argument('--retries', type=int, default=2,
+                        help='retries per page for connection errors, timeouts, 429 and 5xx (default: 2)')
+    parser.add_argument('--connect-timeout', type=float, default=4.0,
+                        help='seconds allowed to connect to a club site (default: 4)')
+    parser.add_argument('--read-timeout', type=float, default=10.0,
+                        help='seconds allowed between bytes of a response (default: 10)')
+    parser.add_argument('--deadline', type=float, metavar='SECONDS',
+                        help='stop scraping after SECONDS and reuse previous results for unfinished clubs')
+    parser.add_argument('--circuit-file', default='circuit_state.json',
+                        help='circuit breaker state file (default: circuit_state.json)')
+    parser.add_argument('--circuit-threshold', type=int, default=3,
+                        help='consecutive failed runs before a club is skipped (default: 3)')
+    parser.add_argument('--circuit-probe-interval', type=float, default=3 * 24 * 3600,
+                        help='seconds between probes of a skipped club (default: 3 days)')
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options; without a command, scrape is assumed"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in COMMANDS + ('-h', '--help'):
+        argv = ['scrape'] + argv
+    
+    parser = argparse.ArgumentParser(description='Balearic Islands sailing regatta scraper')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    scrape_parser = subparsers.add_parser('scrape', help='scrape the clubs and update every output (default)')
+    add_scrape_arguments(scrape_parser)
+    scrape_parser.add_argument('--dry-run', action='store_true',
+                               help='scrape and report, but write no outputs, state or metrics and send nothing')
+    scrape_parser.add_argument('--diff', action='store_true',
+                               help='print the events added to and removed from each club since the last run')
+    scrape_parser.add_argument('--show-recent', type=int, metavar='DAYS',
+                               help='list events first seen in the last DAYS days and exit')
+    scrape_parser.add_argument('--profile', metavar='PREFIX',
+                               help='profile the run with cProfile and tracemalloc, writing PREFIX.pstats')
+    scrape_parser.add_argument('--daemon', action='store_true',
+                               help='keep running, refreshing each club on its own schedule')
+    scrape_parser.add_argument('--cycles', type=int, metavar='N',
+                               help='stop the daemon after N cycles')
+    scrape_parser.add_argument('--no-sleep', action='store_true',
+                               help='run daemon cycles back to back on a simulated clock (for testing)')
+    scrape_parser.add_argument('--refresh-interval', type=float, default=6 * 3600,
+                               help='initial seconds between refreshes of a club (default: 6 hours)')
+    scrape_parser.add_argument('--min-refresh-interval', type=float, default=3600,
+                               help='shortest refresh interval (default: 1 hour)')
+    scrape_parser.add_argument('--max-refresh-interval', type=float, default=48 * 3600,
+                               help='longest refresh interval for clubs that rarely change (default: 48 hours)')
+    scrape_parser.add_argument('--busy-refresh-interval', type=float, default=3 * 3600,
+                               help='longest refresh interval for clubs with an event in the next 14 days '
+                                    '(default: 3 hours)')
+    scrape_parser.add_argument('--checkpoint-interval', type=float, default=900,
+                               help='seconds between daemon state checkpoints (default: 900)')
+    scrape_parser.add_argument('--daemon-state', default='daemon_state.json',
+                               help='daemon schedule state file (default: daemon_state.json)')
+    
+    diff_parser = subparsers.add_parser('diff', help='scrape without writing outputs or state and print what would change')
+    add_scrape_arguments(diff_parser)
+    
+    notify_parser = subparsers.add_parser('notify', help='send the queued Telegram notifications')
+    notify_parser.add_argument('--history-db', default='event_history.db',
+                               help='SQLite event history database (default: event_history.db)')
+    notify_parser.add_argument('--telegram-api', default=os.getenv('TELEGRAM_API_BASE', 'https://api.telegram.org'),
+                               help='Telegram Bot API base URL, e.g. a local stand-in server for testing')
+    
+    merge_parser = subparsers.add_parser('merge', help='combine the shards of partial runs into the outputs')
+    add_output_arguments(merge_parser)
+    merge_parser.add_argument('sources', nargs='+', metavar='DATA_DIR',
+                              help='data directories of partial runs; later ones win for a club in several')
+    
+    replay_parser = subparsers.add_parser('replay', help='extract archived runs again with the current rules, offline')
+    replay_parser.add_argument('runs', nargs='*', metavar='RUN',
+                               help='archived run ids to replay (default: the latest)')
+    replay_parser.add_argument('--all', action='store_true', help='replay every archived run')
+    replay_parser.add_argument('--list', action='store_true', help='list the archived runs and exit')
+    replay_parser.add_argument('--archive-dir', default='archive',
+                               help='page archive directory (default: archive)')
+    replay_parser.add_argument('--replay-dir', default='replay',
+                               help='directory each replayed run is written to as RUN.json (default: replay)')
+    replay_parser.add_argument('--clubs-file', default=DEFAULT_CLUBS_FILE,
+                               help='JSON club list (default: clubs.json next to this script)')
+    replay_parser.add_argument('--workers', type=int, default=0, metavar='N',
+                               help='extract pages in N worker processes (default: off, in this process)')
+    replay_parser.add_argument('--compact', action='store_true',
+                               help='leave color and boat_symbol (derived from the types) out of the JSON output')
+    replay_parser.add_argument('--deterministic', action='store_true',
+                               help='compact JSON output sorted by start date, club and title, one event per line')
+    
+    bench_parser = subparsers.add_parser('bench', help='run benchmark.py with the remaining arguments')
+    bench_parser.add_argument('bench_args', nargs=argparse.REMAINDER)
+    
+    args = parser.parse_args(argv)
+    if args.command == 'scrape' and args.daemon and (args.clubs or args.dry_run or args.offline):
+        parser.error('--daemon cannot be combined with --clubs, --dry-run or --offline')
+    return args
+
+def telegram_credentials() -> Tuple[Optional[str], Optional[str]]:
+    """Get the Telegram credentials from environment variables"""
     telegram_bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
     telegram_chat_id = os.getenv('TELEGRAM_CHAT_ID')
     
     if not telegram_bot_token or not telegram_chat_id:
         logger.warning("⚠️ Telegram credentials not found in environment variables")
         logger.info("Set TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID to enable notifications")
+    return telegram_bot_token, telegram_chat_id
+
+def build_scraper(args: argparse.Namespace, dry_run: bool = False, **options) -> SmartRegattaScraper:
+    """Create a scraper writing to the output and state paths in args (reading them only, with dry_run)"""
+    telegram_bot_token, telegram_chat_id = telegram_credentials()
+    return SmartRegattaScraper(telegram_bot_token, telegram_chat_id,
+                               clubs=load_clubs(args.clubs_file), output_file=args.output,
+                               shard_store=ShardStore(args.data_dir, record_lines=args.deterministic),
+                               event_history=EventHistory(args.history_db, read_only=dry_run),
+                               calendar_index=CalendarIndex(args.calendar_dir or
+                                                            os.path.join(args.data_dir, 'calendar'),
+                                                            record_lines=args.deterministic),
+                               compact_output=args.compact, deterministic_output=args.deterministic,
+                               telegram_api=args.telegram_api, **options)
+
+def scrape_command(args: argparse.Namespace):
+    """Scrape (or with diff, preview) the selected clubs"""
+    dry_run = args.command == 'diff' or args.dry_run
+    if args.command == 'scrape' and args.show_recent is not None:
+        for event in EventHistory(args.history_db, read_only=True).first_seen_since(args.show_recent):
+            print(f"{event['first_seen']}  {event['club'] or '?'}: {event['title'] or event['signature']} ({event['date'] or '?'})")
+        return
+    
+    http_cache = None
+    if not args.no_cache:
+        http_cache = HttpCache(args.cache_dir, max_age=args.cache_max_age, max_bytes=args.cache_max_bytes)
+    elif args.offline:
+        raise SystemExit('--offline replays the HTTP cache and cannot be combined with --no-cache')
+    
+    # Offline runs never reach the sites, so they say nothing about their health
+    circuit_breaker = None if args.offline else \
+        CircuitBreaker(args.circuit_file, args.circuit_threshold, args.circuit_probe_interval)
+    scraper = build_scraper(args, dry_run=dry_run, max_workers=args.workers, http_cache=http_cache,
+                            archive=None if args.no_archive else PageArchive(args.archive_dir),
+                            circuit_breaker=circuit_breaker, max_retries=args.retries,
+                            connect_timeout=args.connect_timeout, read_timeout=args.read_timeout,
+                            run_time_budget=args.deadline, stream_pages=args.stream,
+                            extract_workers=args.extract_workers, offline=args.offline)
+    try:
+        clubs = select_clubs(scraper.clubs, args.clubs) if args.clubs else None
+    except ValueError as e:
+        raise SystemExit(str(e))
+    if args.translate:
+        scraper.translator = TranslationService(scraper.session, target_lang=args.translate,
+                                                cache_file=args.translation_cache,
+                                                endpoint=args.translate_endpoint,
+                                                time_budget=args.translate_budget)
+    if args.command == 'scrape' and args.daemon:
+        daemon = ScrapeDaemon(scraper, base_interval=args.refresh_interval,
+                              min_interval=args.min_refresh_interval, max_interval=args.max_refresh_interval,
+                              busy_interval=args.busy_refresh_interval,
+                              checkpoint_interval=args.checkpoint_interval, state_file=args.daemon_state,
+                              metrics_file=args.metrics_file)
+        try:
+            daemon.run(max_cycles=args.cycles, sleep=not args.no_sleep)
+        finally:
+            scraper.close_extract_pool()
+            if scraper.translator:
+                scraper.translator.close()
+        return
+    
+    try:
+        if args.command == 'scrape' and args.profile:
+            run_with_profiling(scraper, args.profile, clubs=clubs, dry_run=dry_run)
+        else:
+            scraper.run(clubs=clubs, dry_run=dry_run)
+        if args.command == 'diff' or args.diff:
+            print(scraper.format_club_diffs(scraper.club_diffs))
+    finally:
+        if not dry_run:
+            scraper.metrics.write(args.metrics_file)
+        scraper.close_extract_pool()
+        if scraper.translator:
+            scraper.translator.close()
+
+def notify_command(args: argparse.Namespace):
+    """Send the notifications earlier runs queued"""
+    telegram_bot_token, telegram_chat_id = telegram_credentials()
+    scraper = SmartRegattaScraper(telegram_bot_token, telegram_chat_id, clubs=[],
+                                  event_history=EventHistory(args.history_db), telegram_api=args.telegram_api)
+    pending = scraper.get_event_history().pending_notifications()
+    logger.info(f"📮 {len(pending)} notifications queued")
+    scraper.deliver_notifications()
+
+def merge_command(args: argparse.Namespace):
+    """Combine the shards of partial runs"""
+    scraper = build_scraper(args)
+    try:
+        scraper.merge_shards([ShardStore(source) for source in args.sources])
+    finally:
+        scraper.metrics.write(args.metrics_file)
+
+def replay_command(args: argparse.Namespace):
+    """List or replay archived runs"""
+    archive = PageArchive(args.archive_dir)
+    run_ids = archive.run_ids()
+    if args.list:
+        for run_id in run_ids:
+            manifest = archive.load_run(run_id)
+            print(f"{run_id}  {manifest['started']}  {len(manifest['pages'])} pages")
+        return
+    if args.all:
+        runs = run_ids
+    elif args.runs:
+        unknown = [run_id for run_id in args.runs if run_id not in run_ids]
+        if unknown:
+            raise SystemExit(f"Unknown archived runs: {', '.join(unknown)} (see replay --list)")
+        runs = args.runs
+    else:
+        runs = run_ids[-1:]
+    if not runs:
+        raise SystemExit(f"No archived runs in {args.archive_dir}")
     
-    # Initialize and run scraper
-    scraper = SmartRegattaScraper(telegram_bot_token, telegram_chat_id)
-    scraper.run()
+    scraper = SmartRegattaScraper(clubs=load_clubs(args.clubs_file), archive=archive,
+                                  extract_workers=args.workers,
+                                  compact_output=args.compact, deterministic_output=args.deterministic)
+    try:
+        results = scraper.replay_archive(runs)
+    finally:
+        scraper.close_extract_pool()
+    for run_id, regattas in results.items():
+        scraper.save_regattas_json(regattas, os.path.join(args.replay_dir, f"{run_id}.json"))
+
+def main(argv=None):
+    """Main function"""
+    args = parse_args(argv)
+    if args.command == 'bench':
+        import benchmark
+        benchmark.main(args.bench_args)
+    elif args.command == 'notify':
+        notify_command(args)
+    elif args.command == 'merge':
+        merge_command(args)
+    elif args.command == 'replay':
+        replay_command(args)
+    else:
+        scrape_command(args)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,73 @@
+import functools
+import http.server
+import os
+import sys
+import threading
+
+import pytest
+
+# The scraper is a top-level module next to this directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The stand-in servers are the ones benchmark.py runs its subcommands against
+from benchmark import (BotApiHandler, FaultyHandler, TranslateApiHandler, fixture_server,  # noqa: E402
+                       synthetic_regattas, write_extract_pages)
+
+FIXTURES_DIR = os.path.join(ROOT, 'fixtures')
+
+
+@pytest.fixture
+def races_server():
+    """Serve fixtures/races_platform on a local port"""
+    with fixture_server(os.path.join(FIXTURES_DIR, 'races_platform')) as base_url:
+        yield base_url
+
+
+@pytest.fixture
+def club_pages(tmp_path):
+    """Synthetic pages of three clubs: (pages directory, clubs with the page in 'fixture' and no URL)"""
+    pages_dir = tmp_path / 'pages'
+    pages_dir.mkdir()
+    return str(pages_dir), write_extract_pages(synthetic_regattas(60, 6, clubs=3), str(pages_dir))
+
+
+@pytest.fixture
+def faulty_site(club_pages):
+    """Serve the club pages with injected faults, yielding (clubs with URLs, faults, request counters)
+
+    Set faults[club['fixture']] to a FaultyHandler mode; counters count requests per page.
+    """
+    pages_dir, manifest = club_pages
+    faults, counters = {}, {}
+    handler = functools.partial(FaultyHandler, directory=pages_dir, faults=faults, counters=counters, stall=1.0)
+    with fixture_server(pages_dir, handler) as base_url:
+        yield [dict(club_info, url=f"{base_url}/{club_info['fixture']}") for club_info in manifest], faults, counters
+
+
+def serve(handler_class, state):
+    """Run a stand-in API on a local port, yielding its base URL"""
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(handler_class, state=state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def bot_api():
+    """Serve the stand-in Bot API, yielding its base URL and its state (mode, requests, messages)"""
+    state = {'mode': 'ok', 'requests': 0, 'messages': []}
+    for base_url in serve(BotApiHandler, state):
+        yield base_url, state
+
+
+@pytest.fixture
+def translate_api():
+    """Serve the stand-in translate endpoint, yielding its URL and its state (mode, requests, texts, delay)"""
+    state = {'mode': 'ok', 'requests': 0, 'texts': 0, 'delay': 2.0}
+    for base_url in serve(TranslateApiHandler, state):
+        yield f"{base_url}/translate_a/single", state
@@ -0,0 +1,67 @@
+"""Tests of page archiving while pages stream in"""
+
+import os
+import tracemalloc
+
+import pytest
+
+from benchmark import fixture_server
+from scraper import HttpCache, PageArchive, SmartRegattaScraper
+
+FILLER_LINES = 40000
+
+
+@pytest.fixture
+def big_page(tmp_path):
+    """A listing page of about 2 MB, nearly all of it lines without events"""
+    pages_dir = tmp_path / 'pages'
+    pages_dir.mkdir()
+    filler = ''.join(f"<p>Noticia número {number} del club, sin fechas</p>\n" for number in range(FILLER_LINES))
+    content = ("<html><head><meta charset=\"utf-8\"></head><body>\n<ul>\n"
+               "<li>\n<h3>Trofeo Primavera ORC</h3>\n<p>15/05/2099</p>\n</li>\n</ul>\n"
+               f"{filler}</body></html>\n").encode('utf-8')
+    (pages_dir / 'club.html').write_bytes(content)
+    return str(pages_dir), content
+
+
+def scrape(tmp_path, base_url, http_cache=None):
+    archive = PageArchive(str(tmp_path / 'archive'))
+    scraper = SmartRegattaScraper(clubs=[], min_host_interval=0, stream_pages=True, http_cache=http_cache,
+                                  archive=archive)
+    club = {'name': 'Club', 'location': 'Palma', 'url': f"{base_url}/club.html"}
+    tracemalloc.start()
+    try:
+        [regattas] = scraper.scrape_all_clubs([club])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return archive, archive.load_run(archive.run_ids()[-1]), regattas, peak
+
+
+def leftover_parts(archive):
+    return [name for _, _, names in os.walk(archive.directory) for name in names if name.endswith('.part')]
+
+
+def test_streamed_page_is_archived_without_holding_it(tmp_path, big_page):
+    pages_dir, content = big_page
+    with fixture_server(pages_dir) as base_url:
+        archive, run, regattas, peak = scrape(tmp_path, base_url)
+    assert [r.title for r in regattas] == ['Trofeo Primavera ORC']
+    [page] = run['pages']
+    assert archive.load(page['hash']) == content
+    assert leftover_parts(archive) == []
+    assert peak < len(content) / 2
+
+
+def test_streamed_page_is_archived_from_the_cache_body(tmp_path, big_page):
+    pages_dir, content = big_page
+    with fixture_server(pages_dir) as base_url:
+        archive, run, _, peak = scrape(tmp_path, base_url, HttpCache(str(tmp_path / 'cache')))
+        assert archive.load(run['pages'][0]['hash']) == content
+        assert peak < len(content) / 4
+        objects = sorted(os.listdir(os.path.join(archive.directory, 'objects')))
+        # Unchanged next time (a 304): listed in the new run, stored once
+        archive, second_run, _, _ = scrape(tmp_path, base_url, HttpCache(str(tmp_path / 'cache')))
+    assert second_run['pages'][0]['hash'] == run['pages'][0]['hash']
+    assert sorted(os.listdir(os.path.join(archive.directory, 'objects'))) == objects
+    assert leftover_parts(archive) == []
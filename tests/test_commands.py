@@ -0,0 +1,50 @@
+"""Tests of the command line subcommands"""
+
+import json
+import os
+
+import scraper
+
+
+def club_list(path, base_url):
+    clubs = [{'name': 'Club Náutico', 'location': 'Palma', 'url': f"{base_url}/listing.html"}]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(clubs, f)
+    return str(path)
+
+
+def test_diff_writes_nothing(tmp_path, monkeypatch, races_server, capsys):
+    clubs_file = club_list(tmp_path / 'clubs.json', races_server)
+    workdir = tmp_path / 'run'
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+    scraper.main(['diff', '--clubs-file', clubs_file, '--retries', '0'])
+    assert 'Club Náutico' in capsys.readouterr().out
+    assert os.listdir(workdir) == []
+
+
+def test_dry_run_reads_existing_history(tmp_path, monkeypatch, races_server):
+    clubs_file = club_list(tmp_path / 'clubs.json', races_server)
+    monkeypatch.chdir(tmp_path)
+    scraper.EventHistory('event_history.db').close()
+    before = os.path.getmtime('event_history.db'), os.path.getsize('event_history.db')
+    scraper.main(['scrape', '--dry-run', '--clubs-file', clubs_file, '--retries', '0'])
+    assert (os.path.getmtime('event_history.db'), os.path.getsize('event_history.db')) == before
+    assert sorted(os.listdir(tmp_path)) == ['clubs.json', 'event_history.db']
+
+
+def test_deterministic_calendar_months_have_one_event_per_line(tmp_path, monkeypatch, races_server):
+    clubs_file = club_list(tmp_path / 'clubs.json', races_server)
+    monkeypatch.chdir(tmp_path)
+    scraper.main(['scrape', '--deterministic', '--clubs-file', clubs_file, '--retries', '0'])
+    calendar_dir = tmp_path / 'data' / 'calendar'
+    index = json.loads((calendar_dir / 'index.json').read_text(encoding='utf-8'))
+    assert index['months']
+    for entry in index['months'].values():
+        content = (calendar_dir / entry['file']).read_text(encoding='utf-8')
+        month = json.loads(content)
+        lines = content.splitlines()
+        assert len(lines) == len(month['events']) + 2
+        assert [json.loads(line.rstrip(',')) for line in lines[1:-1]] == month['events']
+        starts = [event['start_date'] for event in month['events']]
+        assert starts == sorted(starts)
@@ -0,0 +1,35 @@
+"""Tests of how listing pages are crawled"""
+
+from datetime import date
+
+from scraper import SmartRegattaScraper
+
+
+def test_pagination_links_skip_year_selectors():
+    scraper = SmartRegattaScraper(clubs=[])
+    page_url = 'https://regatas.example.com/es/default/races/calendar/year/2026/all/1'
+    anchors = [
+        ('/es/default/races/calendar/year/2026/all/2', '', '2'),
+        ('/es/default/races/calendar/year/2026/all/3', '', '3'),
+        ('/es/default/races/calendar/year/2025/all/1', '', '2025'),
+        ('/es/default/races/calendar/year/2027/all/1', '', '2027'),
+        ('/es/default/races/calendar/year/2026/all/4', 'next', '»'),
+        ('https://other.example.com/es/default/races/calendar/year/2026/all/2', '', '2'),
+    ]
+    assert scraper.pagination_anchor_links(anchors, page_url) == [
+        'https://regatas.example.com/es/default/races/calendar/year/2026/all/2',
+        'https://regatas.example.com/es/default/races/calendar/year/2026/all/3',
+        'https://regatas.example.com/es/default/races/calendar/year/2026/all/4',
+    ]
+
+
+def test_crawl_start_urls_follow_pinned_day():
+    scraper = SmartRegattaScraper(clubs=[])
+    scraper.today = date(2024, 3, 1)
+    club = {'name': 'Club', 'location': 'Palma', 'url': 'https://regatas.example.com/es/default/races',
+            'url_templates': ['https://regatas.example.com/es/default/races/calendar/year/{year}/all/1']}
+    assert scraper.crawl_start_urls(club) == [
+        'https://regatas.example.com/es/default/races',
+        'https://regatas.example.com/es/default/races/calendar/year/2024/all/1',
+        'https://regatas.example.com/es/default/races/calendar/year/2025/all/1',
+    ]
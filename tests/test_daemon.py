@@ -0,0 +1,51 @@
+"""Tests of the daemon's cycles against a keep-alive stand-in site"""
+
+import functools
+import json
+
+from benchmark import CountingHandler, fixture_server
+from scraper import CircuitBreaker, EventHistory, HttpCache, ScrapeDaemon, ShardStore, SmartRegattaScraper
+
+
+def test_cycles_reuse_connections_and_checkpoint(tmp_path, club_pages):
+    pages_dir, manifest = club_pages
+    counters = {}
+    handler = functools.partial(CountingHandler, directory=pages_dir, counters=counters)
+    state_file = str(tmp_path / 'daemon_state.json')
+    with fixture_server(pages_dir, handler) as base_url:
+        clubs = [dict(club_info, url=f"{base_url}/{club_info['fixture']}") for club_info in manifest]
+        history = EventHistory(str(tmp_path / 'history.db'))
+        scraper = SmartRegattaScraper(clubs=clubs, min_host_interval=0, output_file=str(tmp_path / 'regattas.json'),
+                                      http_cache=HttpCache(str(tmp_path / 'cache')),
+                                      shard_store=ShardStore(str(tmp_path / 'data')), event_history=history,
+                                      circuit_breaker=CircuitBreaker(str(tmp_path / 'circuit_state.json')))
+        daemon = ScrapeDaemon(scraper, base_interval=3600, min_interval=1800, state_file=state_file)
+        daemon.seed()
+        daemon.run_cycle()
+        first_connections = counters['connections']
+        assert counters['requests'] == len(clubs)
+        assert first_connections <= len(clubs)
+
+        daemon.run(max_cycles=6, sleep=False)
+        history.close()
+
+    # Later cycles are revalidations over the connections the first one opened
+    assert counters['requests'] > len(clubs)
+    assert counters['connections'] == first_connections
+    assert daemon.cycles == 6
+    with open(state_file, encoding='utf-8') as f:
+        assert json.load(f) == daemon.schedule
+    assert set(daemon.schedule) == {club_info['name'] for club_info in clubs}
+    for entry in daemon.schedule.values():
+        assert daemon.min_interval <= entry['interval'] <= daemon.max_interval
+
+
+def test_stop_before_a_cycle_checkpoints_and_exits(tmp_path):
+    scraper = SmartRegattaScraper(clubs=[{'name': 'Club', 'location': 'Palma', 'url': 'http://127.0.0.1:9/'}],
+                                  shard_store=ShardStore(str(tmp_path / 'data')))
+    daemon = ScrapeDaemon(scraper, state_file=str(tmp_path / 'daemon_state.json'))
+    daemon.stop()
+    daemon.run(sleep=False)
+    assert daemon.cycles == 0
+    with open(tmp_path / 'daemon_state.json', encoding='utf-8') as f:
+        assert set(json.load(f)) == {'Club'}
@@ -0,0 +1,97 @@
+"""Offline tests of the extractors against saved listing pages and stored events"""
+
+import json
+import os
+from datetime import date
+
+import pytest
+
+from scraper import BoatType, SmartRegattaScraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'fixtures', 'races_platform')
+CLUB = {'name': 'Club Náutico', 'url': 'https://regatas.example.com/es/default/races', 'location': 'Palma'}
+
+
+@pytest.fixture(scope='module')
+def scraper():
+    scraper = SmartRegattaScraper(clubs=[])
+    # Fixture dates are judged as of a fixed day
+    scraper.today = date(2026, 1, 15)
+    return scraper
+
+
+def parse_fixture(scraper, name):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return scraper.parse_document(f.read())
+
+
+def test_races_platform_listing(scraper):
+    regattas = scraper.extract_races_platform(parse_fixture(scraper, 'listing.html'), CLUB)
+    assert [(r.title, r.start_date, r.end_date, r.url) for r in regattas] == [
+        ('Trofeo Primavera ORC', '2027-05-03', '2027-05-05',
+         'https://regatas.example.com/es/default/races/race/1204-trofeo-primavera-orc'),
+        ('Copa de Otoño Optimist', '2027-06-12', '2027-06-12',
+         'https://regatas.example.com/es/default/races/race/1211-copa-optimist'),
+        # Image link: the title comes from the entry's heading
+        ('Vuelta a la Isla a Dos', '2027-07-30', '2027-08-01',
+         'https://regatas.example.com/es/default/races/race/1230-vuelta-isla'),
+    ]
+    assert all(r.club == CLUB['name'] and r.location == CLUB['location'] for r in regattas)
+    assert regattas[1].boat_type == BoatType.DINGHIES
+
+
+def test_races_platform_skips_past_events(scraper):
+    regattas = scraper.extract_races_platform(parse_fixture(scraper, 'listing.html'), CLUB)
+    assert 'Regata de Invierno' not in {r.title for r in regattas}
+
+
+def test_races_platform_skips_pagination_links(scraper):
+    regattas = scraper.extract_races_platform(parse_fixture(scraper, 'listing.html'), CLUB)
+    assert not [r for r in regattas if '/page/' in r.url]
+    for href in ('/es/default/races/index/page/2', '/es/default/races/page/3', '/es/default/races/calendar',
+                 '/es/default/races/index'):
+        assert not scraper.race_link_regex.search(href)
+    assert scraper.race_link_regex.search('/es/default/races/race/1204-trofeo-primavera-orc')
+
+
+def test_races_platform_falls_back_without_listing(scraper):
+    # Race links without dates are not a listing: the generic extractor runs instead
+    assert scraper.extract_races_platform(parse_fixture(scraper, 'no_listing.html'), CLUB) is None
+
+
+def test_races_platform_selected_by_url(scraper):
+    assert scraper.select_extractor(CLUB) == 'races_platform'
+    regattas, extractor, _ = scraper.extract_document_regattas(parse_fixture(scraper, 'listing.html'), CLUB)
+    assert extractor == 'races_platform'
+    assert len(regattas) == 3
+    _, extractor, _ = scraper.extract_document_regattas(parse_fixture(scraper, 'no_listing.html'), CLUB)
+    assert extractor == 'generic'
+
+
+def test_build_regattas_skips_unreadable_dates(scraper):
+    # Registered extractors may hand over dates filter_future_dates never saw
+    regattas = scraper.build_regattas([
+        ('Trofeo Primavera ORC', 'del 3 al 5 de mayo de 2027', '', None),
+        ('Regata Sin Fecha', 'próximamente', '', None),
+    ], CLUB)
+    assert [(r.title, r.start_date, r.end_date, r.url) for r in regattas] == [
+        ('Trofeo Primavera ORC', '2027-05-03', '2027-05-05', CLUB['url'])]
+
+
+def test_generic_extractor_matches_frozen_output_on_regattas_json():
+    # Each stored event as title, date and details lines, followed by a results line and a blank one
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(root, 'regattas.json'), encoding='utf-8') as f:
+        records = json.load(f)
+    lines = []
+    for record in records:
+        lines += [record['title'], record['date'], record['details'],
+                  'Resultados y clasificación de la regata 2025', '']
+    # What the scanner extracted before its keywords and date patterns were compiled
+    with open(os.path.join(root, 'fixtures', 'regattas_json_events.json'), encoding='utf-8') as f:
+        expected = json.load(f)
+    scraper = SmartRegattaScraper(clubs=[])
+    scraper.today = date(2026, 1, 1)
+    regattas = scraper.extract_regatta_lines(lines, CLUB)
+    assert [{'title': r.title, 'date': r.date, 'details': r.details} for r in regattas] == expected
@@ -0,0 +1,82 @@
+"""Tests of retries, the circuit breaker and the run deadline against the fault-injecting stand-in"""
+
+import time
+
+import pytest
+
+from scraper import CircuitBreaker, EventHistory, ShardStore, SmartRegattaScraper
+
+
+@pytest.fixture
+def run(tmp_path, faulty_site):
+    """Scrape the faulty site once as a run would, saving shards and breaker state; returns (scraper, results)"""
+    clubs, _, _ = faulty_site
+    history = EventHistory(str(tmp_path / 'history.db'))
+
+    def run_once(probe_interval=3600.0, **options):
+        scraper = SmartRegattaScraper(clubs=clubs, min_host_interval=0, retry_backoff=0.01,
+                                      connect_timeout=1.0, read_timeout=0.5,
+                                      output_file=str(tmp_path / 'regattas.json'),
+                                      shard_store=ShardStore(str(tmp_path / 'data')), event_history=history,
+                                      circuit_breaker=CircuitBreaker(str(tmp_path / 'circuit_state.json'),
+                                                                     2, probe_interval),
+                                      **options)
+        results = scraper.scrape_all_clubs()
+        scraper.save_club_shards(results, scraper.deduplicate_regattas(
+            [regatta for club_regattas in results for regatta in club_regattas]))
+        scraper.circuit_breaker.save()
+        return scraper, results
+
+    yield run_once
+    history.close()
+
+
+def test_transient_failures_are_retried(run, faulty_site):
+    clubs, faults, counters = faulty_site
+    _, clean = run()
+    faults.update({clubs[0]['fixture']: 'flaky', clubs[1]['fixture']: 'reset'})
+    counters.clear()
+    scraper, results = run(max_retries=2)
+    assert results == clean
+    for club_info in clubs[:2]:
+        club_metrics = scraper.metrics.club(club_info['name'])
+        assert club_metrics['retries'] == 1 and 'fallback' not in club_metrics
+        assert counters[club_info['fixture']] == 2
+
+
+def test_circuit_opens_after_repeated_failures(run, faulty_site):
+    clubs, faults, counters = faulty_site
+    _, clean = run()
+    faults[clubs[0]['fixture']] = 'down'
+    for _ in range(2):
+        scraper, results = run(max_retries=0)
+        # Failed runs keep the last known good results
+        assert scraper.metrics.club(clubs[0]['name'])['fallback'] == 'failed'
+        assert results == clean
+
+    # Open: the club is not requested at all until a probe is due
+    counters.clear()
+    scraper, results = run(max_retries=0)
+    assert scraper.metrics.club(clubs[0]['name'])['fallback'] == 'circuit_open'
+    assert clubs[0]['fixture'] not in counters
+    assert results == clean
+
+    # Once a probe is due and succeeds, the circuit closes again
+    faults.clear()
+    scraper, results = run(max_retries=0, probe_interval=0)
+    assert 'fallback' not in scraper.metrics.club(clubs[0]['name'])
+    assert not scraper.circuit_breaker.is_open(clubs[0]['name'])
+
+
+def test_deadline_falls_back_for_stragglers(run, faulty_site):
+    clubs, faults, _ = faulty_site
+    _, clean = run()
+    # Sends a few bytes at a time: no read times out, but the page takes far longer than the deadline
+    faults[clubs[0]['fixture']] = 'trickle'
+    start = time.monotonic()
+    scraper, results = run(run_time_budget=1.0, max_workers=3)
+    assert time.monotonic() - start < 3.0
+    assert scraper.metrics.club(clubs[0]['name'])['fallback'] == 'deadline'
+    assert results == clean
+    # Running out of time is not the club's failure
+    assert not scraper.circuit_breaker.is_open(clubs[0]['name'])
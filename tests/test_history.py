@@ -0,0 +1,44 @@
+"""Tests of the SQLite event history"""
+
+from benchmark import synthetic_regattas
+from scraper import EventHistory, SmartRegattaScraper
+
+
+def test_signature_scheme_change_rekeys_the_history(tmp_path):
+    scraper = SmartRegattaScraper(clubs=[], event_history=EventHistory(str(tmp_path / 'h.db')))
+    history = scraper.event_history
+    *known, added = synthetic_regattas(4, 3, clubs=2)
+    # A history written under an older scheme: the same events under other
+    # signatures, plus a row from before club, title and date were stored
+    with history.connection:
+        history.connection.executemany(
+            'INSERT INTO events (signature, club, title, date, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?)',
+            [(f"old-{index}", regatta.club, regatta.title, regatta.date, '2025-01-01T00:00:00', '2025-01-02T00:00:00')
+             for index, regatta in enumerate(known)] + [('raw-signature', None, None, None, '2025-01-01', '2025-01-01')]
+        )
+        history.connection.execute("UPDATE meta SET value = '1' WHERE key = 'signature_scheme'")
+
+    assert scraper.identify_new_events(known + [added]) == []
+    first_seen = dict(history.connection.execute('SELECT signature, first_seen FROM events'))
+    # Converted events keep when they were first seen; the unconvertible row is gone
+    assert set(first_seen) == {scraper.create_event_signature(regatta) for regatta in known + [added]}
+    assert all(first_seen[scraper.create_event_signature(regatta)] == '2025-01-01T00:00:00' for regatta in known)
+    history.close()
+
+
+def test_rekeyed_history_keeps_reporting_new_events(tmp_path):
+    scraper = SmartRegattaScraper(clubs=[], event_history=EventHistory(str(tmp_path / 'h.db')))
+    history = scraper.event_history
+    regattas = synthetic_regattas(4, 3, clubs=2)
+    with history.connection:
+        history.connection.executemany(
+            'INSERT INTO events (signature, club, title, date, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?)',
+            [(f"old-{index}", regatta.club, regatta.title, regatta.date, '2025-01-01T00:00:00', '2025-01-01T00:00:00')
+             for index, regatta in enumerate(regattas[:3])]
+        )
+        history.connection.execute("UPDATE meta SET value = '1' WHERE key = 'signature_scheme'")
+
+    # Every stored row could be converted, so only the genuinely new event is reported
+    assert scraper.identify_new_events(regattas) == [regattas[3]]
+    assert history.get_meta('signature_scheme') != '1'
+    history.close()
@@ -0,0 +1,68 @@
+"""Tests of conditional requests against a local stand-in site"""
+
+import os
+import time
+
+from benchmark import fixture_server
+from scraper import HttpCache, SmartRegattaScraper
+
+
+def scrape(cache_dir, clubs):
+    """Scrape the clubs once with the HTTP cache in cache_dir, saving it like a run does"""
+    scraper = SmartRegattaScraper(clubs=[], min_host_interval=0, http_cache=HttpCache(cache_dir))
+    results = scraper.scrape_all_clubs(clubs)
+    scraper.http_cache.save()
+    return scraper, results
+
+
+def test_unchanged_pages_are_revalidated_and_not_parsed(tmp_path, club_pages):
+    pages_dir, manifest = club_pages
+    cache_dir = str(tmp_path / 'cache')
+    with fixture_server(pages_dir) as base_url:
+        clubs = [dict(club_info, url=f"{base_url}/{club_info['fixture']}") for club_info in manifest]
+        first, first_results = scrape(cache_dir, clubs)
+        second, second_results = scrape(cache_dir, clubs)
+
+    assert all(first_results) and second_results == first_results
+    for club_info in clubs:
+        assert first.metrics.club(club_info['name'])['status'] == 200
+        club_metrics = second.metrics.club(club_info['name'])
+        assert club_metrics['status'] == 304
+        assert club_metrics['bytes'] == 0
+        assert club_metrics['cache_hits'] == 1 and 'cache_misses' not in club_metrics
+    assert not [stage for stage in second.metrics.stages if stage['stage'] in ('parse', 'extract')]
+
+
+def test_changed_page_is_downloaded_again(tmp_path, club_pages):
+    pages_dir, manifest = club_pages
+    cache_dir = str(tmp_path / 'cache')
+    changed = os.path.join(pages_dir, manifest[0]['fixture'])
+    with fixture_server(pages_dir) as base_url:
+        clubs = [dict(club_info, url=f"{base_url}/{club_info['fixture']}") for club_info in manifest]
+        _, first_results = scrape(cache_dir, clubs)
+        with open(changed, 'r', encoding='utf-8') as f:
+            content = f.read()
+        with open(changed, 'w', encoding='utf-8') as f:
+            f.write(content.replace('</ul>', '<li>\n<h3>Regata Nueva</h3>\n<p>15/12/2099</p>\n</li>\n</ul>'))
+        modified = time.time() + 10
+        os.utime(changed, (modified, modified))
+        second, second_results = scrape(cache_dir, clubs)
+
+    assert second.metrics.club(clubs[0]['name'])['status'] == 200
+    assert 'Regata Nueva' in {r.title for r in second_results[0]}
+    assert second_results[1:] == first_results[1:]
+
+
+def test_eviction_keeps_the_cache_under_max_bytes(tmp_path, club_pages):
+    pages_dir, manifest = club_pages
+    cache_dir = str(tmp_path / 'cache')
+    with fixture_server(pages_dir) as base_url:
+        clubs = [dict(club_info, url=f"{base_url}/{club_info['fixture']}") for club_info in manifest]
+        scrape(cache_dir, clubs)
+    largest = max(os.path.getsize(os.path.join(pages_dir, club_info['fixture'])) for club_info in manifest)
+    cache = HttpCache(cache_dir, max_bytes=largest)
+    cache.save()
+    cached = [club_info for club_info in clubs if cache.get(club_info['url'])]
+    assert len(cached) == 1
+    assert sum(entry['size'] for entry in cache.entries.values()) <= largest
+    assert len([name for name in os.listdir(cache_dir) if name != 'index.json']) == 1
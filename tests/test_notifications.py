@@ -0,0 +1,89 @@
+"""Tests of notification delivery through the stand-in Bot API"""
+
+import pytest
+
+from benchmark import synthetic_regattas
+from scraper import EventHistory, SmartRegattaScraper, TelegramClient
+
+
+@pytest.fixture
+def notifier(tmp_path, bot_api):
+    api_base, _ = bot_api
+    scraper = SmartRegattaScraper('token', 'chat', clubs=[], event_history=EventHistory(str(tmp_path / 'h.db')),
+                                  telegram_api=api_base)
+    scraper.telegram = TelegramClient(scraper.session, 'token', 'chat', api_base=api_base,
+                                      min_interval=0, retry_backoff=0.01, max_retries=1)
+    yield scraper
+    scraper.event_history.close()
+
+
+def test_rejected_message_does_not_block_the_queue(notifier, bot_api):
+    _, state = bot_api
+    history = notifier.event_history
+    history.enqueue_message('first')
+    # Over Telegram's 4096 characters: refused with a 400 however often it is sent
+    history.enqueue_message('x' * 5000)
+    history.enqueue_message('last')
+    notifier.deliver_notifications()
+    assert state['messages'] == ['first', 'last']
+    assert history.pending_notifications() == []
+    assert [payload for _, _, payload in history.dead_letters()] == ['x' * 5000]
+
+
+def test_unreachable_api_keeps_the_queue_until_attempts_run_out(notifier, bot_api):
+    _, state = bot_api
+    history = notifier.event_history
+    notifier.max_notification_attempts = 2
+    history.enqueue_message('first')
+    history.enqueue_message('second')
+    state['mode'] = 'down'
+    for _ in range(2):
+        notifier.deliver_notifications()
+        assert len(history.pending_notifications()) == 2
+    # Only the message at the head was tried, so only it has run out of attempts
+    state['mode'] = 'ok'
+    notifier.deliver_notifications()
+    assert state['messages'] == ['second']
+    assert [payload for _, _, payload in history.dead_letters()] == ['first']
+    assert history.pending_notifications() == []
+
+
+def delivered_titles(state):
+    return [line[2:] for message in state['messages'] for line in message.split('\n') if line.startswith('🏆 ')]
+
+
+@pytest.mark.parametrize('mode', ['ok', 'throttle', 'flaky', 'markdown'])
+def test_new_events_are_delivered_exactly_once(notifier, bot_api, mode):
+    _, state = bot_api
+    state['mode'] = mode
+    regattas = synthetic_regattas(150, 12)
+    assert len(notifier.identify_new_events(regattas)) == 150
+    notifier.deliver_notifications()
+    titles = delivered_titles(state)
+    assert sorted(titles) == sorted(regatta.title for regatta in regattas)
+    # Split under Telegram's limit rather than truncated
+    assert len(state['messages']) > 1
+    assert all(len(message.encode('utf-16-le')) // 2 <= 4096 for message in state['messages'])
+    
+    # The same events next run are neither new nor sent again
+    assert notifier.identify_new_events(regattas) == []
+    notifier.deliver_notifications()
+    assert delivered_titles(state) == titles
+    assert notifier.event_history.pending_notifications() == []
+
+
+def test_outage_keeps_events_queued_until_the_next_run(notifier, bot_api):
+    _, state = bot_api
+    regattas = synthetic_regattas(40, 6)
+    state['mode'] = 'down'
+    notifier.identify_new_events(regattas)
+    notifier.deliver_notifications()
+    assert state['messages'] == []
+    assert len(notifier.event_history.pending_notifications()) == 40
+    
+    # Next run: nothing new is found, but the queued events go out once
+    state['mode'] = 'ok'
+    assert notifier.identify_new_events(regattas) == []
+    notifier.deliver_notifications()
+    notifier.deliver_notifications()
+    assert sorted(delivered_titles(state)) == sorted(regatta.title for regatta in regattas)
@@ -0,0 +1,72 @@
+"""Tests of the translation service against the stand-in translate endpoint"""
+
+import time
+
+import pytest
+import requests
+
+from scraper import TranslationService
+
+TITLES = [f"Trofeo de Primavera {number} - Regata de Crucero" for number in range(120)]
+
+
+@pytest.fixture
+def translator_factory(tmp_path, translate_api):
+    endpoint, _ = translate_api
+    session = requests.Session()
+    translators = []
+
+    def make(**options):
+        options.setdefault('batch_chars', 1000)
+        translator = TranslationService(session, cache_file=str(tmp_path / 'translations.json'),
+                                        endpoint=endpoint, **options)
+        translators.append(translator)
+        return translator
+
+    yield make
+    for translator in translators:
+        translator.close()
+
+
+def test_titles_are_batched_and_cached(translator_factory, translate_api):
+    _, state = translate_api
+    translated = translator_factory().translate_many(TITLES + TITLES[:10])
+    assert translated[:len(TITLES)] == [f"[en] trophy de Primavera {number} - regatta de cruising"
+                                        for number in range(120)]
+    assert translated[len(TITLES):] == translated[:10]
+    # Duplicates are sent once, up to batch_chars per request
+    assert state['texts'] == len(TITLES)
+    assert 1 < state['requests'] <= sum(len(title) + 1 for title in TITLES) // 1000 + 1
+    
+    state['requests'] = 0
+    assert translator_factory().translate_many(TITLES) == translated[:len(TITLES)]
+    assert state['requests'] == 0
+
+
+def test_failed_batches_fall_back_and_are_retried_next_time(translator_factory, translate_api):
+    _, state = translate_api
+    state['mode'] = 'flaky'
+    translated = translator_factory(max_workers=1).translate_many(TITLES)
+    missed = [title for title, text in zip(TITLES, translated) if text == title]
+    assert missed and len(missed) < len(TITLES)
+    
+    state.update(mode='ok', requests=0, texts=0)
+    assert all(text.startswith('[en] ') for text in translator_factory().translate_many(TITLES))
+    assert state['texts'] == len(missed)
+
+
+def test_slow_endpoint_falls_back_within_the_budget(translator_factory, translate_api):
+    _, state = translate_api
+    state.update(mode='slow', delay=3.0)
+    start = time.monotonic()
+    assert translator_factory(time_budget=0.5).translate_many(TITLES) == TITLES
+    assert time.monotonic() - start < 2.0
+
+
+def test_failures_are_logged_without_the_texts(translator_factory, translate_api, caplog):
+    _, state = translate_api
+    state['mode'] = 'down'
+    assert translator_factory().translate_many(TITLES[:3]) == TITLES[:3]
+    warnings = [record.getMessage() for record in caplog.records if 'Translation failed' in record.getMessage()]
+    assert warnings == ["Translation failed with HTTP 503 for a batch of 3, using original text"]
+    assert 'Primavera' not in caplog.text